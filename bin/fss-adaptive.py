@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""
+ Copyright 2015 Paul T. Grogan
+
+ Licensed under the Apache License, Version 2.0 (the "License");
+ you may not use this file except in compliance with the License.
+ You may obtain a copy of the License at
+
+     http://www.apache.org/licenses/LICENSE-2.0
+
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+
+"""
+ Executes designs with sequential seed allocation instead of a fixed seed
+ range. Each round runs the next batch of seeds (with fss-pool.js) for the
+ designs whose Pareto status is still ambiguous and updates running
+ statistics for each design. A design stops receiving seeds once its
+ z*stderr interval on total value shows it is dominated, or on the front,
+ with confidence, or once it reaches --stop seeds. Designs are compared
+ with other designs for the same number of players by total cost. With
+ --budget, each round gives seeds to the most ambiguous designs first.
+
+ All records go to the results file, so an interrupted run resumes by
+ running the same command again. At the end, data-exp.csv is written in
+ the same format as fss-aggregate.py, so fss-exp*-pp.py work unchanged.
+ Only the Count column differs between designs. Use one results file per
+ operations model. Designs that get no new records in a round (e.g. failed
+ runs) are skipped with a warning.
+
+   python fss-adaptive.py --runs runs.txt --out results.jsonl [--batch 10 --min 20 --stop 100 --budget 50000] [-w 4 -d 24 -i 0 -o d6 -f n]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import numpy as np
+import fsspp
+
+def rivals(cost, values):
+	"""
+	Returns for each design the maximum of values over the other designs
+	with lower or equal cost (-inf if none).
+
+	Designs are swept once in cost order keeping the two largest values so
+	far, so a design can be left out of its own maximum.
+	"""
+	cost = np.asarray(cost)
+	values = np.asarray(values, dtype=np.float_)
+	order = np.argsort(cost, kind='mergesort')
+	first = np.empty(len(cost))
+	second = np.empty(len(cost))
+	arg = np.empty(len(cost), dtype=np.int_)
+	best, next_best, best_i = -np.inf, -np.inf, -1
+	for p, i in enumerate(order):
+		if values[i] > best:
+			best, next_best, best_i = values[i], best, i
+		elif values[i] > next_best:
+			next_best = values[i]
+		first[p], second[p], arg[p] = best, next_best, best_i
+	last = np.searchsorted(cost[order], cost, side='right') - 1
+	return np.where(arg[last] == np.arange(len(cost)), second[last], first[last])
+
+def classify(cost, exp_value, std_err, z=1.96):
+	"""
+	Classifies designs by confidence intervals exp_value +/- z*std_err.
+
+	Returns three arrays. `dominated` marks designs outside the front of
+	fsspp.pareto with confidence: a cheaper design's lower bound is above
+	their upper bound, or their upper bound is not positive. `front` marks
+	designs on it with confidence: their lower bound is positive and no
+	other cheaper design's upper bound is above it. `ambiguity` is the
+	distance between a design's expected value and the best expected value
+	of cheaper designs, in standard errors (smaller is more ambiguous).
+	"""
+	exp_value = np.asarray(exp_value, dtype=np.float_)
+	std_err = np.asarray(std_err, dtype=np.float_)
+	lower = exp_value - z*std_err
+	upper = exp_value + z*std_err
+	dominated = np.logical_or(upper <= 0, fsspp.dominated(cost, lower, upper))
+	front = np.logical_and(lower > 0, rivals(cost, upper) <= lower)
+	with np.errstate(divide='ignore', invalid='ignore'):
+		ambiguity = np.abs(exp_value - rivals(cost, exp_value))/std_err
+	ambiguity[np.isnan(ambiguity)] = np.inf
+	return dominated, front, ambiguity
+
+def pool(runs, start, stop, args):
+	"""
+	Executes seeds [start, stop) of runs with fss-pool.js.
+	"""
+	fd, filename = tempfile.mkstemp(suffix='.txt')
+	with os.fdopen(fd, 'wb') as f:
+		f.write(''.join([line + '\n' for run, line in runs]))
+	command = ['node', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fss-pool.js'),
+			'--runs', filename, '--start', str(start), '--stop', str(stop), '--out', args.out]
+	for option in ['w', 'd', 'i', 'o', 'f']:
+		if getattr(args, option) is not None:
+			command += ['-' + option, str(getattr(args, option))]
+	try:
+		subprocess.check_call(command)
+	finally:
+		os.remove(filename)
+
+def counts(designs):
+	"""
+	Returns the number of seeds recorded for each design string.
+	"""
+	return dict([(k[0], value.count) for k, (cash, value) in designs.iteritems() if k[2] == 0])
+
+def plan(runs, designs, args):
+	"""
+	Plans the next round as a list of (runs, start, stop) batches and
+	prints a summary of the design status.
+	"""
+	# statistics of player 0 (total cost and value are the same for all players)
+	stats = dict([(k[0], (k[1], k[7], value)) for k, (cash, value)
+			in designs.iteritems() if k[2] == 0])
+	count = np.array([stats[run][2].count if run in stats else 0 for run, line in runs])
+	players = np.array([stats[run][0] if run in stats else 0 for run, line in runs])
+	cost = np.array([stats[run][1] if run in stats else 0 for run, line in runs])
+	exp_value = np.array([stats[run][2].mean if run in stats else 0 for run, line in runs])
+	std_err = np.array([stats[run][2].stderr() if run in stats else 0 for run, line in runs])
+
+	dominated = np.zeros(len(runs), dtype=np.bool_)
+	front = np.zeros(len(runs), dtype=np.bool_)
+	ambiguity = np.zeros(len(runs))
+	for p in np.unique(players[count > 0]):
+		i = np.logical_and(players == p, count > 0)
+		dominated[i], front[i], ambiguity[i] = classify(
+				cost[i], exp_value[i], std_err[i], args.z)
+	# designs below the minimum number of seeds are always sampled first
+	settled = np.logical_and(count >= args.min, np.logical_or(dominated, front))
+	ambiguity[count < args.min] = -np.inf
+	active = np.logical_and(np.logical_not(settled), count < args.stop)
+	print '%d designs: %d dominated, %d on front, %d active, %d games' % (
+			len(runs), np.sum(np.logical_and(settled, dominated)),
+			np.sum(np.logical_and(settled, front)), np.sum(active), np.sum(count))
+
+	# allocate the next batch of seeds to the most ambiguous designs first
+	remaining = args.budget - np.sum(count) if args.budget is not None else np.inf
+	batches = {}
+	for j in sorted(np.flatnonzero(active), key=lambda j: ambiguity[j]):
+		stop = min(count[j] + args.batch, args.stop)
+		if stop - count[j] > remaining:
+			break
+		remaining -= stop - count[j]
+		batches.setdefault((count[j], stop), []).append(runs[j])
+	return [(batch, start, stop) for (start, stop), batch in sorted(batches.iteritems())]
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description='Execute designs with adaptive seed allocation.')
+	parser.add_argument('--runs', required=True, help='runs file (see fss-pool.js)')
+	parser.add_argument('--out', default='results.jsonl', help='per-seed results file')
+	parser.add_argument('--output', default='data-exp.csv', help='aggregated output file')
+	parser.add_argument('--batch', type=int, default=10, help='seeds per design per round')
+	parser.add_argument('--min', type=int, default=20, help='seeds before a design can settle')
+	parser.add_argument('--stop', type=int, default=100, help='maximum seeds per design')
+	parser.add_argument('--budget', type=int, help='maximum total games')
+	parser.add_argument('-z', type=float, default=1.96, help='confidence interval half-width in stderr')
+	parser.add_argument('-w', type=int, help='number of workers')
+	parser.add_argument('-d', type=int, help='number of turns')
+	parser.add_argument('-i', type=int, help='initial cash')
+	parser.add_argument('-o', help='federate operations model')
+	parser.add_argument('-f', help='federation operations model')
+	args = parser.parse_args()
+
+	runs = fsspp.read_runs(args.runs)
+	# records are folded into the accumulators as the results file grows
+	designs = {}
+	offset = fsspp.aggregate_from(args.out, designs) if os.path.exists(args.out) else 0
+	stalled = set()
+	while True:
+		batches = plan([r for r in runs if r[0] not in stalled], designs, args)
+		if len(batches) == 0:
+			break
+		for batch, start, stop in batches:
+			pool(batch, start, stop, args)
+		before = counts(designs)
+		if os.path.exists(args.out):
+			offset = fsspp.aggregate_from(args.out, designs, offset)
+		after = counts(designs)
+		# designs without new records (failed or infeasible runs, or runs not
+		# recorded under the same design string) would be planned forever
+		for batch, start, stop in batches:
+			for run, line in batch:
+				if after.get(run, 0) <= before.get(run, 0):
+					sys.stderr.write('warning: no new records for %s, skipped\n' % run)
+					stalled.add(run)
+	fsspp.write(args.output, designs)
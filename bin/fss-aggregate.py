@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+ Copyright 2015 Paul T. Grogan
+
+ Licensed under the Apache License, Version 2.0 (the "License");
+ you may not use this file except in compliance with the License.
+ You may obtain a copy of the License at
+
+     http://www.apache.org/licenses/LICENSE-2.0
+
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+
+"""
+ Aggregates per-seed results into per-design statistics and writes
+ data-exp.csv for the fss-exp*-pp.py scripts, replacing the MongoDB
+ mapReduce in fss-exp7-pp.js.
+
+ Inputs are per-seed records with the fields written by fss-exp7.js (run,
+ seed, player, players, totalStations, totalSatellites, isl, initialCash,
+ totalCost, finalCash, totalValue) either as JSON lines (e.g. from
+ `mongoexport -d fss -c exp7s`) or as CSV with a header row, or results
+ store directories (see resultStore.js, fss-import.js). Records are
+ streamed so memory grows with the number of designs, not seeds.
+
+ Partial results can be saved with --save and combined later with --merge:
+
+   python fss-aggregate.py part1.jsonl --save part1.state -o ''
+   python fss-aggregate.py part2.jsonl --merge part1.state -o data-exp.csv
+"""
+
+import argparse
+import json
+import fsspp
+
+def save(filename, designs):
+	with open(filename, 'wb') as f:
+		for k, (cash, value) in designs.iteritems():
+			f.write(json.dumps({'key': k, 'cash': cash.state(), 'value': value.state()}) + '\n')
+
+def merge(filenames, designs):
+	"""
+	Merges accumulator states saved by save() into designs.
+	"""
+	for filename in filenames:
+		with open(filename, 'rb') as f:
+			for line in f:
+				if not line.strip():
+					continue
+				state = json.loads(line)
+				k = tuple(state['key'])
+				if k not in designs:
+					designs[k] = (fsspp.Accumulator(), fsspp.Accumulator())
+				designs[k][0].merge(fsspp.Accumulator(*state['cash']))
+				designs[k][1].merge(fsspp.Accumulator(*state['value']))
+	return designs
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description='Aggregate per-seed fss results into data-exp.csv.')
+	parser.add_argument('inputs', nargs='*', help='per-seed records (.jsonl, .csv or results store directory)')
+	parser.add_argument('-o', '--output', default='data-exp.csv',
+			help='aggregated output file (empty to skip)')
+	parser.add_argument('--merge', nargs='+', default=[],
+			help='partial states saved with --save to merge')
+	parser.add_argument('--save', help='save partial state to this file')
+	parser.add_argument('--max-satellites', type=int,
+			help='skip designs with more satellites (fss-exp7-pp.js uses 6)')
+	args = parser.parse_args()
+
+	designs = merge(args.merge, {})
+	fsspp.aggregate(args.inputs, designs, args.max_satellites)
+	if args.save:
+		save(args.save, designs)
+	if args.output:
+		fsspp.write(args.output, designs)
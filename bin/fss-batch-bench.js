@@ -0,0 +1,91 @@
+/*
+ * Copyright 2015 Paul T. Grogan
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+/*
+ * Compares jobs/second of the in-process runner against spawning
+ * `node fss` for every seed (as in fss-batch.js and fss-exp7.js) and checks
+ * that both produce the same results.
+ *
+ *   node fss-batch-bench -n 20 -d 12 -o d6 [design ...]
+ */
+
+var requirejs = require('requirejs');
+
+requirejs.config({
+  baseUrl: __dirname + '/../lib',
+  nodeRequire: require
+});
+
+requirejs(['underscore','child_process','runner'], function(_,child_process,Runner) {
+    var argv = require('minimist')(process.argv.slice(2));
+    var numJobs = _.isNumber(argv.n)?argv.n:20;
+    var numTurns = _.isNumber(argv.d)?argv.d:12;
+    var initialCash = _.isNumber(argv.i)?argv.i:0;
+    var ops = argv.o?argv.o:'d6';
+    var designs = argv._.length>0?argv._:['1.SmallSat@LEO1,VIS,pSGL', '1.GroundSta@SUR1,pSGL'];
+
+    var runner = new Runner({
+        numTurns: numTurns,
+        initialCash: initialCash,
+        ops: ops
+    });
+    var seeds = _.range(0, numJobs);
+
+    // in-process runner
+    var inProcess = [];
+    var startTime = Date.now();
+    runner.executeAll(_.map(seeds, function(seed) {
+        return {designs: designs, seed: seed};
+    }), function(result) {
+        inProcess.push(_.map(result.federates, function(federate) {
+            return federate.initialCash+":"+federate.finalCash;
+        }).join());
+    }, function() {
+        var inProcessTime = (Date.now() - startTime)/1000;
+        console.log('in-process: ' + numJobs + ' jobs in ' + inProcessTime + ' s ('
+                + (numJobs/inProcessTime).toFixed(2) + ' jobs/s)');
+
+        // one child process per seed, executed in sequence
+        var exec = child_process.exec;
+        var perSeed = [];
+        startTime = Date.now();
+        function next(index) {
+            if(index < seeds.length) {
+                exec('node ' + __dirname + '/fss -d ' + numTurns + ' -i ' + initialCash
+                        + ' -p ' + runner.getNumPlayers(designs.join(' ')) + ' -o ' + ops
+                        + ' ' + designs.join(' ') + ' -s ' + seeds[index],
+                        function(error, stdout, stderr) {
+                            if(error !== null) {
+                                console.error('exec error: ' + error);
+                            }
+                            perSeed.push(stdout.replace('\n',''));
+                            next(index+1);
+                        });
+            } else {
+                var execTime = (Date.now() - startTime)/1000;
+                console.log('exec:       ' + numJobs + ' jobs in ' + execTime + ' s ('
+                        + (numJobs/execTime).toFixed(2) + ' jobs/s)');
+                console.log('speedup:    ' + (execTime/inProcessTime).toFixed(2) + 'x');
+                var mismatches = _.filter(seeds, function(seed, index) {
+                    return inProcess[index] !== perSeed[index];
+                });
+                console.log(mismatches.length===0?'results match':
+                        'results differ for seeds ' + mismatches.join());
+            }
+        }
+        next(0);
+    });
+});
@@ -0,0 +1,221 @@
+/*
+ * Copyright 2015 Paul T. Grogan
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+/*
+ * Benchmarks a fixed matrix of designs from the design catalog (see
+ * designCatalog.js) by operations models by seeds, executed in-process.
+ * For each design and model it reports wall time, games/s, LP build and
+ * solve time per turn, peak memory, and a checksum of the cash of each
+ * federate after each turn for each seed. The same options always execute
+ * the same games, so checksums only change if results change.
+ *
+ * Models are operations models with an optional federation operations
+ * model after a colon, e.g. `s`, `d6`, `n:f` (fixed cost), `n:x`
+ * (dynamic fixed cost). Designs are indices in the reference and
+ * federated catalogs (or `all`), or all designs of a runs file (e.g. from
+ * fss-designs.js) with --runs.
+ *
+ *   node fss-bench [--reference 0,4,9 --federated 0,3 | --runs runs.txt] [--models s,d6,n:f,n:x] [-n 3 -d 12 -i 0]
+ *
+ * Use --save bench.json to write the report and --baseline bench.json to
+ * compare with a saved report. The comparison fails (exit code 1) if a
+ * checksum differs or, with --tolerance 0.1, if the total wall time is
+ * more than 10% above the baseline.
+ */
+
+var requirejs = require('requirejs');
+
+requirejs.config({
+  baseUrl: __dirname + '/../lib',
+  nodeRequire: require
+});
+
+requirejs(['underscore','logger','fs','crypto','profiler','designCatalog','runner'], function(_,logger,fs,crypto,profiler,designCatalog,Runner) {
+    var argv = require('minimist')(process.argv.slice(2), {string: ['reference','federated','models']});
+    var numSeeds = _.isNumber(argv.n)?argv.n:3;
+    var numTurns = _.isNumber(argv.d)?argv.d:12;
+    var initialCash = _.isNumber(argv.i)?argv.i:0;
+    var models = (argv.models?argv.models:'s,d6,n:f,n:x').split(',');
+
+    // select the designs: [key, design string]
+    function select(catalog, name, indices) {
+        if(indices === 'all') {
+            indices = _.range(catalog.length).join();
+        }
+        return _.map(_.filter(indices.split(','), function(index) {
+            return index.length > 0;
+        }), function(index) {
+            if(!catalog[index]) {
+                throw new Error('no design ' + index + ' in ' + name + ' catalog');
+            }
+            return [name + '/' + index, catalog[index]];
+        });
+    }
+    var designs;
+    if(argv.runs) {
+        designs = _.map(_.filter(fs.readFileSync(argv.runs, 'utf8').split('\n'), function(line) {
+            return line.trim().length > 0;
+        }), function(line, index) {
+            line = line.trim();
+            return ['runs/' + index, line.charAt(0)==='{'?JSON.parse(line).run:line];
+        });
+    } else {
+        designs = select(designCatalog.reference, 'reference',
+                _.isString(argv.reference)?argv.reference:'0,4,9,16,22,23,31,39,44').concat(
+                select(designCatalog.federated, 'federated',
+                _.isString(argv.federated)?argv.federated:'all'));
+    }
+
+    // benchmark cells: one per design and model
+    var cells = [];
+    _.each(designs, function(design) {
+        _.each(models, function(model) {
+            cells.push({
+                design: design[0],
+                run: design[1],
+                model: model,
+                ops: model.split(':')[0],
+                fops: model.split(':')[1]
+            });
+        });
+    });
+
+    var runner = new Runner({
+        numTurns: numTurns,
+        initialCash: initialCash
+    });
+    profiler.enable();
+
+    var report = {
+        numSeeds: numSeeds,
+        numTurns: numTurns,
+        initialCash: initialCash,
+        node: process.version,
+        cells: []
+    };
+
+    /**
+     * Gets the time per turn (ms) of a phase from a list of profiles.
+     */
+    function perTurn(profiles, phase) {
+        return _.reduce(profiles, function(memo, profile) {
+            return memo + (_.has(profile.phases, phase)?profile.phases[phase].time:0);
+        }, 0)/(profiles.length*numTurns);
+    }
+
+    function executeCell(index) {
+        if(index >= cells.length) {
+            finish();
+            return;
+        }
+        var cell = cells[index];
+        var checksum = crypto.createHash('md5');
+        var profiles = [];
+        var peakRss = 0;
+        var peakHeap = 0;
+        var startTime = process.hrtime();
+        runner.executeAll(_.map(_.range(numSeeds), function(seed) {
+            return {run: cell.run, seed: seed, ops: cell.ops, fops: cell.fops};
+        }), function(result) {
+            checksum.update(JSON.stringify([result.seed, _.map(result.federates, function(federate) {
+                return [federate.id, federate.initialCash, federate.cash, federate.finalCash];
+            })]) + '\n');
+            profiles.push(result.profile);
+            var memory = process.memoryUsage();
+            peakRss = Math.max(peakRss, memory.rss);
+            peakHeap = Math.max(peakHeap, memory.heapUsed);
+        }, function() {
+            var elapsed = process.hrtime(startTime);
+            var wall = elapsed[0]*1e3 + elapsed[1]/1e6;
+            report.cells.push({
+                design: cell.design,
+                model: cell.model,
+                run: cell.run,
+                wall: wall,
+                gamesPerSecond: 1e3*numSeeds/wall,
+                buildPerTurn: perTurn(profiles, 'ops.build'),
+                solvePerTurn: perTurn(profiles, 'ops.solve'),
+                peakRss: peakRss/1048576,
+                peakHeap: peakHeap/1048576,
+                checksum: checksum.digest('hex')
+            });
+            executeCell(index+1);
+        });
+    }
+
+    function finish() {
+        var baseline;
+        if(argv.baseline) {
+            var saved = JSON.parse(fs.readFileSync(argv.baseline, 'utf8'));
+            if(saved.numSeeds !== numSeeds || saved.numTurns !== numTurns
+                    || saved.initialCash !== initialCash) {
+                console.error('baseline ' + argv.baseline + ' uses other options (-n '
+                        + saved.numSeeds + ' -d ' + saved.numTurns + ' -i ' + saved.initialCash + ')');
+                process.exit(1);
+            }
+            baseline = _.indexBy(saved.cells, function(cell) {
+                return cell.design + ' ' + cell.model;
+            });
+        }
+        var failed = false;
+        var total = 0;
+        var matchedTotal = 0;
+        var baselineTotal = 0;
+        console.log(['design', 'model', 'wall (ms)', 'games/s', 'build/turn', 'solve/turn',
+                'rss (MB)', 'heap (MB)', 'checksum'].concat(baseline?['speedup']:[]).join('\t'));
+        _.each(report.cells, function(cell) {
+            var row = [cell.design, cell.model, cell.wall.toFixed(0), cell.gamesPerSecond.toFixed(2),
+                    cell.buildPerTurn.toFixed(3), cell.solvePerTurn.toFixed(3),
+                    cell.peakRss.toFixed(1), cell.peakHeap.toFixed(1), cell.checksum.substr(0, 8)];
+            total += cell.wall;
+            if(baseline) {
+                var base = baseline[cell.design + ' ' + cell.model];
+                if(!base) {
+                    row.push('new');
+                } else {
+                    matchedTotal += cell.wall;
+                    baselineTotal += base.wall;
+                    row.push((base.wall/cell.wall).toFixed(2) + 'x');
+                    if(base.run !== cell.run || base.checksum !== cell.checksum) {
+                        row[8] += ' (differs)';
+                        failed = true;
+                    }
+                }
+            }
+            console.log(row.join('\t'));
+        });
+        report.wall = total;
+        console.log('total: ' + report.cells.length*numSeeds + ' games in ' + (total/1e3).toFixed(2) + ' s ('
+                + (1e3*report.cells.length*numSeeds/total).toFixed(2) + ' games/s)'
+                + (baseline?'; ' + (matchedTotal/1e3).toFixed(2) + ' s for cells in the baseline ('
+                + (baselineTotal/1e3).toFixed(2) + ' s)':''));
+        if(baseline && failed) {
+            console.error('checksums differ from baseline ' + argv.baseline);
+        }
+        if(baseline && _.isNumber(argv.tolerance) && baselineTotal > 0
+                && matchedTotal > (1 + argv.tolerance)*baselineTotal) {
+            console.error('wall time ' + (matchedTotal/baselineTotal).toFixed(2)
+                    + 'x baseline exceeds tolerance ' + argv.tolerance);
+            failed = true;
+        }
+        if(argv.save) {
+            fs.writeFileSync(argv.save, JSON.stringify(report, null, 2) + '\n');
+        }
+        process.exit(failed?1:0);
+    }
+
+    executeCell(0);
+});
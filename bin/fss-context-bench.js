@@ -0,0 +1,155 @@
+/*
+ * Copyright 2015 Paul T. Grogan
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+/*
+ * Times the context location queries (propagate, getSystemLocation, and
+ * getSystems) using the precomputed tables against the original linear
+ * scans, and times complete games with many systems.
+ *
+ *   node fss-context-bench -n 100000 -g 5 -d 24 -o s [design ...]
+ */
+
+var requirejs = require('requirejs');
+
+requirejs.config({
+  baseUrl: __dirname + '/../lib',
+  nodeRequire: require
+});
+
+requirejs(['underscore','game','runner'], function(_,Game,Runner) {
+    var argv = require('minimist')(process.argv.slice(2));
+    var numQueries = _.isNumber(argv.n)?argv.n:100000;
+    var numGames = _.isNumber(argv.g)?argv.g:5;
+    var numTurns = _.isNumber(argv.d)?argv.d:24;
+    var ops = argv.o?argv.o:'s';
+
+    // default design: 18 spacecraft in all sectors and 6 ground stations
+    var designs = argv._;
+    if(designs.length === 0) {
+        _.each(_.range(1, 7), function(sector) {
+            designs.push('1.SmallSat@LEO' + sector + ',VIS,pSGL');
+            designs.push('1.SmallSat@LEO' + sector + ',SAR,pSGL');
+            designs.push('1.MediumSat@MEO' + sector + ',VIS,SAR,pSGL');
+            designs.push('1.GroundSta@SUR' + sector + ',pSGL');
+        });
+    }
+
+    /**
+     * Times a function.
+     * @param {String} label - The label to print.
+     * @param {function} func - The function to time.
+     * @returns {Number} The elapsed time (s).
+     */
+    function time(label, func) {
+        var startTime = Date.now();
+        func();
+        var elapsed = (Date.now() - startTime)/1000;
+        console.log(label + elapsed + ' s');
+        return elapsed;
+    }
+
+    var runner = new Runner({
+        numTurns: numTurns,
+        initialCash: 0,
+        ops: ops
+    });
+
+    // build a context with all designs commissioned
+    var game = new Game({numTurns: numTurns, numPlayers: runner.getNumPlayers(designs.join(' ')), initialCash: 1e9});
+    var context = game.buildContext(0, ops);
+    _.each(runner.buildDesigns(game, context, designs), function(designSet, index) {
+        _.each(designSet, function(design) {
+            context.federations[0].federates[index].design(design.system);
+            context.federations[0].federates[index].commission(design.system, design.location, context);
+        });
+    });
+    var systems = _.flatten(_.map(context.federations[0].federates, function(federate) {
+        return federate.systems;
+    }));
+    console.log(systems.length + ' systems, ' + context.locations.length + ' locations');
+
+    // legacy queries
+    var legacy = {
+        propagate: function(location, duration) {
+            return context.propagateLocation(location, duration);
+        },
+        getSystemLocation: function(system) {
+            return _.findWhere(context.locations, {id: system.location});
+        },
+        getSystems: function(location) {
+            var found = [];
+            _.each(context.federations, function(federation) {
+                _.each(federation.federates, function(federate) {
+                    _.each(federate.systems, function(system) {
+                        if(system.location===location.id) {
+                            found.push(system);
+                        }
+                    });
+                });
+            });
+            return found;
+        }
+    };
+
+    // check that both give the same answers
+    var mismatches = 0;
+    _.each(context.locations, function(location) {
+        _.each(_.range(0, 2*numTurns), function(duration) {
+            if(context.propagate(location, duration) !== legacy.propagate(location, duration)) {
+                mismatches++;
+            }
+        });
+        if(!_.isEqual(_.pluck(context.getSystems(location), 'id'),
+                _.pluck(legacy.getSystems(location), 'id'))) {
+            mismatches++;
+        }
+    });
+    console.log(mismatches===0?'results match':mismatches + ' results differ');
+
+    _.each(['propagate', 'getSystemLocation', 'getSystems'], function(query) {
+        var args = function(i) {
+            if(query==='propagate') {
+                return [context.getSystemLocation(systems[i%systems.length]), i%numTurns];
+            } else if(query==='getSystemLocation') {
+                return [systems[i%systems.length]];
+            } else {
+                return [context.locations[i%context.locations.length]];
+            }
+        };
+        var legacyTime = time(query + ' (scan):  ', function() {
+            _.each(_.range(numQueries), function(i) {
+                legacy[query].apply(legacy, args(i));
+            });
+        });
+        var tableTime = time(query + ' (table): ', function() {
+            _.each(_.range(numQueries), function(i) {
+                context[query].apply(context, args(i));
+            });
+        });
+        console.log(query + ' speedup: ' + (legacyTime/tableTime).toFixed(2) + 'x');
+    });
+
+    // complete games
+    var startTime = Date.now();
+    runner.executeAll(_.map(_.range(numGames), function(seed) {
+        return {designs: designs, seed: seed};
+    }), function() { }, function() {
+        var elapsed = (Date.now() - startTime)/1000;
+        console.log(numGames + ' games of ' + numTurns + ' turns with '
+                + systems.length + ' systems in ' + elapsed + ' s ('
+                + (numGames/elapsed).toFixed(2) + ' games/s)');
+    });
+});
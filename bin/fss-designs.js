@@ -0,0 +1,61 @@
+/*
+ * Copyright 2015 Paul T. Grogan
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+/*
+ * Prints the canonical, non-dominated designs of a design space (see
+ * designSpace.js) one per line, e.g. as a runs file for fss-pool.js or
+ * fss-adaptive.py. Designs are enumerated lazily, so large spaces are
+ * streamed without holding them in memory. Use --count to only print the
+ * number of designs.
+ *
+ *   node fss-designs -n 2 --sectors 1,4 --sgl pSGL --isl oISL --orbits LEO,MEO [--symmetric] [--maxCost 2000] [--count] > runs.txt
+ */
+
+var requirejs = require('requirejs');
+
+requirejs.config({
+  baseUrl: __dirname + '/../lib',
+  nodeRequire: require
+});
+
+requirejs(['underscore','designSpace'], function(_,DesignSpace) {
+    var argv = require('minimist')(process.argv.slice(2));
+    var options = {
+        numSatellites: _.isNumber(argv.n)?argv.n:1,
+        sectors: _.map(String(argv.sectors!==undefined?argv.sectors:1).split(','), Number),
+        sgl: argv.sgl?argv.sgl:'pSGL',
+        isl: argv.isl===false?undefined:(argv.isl?argv.isl:'pISL'),
+        orbits: argv.orbits?argv.orbits.split(','):['MEO'],
+        symmetric: argv.symmetric===true
+    };
+    _.each(['maxMedium','maxLarge','maxCost'], function(option) {
+        if(_.isNumber(argv[option])) {
+            options[option] = argv[option];
+        }
+    });
+    if(argv.satellites) {
+        options.satellites = argv.satellites.split(';');
+    }
+    var space = new DesignSpace(options);
+    var count = space.each(function(design) {
+        if(argv.count !== true) {
+            console.log(design);
+        }
+    });
+    if(argv.count === true) {
+        console.log(count);
+    }
+});
@@ -16,68 +16,69 @@
 """
 
 
-import csv
 import re
 import numpy as np
 import scipy.stats as stats
+import matplotlib
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
+import fsspp
 
-id = np.array([])
-run = np.array([])
-cost = np.array([])
-exp_value = np.array([])
-min_value = np.array([])
-max_value = np.array([])
-std_err = np.array([])
-isl = np.array([], dtype=np.bool_)
-osgl = np.array([], dtype=np.bool_)
-players = np.array([])
-player = np.array([])
-stations = np.array([])
-satellites = np.array([])
-totalCost = np.array([])
-totalExpValue = np.array([])
-totalStdErr = np.array([])
+data = fsspp.load('data-exp.csv')
+id = data.id
+run = data.run
+cost = data.cost
+exp_value = data.exp_value
+min_value = data.min_value
+max_value = data.max_value
+std_err = data.std_err
+isl = data.isl
+osgl = data.osgl
+players = data.players
+player = data.player
+stations = data.stations
+satellites = data.satellites
+totalCost = data.totalCost
+totalExpValue = data.totalExpValue
+totalStdErr = data.totalStdErr
+exp_value = exp_value - cost
+totalExpValue = totalExpValue - totalCost
 
-with open('data-exp.csv','rb') as csvfile:
-    reader = csv.reader(csvfile, delimiter=',')
-    reader.next() # skip header
-    counter = 0
-    for row in reader:
-		counter+=1
-		# if int(row[1])==0 and int(row[2])==1:# and row[3]=='false':
-		run = np.append(run, row[0])
-		id = np.append(id, counter)
-		players = np.append(players, int(row[1]))
-		player = np.append(player, int(row[2]))
-		satellites = np.append(satellites, int(row[3]))
-		stations = np.append(stations, int(row[4]))
-		isl = np.append(isl, row[5]=='true')
-		osgl = np.append(osgl, 'oSGL' in row[0])
-		cost = np.append(cost, float(row[6]))
-		min_value = np.append(min_value, float(row[7]))
-		max_value = np.append(max_value, float(row[8]))
-		exp_value = np.append(exp_value, float(row[10]))
-		std_err = np.append(std_err, float(row[12]))
-		totalCost = np.append(totalCost, float(row[13]))
-		totalExpValue = np.append(totalExpValue, float(row[14]))
-		totalStdErr = np.append(totalStdErr, float(row[15]))
-    exp_value = exp_value - cost
-    totalExpValue = totalExpValue - totalCost
+# figure specs: players>1 plot the per-player share of the federation totals
+FIGURES = [
+	{'label': '1', 'players': 1},
+	{'label': '2', 'players': 2, 'player': 0},
+	{'label': '3', 'players': 3, 'player': 0},
+	{'label': '1-1', 'players': 1, 'satellites': 1},
+	{'label': '1-2', 'players': 1, 'satellites': 2},
+	{'label': '1-3', 'players': 1, 'satellites': 3},
+	{'label': '1-4', 'players': 1, 'satellites': 4},
+	{'label': '1-5', 'players': 1, 'satellites': 5},
+	{'label': '1-6', 'players': 1, 'satellites': 6},
+	{'label': '2-2', 'players': 2, 'player': 0, 'satellites': 2},
+	{'label': '2-4', 'players': 2, 'player': 0, 'satellites': 4},
+	{'label': '2-6', 'players': 2, 'player': 0, 'satellites': 6},
+	{'label': '3-3', 'players': 3, 'player': 0, 'satellites': 3},
+	{'label': '3-6', 'players': 3, 'player': 0, 'satellites': 6}
+]
 
-def pareto(id, cost, exp_value, std_err):
-	p_id = np.array([])
-	p_cost = np.array([])
-	p_value = np.array([])
-	for i in range(0,np.size(cost)):
-		if  exp_value[i] > 0 and np.sum(np.logical_and(cost<=cost[i], 
-				exp_value-1.96*std_err>exp_value[i]+1.96*std_err[i])) == 0:
-			p_id = np.append(p_id, id[i])
-			p_cost = np.append(p_cost, cost[i])
-			p_value = np.append(p_value, exp_value[i])
-	return p_id, p_cost, p_value
+def prepare(spec):
+	"""
+	Selects the designs of a figure spec and computes the category index
+	sets and the Pareto set of each category for tradespace.
+	"""
+	i = fsspp.select(data, spec)
+	if spec['players'] > 1:
+		c = totalCost[i]/spec['players']
+		v = totalExpValue[i]/spec['players']
+		e = totalStdErr[i]/spec['players']
+	else:
+		c, v, e = cost[i], exp_value[i], std_err[i]
+	index = fsspp.groups(fsspp.category(isl[i], osgl[i]), 4)
+	fronts = [j[fsspp.pareto(c[j], v[j], e[j])[0]] for j in index]
+	return (spec['label'], id[i], c, v, e, run[i], isl[i], osgl[i], index, fronts)
 
-def tradespace(label, id, cost, exp_value, std_err, run, isl, osgl):
+def tradespace(label, id, cost, exp_value, std_err, run, isl, osgl, index, fronts):
 	plt.clf()
 	plt.rcParams.update({'axes.labelsize':8, 
 						 'font.size':8, 
@@ -86,35 +87,20 @@ def tradespace(label, id, cost, exp_value, std_err, run, isl, osgl):
 						 'xtick.labelsize':8,
 						 'ytick.labelsize':8})
 
+	# categories as ((isl, osgl), errorbar color, marker color, annotation color)
+	categories = [((False, False), [.6,.6,.6,.3], [0,0,0,.3], 'k'),
+			((True, False), [.6,.6,1,.3], [0,0,1,.3], 'b'),
+			((False, True), [1,.6,.6,.3], [1,0,0,.3], 'r'),
+			((True, True), [.6,1,.6,.3], [0,1,0,.3], 'g')]
+
 	# plt.errorbar(cost, exp_value, yerr=[exp_value-min_value,max_value-exp_value],ls='.',c='r')
-	plt.errorbar(cost[np.logical_and(isl==False,osgl==False)], 
-		exp_value[np.logical_and(isl==False,osgl==False)], 
-		yerr=1.96*std_err[np.logical_and(isl==False,osgl==False)],
-		fmt='none',color='k',ecolor=[.6,.6,.6,.3])
-	plt.errorbar(cost[np.logical_and(isl,osgl==False)], 
-		exp_value[np.logical_and(isl,osgl==False)], 
-		yerr=1.96*std_err[np.logical_and(isl,osgl==False)],
-		fmt='none',color='b',ecolor=[.6,.6,1,.3])
-	plt.errorbar(cost[np.logical_and(isl==False,osgl)], 
-		exp_value[np.logical_and(isl==False,osgl)], 
-		yerr=1.96*std_err[np.logical_and(isl==False,osgl)],
-		fmt='none',color='b',ecolor=[1,.6,.6,.3])
-	plt.errorbar(cost[np.logical_and(isl,osgl)], 
-		exp_value[np.logical_and(isl,osgl)], 
-		yerr=1.96*std_err[np.logical_and(isl,osgl)],
-		fmt='none',color='b',ecolor=[.6,1,.6,.3])
-	plt.plot(cost[np.logical_and(isl==False,osgl==False)], 
-		exp_value[np.logical_and(isl==False,osgl==False)], 
-		ls='', marker='.',mec='none',color=[0,0,0,.3])
-	plt.plot(cost[np.logical_and(isl,osgl==False)], 
-		exp_value[np.logical_and(isl,osgl==False)], 
-		ls='', marker='.',mec='none',color=[0,0,1,.3])
-	plt.plot(cost[np.logical_and(isl==False,osgl)], 
-		exp_value[np.logical_and(isl==False,osgl)], 
-		ls='', marker='.',mec='none',color=[1,0,0,.3])
-	plt.plot(cost[np.logical_and(isl,osgl)], 
-		exp_value[np.logical_and(isl,osgl)], 
-		ls='', marker='.',mec='none',color=[0,1,0,.3])
+	for flags, ecolor, color, acolor in categories:
+		i = index[fsspp.category(*flags)]
+		plt.errorbar(cost[i], exp_value[i], yerr=1.96*std_err[i],
+			fmt='none',color=acolor,ecolor=ecolor)
+	for flags, ecolor, color, acolor in categories:
+		i = index[fsspp.category(*flags)]
+		plt.plot(cost[i], exp_value[i], ls='', marker='.',mec='none',color=color)
 	"""
 	for i in range(0,np.size(run)):
 		if not osgl[i] and np.sum(np.logical_and(cost[osgl==False]<=cost[i], exp_value[osgl==False]>exp_value[i])) == 0:
@@ -126,50 +112,16 @@ def tradespace(label, id, cost, exp_value, std_err, run, isl, osgl):
 						xytext=(-5,4), textcoords='offset points', size=8,
 						color='g' if isl[i] else 'r')
 	"""
-	if np.size(id[np.logical_and(osgl==False,isl==False)])>0:
-		p_id, p_cost, p_value = pareto(id[np.logical_and(osgl==False,isl==False)], 
-				cost[np.logical_and(osgl==False,isl==False)], 
-				exp_value[np.logical_and(osgl==False,isl==False)], 
-				std_err[np.logical_and(osgl==False,isl==False)])
-		for i in range(0,np.size(p_id)):
-			plt.annotate('%0d'%p_id[i], xy=(p_cost[i], p_value[i]),
-						xytext=(-5,4), textcoords='offset points', size=8, color='k')
-		m, b, r, p, se = stats.linregress(p_cost, p_value)
-		x_r = np.linspace(np.amin(p_cost), np.amax(p_cost), 100)
-		plt.plot(x_r, b + m*x_r,ls='-',color=[0,0,0,.3])
-	if np.size(id[np.logical_and(osgl==False,isl==True)])>0:
-		p_id, p_cost, p_value = pareto(id[np.logical_and(osgl==False,isl==True)], 
-				cost[np.logical_and(osgl==False,isl==True)], 
-				exp_value[np.logical_and(osgl==False,isl==True)], 
-				std_err[np.logical_and(osgl==False,isl==True)])
-		for i in range(0,np.size(p_id)):
-			plt.annotate('%0d'%p_id[i], xy=(p_cost[i], p_value[i]),
-						xytext=(-5,4), textcoords='offset points', size=8, color='b')
-		m, b, r, p, se = stats.linregress(p_cost, p_value)
-		x_r = np.linspace(np.amin(p_cost), np.amax(p_cost), 100)
-		plt.plot(x_r, b + m*x_r,ls='-',color=[0,0,1,.3])
-	if np.size(id[np.logical_and(osgl==True,isl==False)])>0:
-		p_id, p_cost, p_value = pareto(id[np.logical_and(osgl==True,isl==False)], 
-				cost[np.logical_and(osgl==True,isl==False)], 
-				exp_value[np.logical_and(osgl==True,isl==False)], 
-				std_err[np.logical_and(osgl==True,isl==False)])
-		for i in range(0,np.size(p_id)):
-			plt.annotate('%0d'%p_id[i], xy=(p_cost[i], p_value[i]),
-						xytext=(-5,4), textcoords='offset points', size=8, color='r')
-		m, b, r, p, se = stats.linregress(p_cost, p_value)
-		x_r = np.linspace(np.amin(p_cost), np.amax(p_cost), 100)
-		plt.plot(x_r, b + m*x_r,ls='-',color=[1,0,0,.3])
-	if np.size(id[np.logical_and(osgl==True,isl==True)])>0:
-		p_id, p_cost, p_value = pareto(id[np.logical_and(osgl==True,isl==True)], 
-				cost[np.logical_and(osgl==True,isl==True)], 
-				exp_value[np.logical_and(osgl==True,isl==True)], 
-				std_err[np.logical_and(osgl==True,isl==True)])
-		for i in range(0,np.size(p_id)):
-			plt.annotate('%0d'%p_id[i], xy=(p_cost[i], p_value[i]),
-						xytext=(-5,4), textcoords='offset points', size=8, color='g')
-		m, b, r, p, se = stats.linregress(p_cost, p_value)
-		x_r = np.linspace(np.amin(p_cost), np.amax(p_cost), 100)
-		plt.plot(x_r, b + m*x_r,ls='-',color=[0,1,0,.3])
+	for flags, ecolor, color, acolor in categories:
+		i = fronts[fsspp.category(*flags)]
+		if np.size(i)>0:
+			p_id, p_cost, p_value = id[i], cost[i], exp_value[i]
+			for j in range(0,np.size(p_id)):
+				plt.annotate('%0d'%p_id[j], xy=(p_cost[j], p_value[j]),
+							xytext=(-5,4), textcoords='offset points', size=8, color=acolor)
+			m, b, r, p, se = stats.linregress(p_cost, p_value)
+			x_r = np.linspace(np.amin(p_cost), np.amax(p_cost), 100)
+			plt.plot(x_r, b + m*x_r,ls='-',color=color)
 	plt.xlabel('Initial Cost ($\S$)')
 	plt.ylabel('Net Expected Value ($\S$)')
 	plt.xlim([1000, 5000])
@@ -181,105 +133,5 @@ def tradespace(label, id, cost, exp_value, std_err, run, isl, osgl):
 	plt.savefig(label+'-exp-ts.png', dpi=300)
 	#plt.savefig(label+'-exp-ts.pdf')
 	
-if np.size(id[players==1]) > 0:
-	tradespace('1', id[players==1], 
-		cost[players==1], 
-		exp_value[players==1],
-		std_err[players==1], 
-		run[players==1], 
-		isl[players==1], 
-		osgl[players==1])
-if np.size(id[np.logical_and(players==2,player==0)]) > 0:
-	tradespace('2', id[np.logical_and(players==2,player==0)], 
-		totalCost[np.logical_and(players==2,player==0)]/2, 
-		totalExpValue[np.logical_and(players==2,player==0)]/2,
-		totalStdErr[np.logical_and(players==2,player==0)]/2, 
-		run[np.logical_and(players==2,player==0)], 
-		isl[np.logical_and(players==2,player==0)], 
-		osgl[np.logical_and(players==2,player==0)])
-"""
-tradespace('3', id[np.logical_and(players==3,player==0)], 
-	totalCost[np.logical_and(players==3,player==0)]/3, 
-	totalExpValue[np.logical_and(players==3,player==0)]/3,
-	totalStdErr[np.logical_and(players==3,player==0)]/3, 
-	run[np.logical_and(players==3,player==0)], 
-	isl[np.logical_and(players==3,player==0)], 
-	osgl[np.logical_and(players==3,player==0)])
-tradespace('1-1', id[np.logical_and(players==1,satellites==1)], 
-	cost[np.logical_and(players==1,satellites==1)], 
-	exp_value[np.logical_and(players==1,satellites==1)],
-	std_err[np.logical_and(players==1,satellites==1)], 
-	run[np.logical_and(players==1,satellites==1)], 
-	isl[np.logical_and(players==1,satellites==1)], 
-	osgl[np.logical_and(players==1,satellites==1)])
-tradespace('1-2', id[np.logical_and(players==1,satellites==2)], 
-	cost[np.logical_and(players==1,satellites==2)], 
-	exp_value[np.logical_and(players==1,satellites==2)],
-	std_err[np.logical_and(players==1,satellites==2)], 
-	run[np.logical_and(players==1,satellites==2)], 
-	isl[np.logical_and(players==1,satellites==2)], 
-	osgl[np.logical_and(players==1,satellites==2)])
-tradespace('1-3', id[np.logical_and(players==1,satellites==3)], 
-	cost[np.logical_and(players==1,satellites==3)], 
-	exp_value[np.logical_and(players==1,satellites==3)],
-	std_err[np.logical_and(players==1,satellites==3)], 
-	run[np.logical_and(players==1,satellites==3)], 
-	isl[np.logical_and(players==1,satellites==3)], 
-	osgl[np.logical_and(players==1,satellites==3)])
-tradespace('1-4', id[np.logical_and(players==1,satellites==4)], 
-	cost[np.logical_and(players==1,satellites==4)], 
-	exp_value[np.logical_and(players==1,satellites==4)],
-	std_err[np.logical_and(players==1,satellites==4)], 
-	run[np.logical_and(players==1,satellites==4)], 
-	isl[np.logical_and(players==1,satellites==4)], 
-	osgl[np.logical_and(players==1,satellites==4)])
-tradespace('1-5', id[np.logical_and(players==1,satellites==5)], 
-	cost[np.logical_and(players==1,satellites==5)], 
-	exp_value[np.logical_and(players==1,satellites==5)],
-	std_err[np.logical_and(players==1,satellites==5)], 
-	run[np.logical_and(players==1,satellites==5)], 
-	isl[np.logical_and(players==1,satellites==5)], 
-	osgl[np.logical_and(players==1,satellites==5)])
-tradespace('1-6', id[np.logical_and(players==1,satellites==6)], 
-	cost[np.logical_and(players==1,satellites==6)], 
-	exp_value[np.logical_and(players==1,satellites==6)],
-	std_err[np.logical_and(players==1,satellites==6)], 
-	run[np.logical_and(players==1,satellites==6)], 
-	isl[np.logical_and(players==1,satellites==6)], 
-	osgl[np.logical_and(players==1,satellites==6)])
-tradespace('2-2', id[np.logical_and.reduce((players==2, player==0, satellites==2))], 
-	totalCost[np.logical_and.reduce((players==2, player==0, satellites==2))]/2, 
-	totalExpValue[np.logical_and.reduce((players==2, player==0, satellites==2))]/2,
-	totalStdErr[np.logical_and.reduce((players==2, player==0, satellites==2))]/2, 
-	run[np.logical_and.reduce((players==2, player==0, satellites==2))], 
-	isl[np.logical_and.reduce((players==2, player==0, satellites==2))], 
-	osgl[np.logical_and.reduce((players==2,player==0, satellites==2))])
-tradespace('2-4', id[np.logical_and.reduce((players==2, player==0, satellites==4))], 
-	totalCost[np.logical_and.reduce((players==2, player==0, satellites==4))]/2, 
-	totalExpValue[np.logical_and.reduce((players==2, player==0, satellites==4))]/2,
-	totalStdErr[np.logical_and.reduce((players==2, player==0, satellites==4))]/2, 
-	run[np.logical_and.reduce((players==2, player==0, satellites==4))], 
-	isl[np.logical_and.reduce((players==2, player==0, satellites==4))], 
-	osgl[np.logical_and.reduce((players==2,player==0, satellites==4))])
-tradespace('2-6', id[np.logical_and.reduce((players==2, player==0, satellites==6))], 
-	totalCost[np.logical_and.reduce((players==2, player==0, satellites==6))]/2, 
-	totalExpValue[np.logical_and.reduce((players==2, player==0, satellites==6))]/2,
-	totalStdErr[np.logical_and.reduce((players==2, player==0, satellites==6))]/2, 
-	run[np.logical_and.reduce((players==2, player==0, satellites==6))], 
-	isl[np.logical_and.reduce((players==2, player==0, satellites==6))], 
-	osgl[np.logical_and.reduce((players==2,player==0, satellites==6))])
-tradespace('3-3', id[np.logical_and.reduce((players==3, player==0, satellites==3))], 
-	totalCost[np.logical_and.reduce((players==3, player==0, satellites==3))]/3, 
-	totalExpValue[np.logical_and.reduce((players==3, player==0, satellites==3))]/3,
-	totalStdErr[np.logical_and.reduce((players==3, player==0, satellites==3))]/3, 
-	run[np.logical_and.reduce((players==3, player==0, satellites==3))], 
-	isl[np.logical_and.reduce((players==3, player==0, satellites==3))], 
-	osgl[np.logical_and.reduce((players==3,player==0, satellites==3))])
-tradespace('3-6', id[np.logical_and.reduce((players==3, player==0, satellites==6))], 
-	totalCost[np.logical_and.reduce((players==3, player==0, satellites==6))]/3, 
-	totalExpValue[np.logical_and.reduce((players==3, player==0, satellites==6))]/3,
-	totalStdErr[np.logical_and.reduce((players==3, player==0, satellites==6))]/3, 
-	run[np.logical_and.reduce((players==3, player==0, satellites==6))], 
-	isl[np.logical_and.reduce((players==3, player==0, satellites==6))], 
-	osgl[np.logical_and.reduce((players==3,player==0, satellites==6))])
-"""
\ No newline at end of file
+fsspp.render([(tradespace, prepare(spec)) for spec in FIGURES
+		if np.any(fsspp.select(data, spec))])
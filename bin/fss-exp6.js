@@ -558,23 +558,34 @@ requirejs(['underscore','winston','child_process','minimist','mongojs'], functio
 				ops = ' -o n -f d6 ';
 			}
 			var exec = child_process.exec, child;
-			var command = 'node fss -d 24 -i 0 -p ' + numPlayers + ops
+			var command = 'node fss --ndjson -d 24 -i 0 -p ' + numPlayers + ops
 					+ run + ' -s ' + seed;
 			child = exec(command, function(error, stdout, stderr) {
 				if (error !== null) {
-					logger.error('exec error: ' + error);
+					logger.error('exec error: ' + error + stderr);
+				}
+				var values;
+				try {
+					values = JSON.parse(stdout).federates;
+				} catch(e) {
+					// skip a crashed or empty run so the rest of the sweep continues
+					logger.error('Invalid result for run ' + run + ' seed ' + seed + ': ' + stdout);
+					execCounter++;
+					if(execCounter===runs.length) {
+						batchDone();
+					}
+					return;
 				}
-				var values = stdout.replace('\n','').split(',');
 				var totalCost = 0;
 				var totalValue = 0;
 				_.each(values, function(value, player) {
-					totalCost += parseFloat(value.split(':')[0]);
-					totalValue += parseFloat(value.split(':')[1]);
+					totalCost += value.initialCash;
+					totalValue += value.finalCash;
 				});
 				var dbCounter = 0;
 				_.each(values, function(value, player) {
-					var initialCash = parseFloat(value.split(':')[0]);
-					var finalCash = parseFloat(value.split(':')[1]);
+					var initialCash = value.initialCash;
+					var finalCash = value.finalCash;
 					db.collection('exp6s').update(
 						{run: run, seed: seed, player: player},
 						{$set: 
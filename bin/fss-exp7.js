@@ -16,9 +16,15 @@
  
 var requirejs = require('requirejs');
 
-requirejs(['underscore','winston','child_process','minimist','mongojs'], function(_,logger,child_process,minimist,mongo) {
+requirejs.config({
+  baseUrl: __dirname + '/../lib',
+  nodeRequire: require
+});
+
+requirejs(['underscore','winston','child_process','minimist','mongojs','resultStore','runner'], function(_,logger,child_process,minimist,mongo,ResultStore,Runner) {
     var argv = minimist(process.argv.slice(2)); // parse command-line arguments
 	var db = mongo("fss"); // create database object
+	var runner = new Runner(); // operations models by design (see Runner.getExperimentOps)
 	
     /**
      * Enumerates combinations of a specified size (with or without replacement) 
@@ -474,20 +480,6 @@ requirejs(['underscore','winston','child_process','minimist','mongojs'], functio
 			});
 	}
 	
-	var runs = _.union(
-			enumSymmetricPxNSatDesigns(1,[1,2],[1,6],"pSGL","pISL"),
-			enumSymmetricPxNSatDesigns(2,[1,2],[1,5],"pSGL","pISL"),
-			enumSymmetricPxNSatDesigns(3,[1,2],[1,4],"pSGL","pISL"),
-			enumSymmetricPxNSatDesigns(1,[1,2],[1,6],"pSGL","oISL"),
-			enumSymmetricPxNSatDesigns(2,[1,2],[1,5],"pSGL","oISL"),
-			enumSymmetricPxNSatDesigns(3,[1,2],[1,4],"pSGL","oISL"),
-			enumSymmetricPxNSatDesigns(1,[1,2],[1,6],"oSGL","oISL"),
-			enumSymmetricPxNSatDesigns(2,[1,2],[1,5],"oSGL","oISL"),
-			enumSymmetricPxNSatDesigns(3,[1,2],[1,4],"oSGL","oISL"),
-			enumSymmetricPxNSatDesigns(1,[1,2],[1,6],"oSGL","pISL"),
-			enumSymmetricPxNSatDesigns(2,[1,2],[1,5],"oSGL","pISL"),
-			enumSymmetricPxNSatDesigns(3,[1,2],[1,4],"oSGL","pISL")
-		);
 	var runs = _.union(
 			enumSymmetricPxNSatDesigns(4,[1,2],[1,4],"pSGL","pISL"),
 			enumSymmetricPxNSatDesigns(4,[1,2],[1,4],"pSGL","oISL"),
@@ -499,7 +491,18 @@ requirejs(['underscore','winston','child_process','minimist','mongojs'], functio
 	var stop = _.isNumber(argv.stop)?argv.stop:100;
 	var batchSize = _.isNumber(argv.bsize)?argv.bsize:3;
 	
-	execute(runs, batchSize, start, stop, function() { db.close(); });
+	
+	// optionally append results to a local results store instead of MongoDB
+	var store;
+	if(argv.store) {
+		store = new ResultStore({directory: argv.store});
+		store.open();
+		store.closeOnExit();
+	}
+	
+	execute(runs, batchSize, start, stop, function() { 
+		db.close(); 
+	});
 	
 	function execute(runs, batchSize, startSeed, stopSeed, exeComplete) {
 		console.info('Executing ' + runs.length + ' runs for seeds ' + startSeed + '-' + stopSeed);
@@ -537,13 +540,17 @@ requirejs(['underscore','winston','child_process','minimist','mongojs'], functio
 		var execCounter = 0;
 		_.each(runs, function(run) {
 			var numPlayers = parseInt(_.max(run.match(/(\d)\./g)))
-			var ops = ' ';
-			if(numPlayers===1 || (!run.match(/oSGL/) && !run.match(/oISL/g))) {
-				ops = ' -o d6 ';
-			} else if(numPlayers>1) {
-				ops = ' -o n -f d6 ';
-			}
-			db.collection('exp6s').find({run:run,seed:seed}, function(err, docs) {
+			var models = runner.getExperimentOps(run);
+			var ops = ' -o ' + models.ops + (models.fops?' -f ' + models.fops:'') + ' ';
+			var lookup = function(callback) {
+				if(store) {
+					// no exp6s results to reuse with a results store
+					callback(null, []);
+				} else {
+					db.collection('exp6s').find({run:run,seed:seed}, callback);
+				}
+			};
+			lookup(function(err, docs) {
 				if(err) {
 					logger.error(err);
 				} else if(docs.length>0) {
@@ -555,23 +562,55 @@ requirejs(['underscore','winston','child_process','minimist','mongojs'], functio
 					});
 				} else {
 					var exec = child_process.exec, child;
-					var command = 'node fss -d 24 -i 0 -p ' + numPlayers + ops
+					var command = 'node fss --ndjson -d 24 -i 0 -p ' + numPlayers + ops
 							+ run + ' -s ' + seed;
 					child = exec(command, function(error, stdout, stderr) {
 						if (error !== null) {
-							logger.error('exec error: ' + error);
+							logger.error('exec error: ' + error + stderr);
+						}
+						var values;
+						try {
+							values = JSON.parse(stdout).federates;
+						} catch(e) {
+							// skip a crashed or empty run so the rest of the sweep continues
+							logger.error('Invalid result for run ' + run + ' seed ' + seed + ': ' + stdout);
+							execCounter++;
+							if(execCounter===runs.length) {
+								batchDone();
+							}
+							return;
 						}
-						var values = stdout.replace('\n','').split(',');
 						var totalCost = 0;
 						var totalValue = 0;
 						_.each(values, function(value, player) {
-							totalCost += parseFloat(value.split(':')[0]);
-							totalValue += parseFloat(value.split(':')[1]);
+							totalCost += value.initialCash;
+							totalValue += value.finalCash;
 						});
+						if(store) {
+							store.append(_.map(values, function(value, player) {
+								return {
+									run: run,
+									seed: seed,
+									ops: ops.match(/-o (\S+)/)[1],
+									fops: (ops.match(/-f (\S+)/) || [])[1],
+									player: player,
+									players: numPlayers,
+									initialCash: value.initialCash,
+									finalCash: value.finalCash,
+									totalCost: totalCost,
+									totalValue: totalValue
+								};
+							}));
+							execCounter++;
+							if(execCounter===runs.length) {
+								batchDone();
+							}
+							return;
+						}
 						var dbCounter = 0;
 						_.each(values, function(value, player) {
-							var initialCash = parseFloat(value.split(':')[0]);
-							var finalCash = parseFloat(value.split(':')[1]);
+							var initialCash = value.initialCash;
+							var finalCash = value.finalCash;
 							db.collection('exp7s').update(
 								{run: run, seed: seed, player: player},
 								{$set: 
@@ -0,0 +1,83 @@
+/*
+ * Copyright 2015 Paul T. Grogan
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+/*
+ * Imports per-seed records into a results store (see resultStore.js).
+ * Inputs are JSON lines files, either MongoDB dumps of the exp6s or exp7s
+ * collections (`mongoexport -d fss -c exp7s -o exp7s.jsonl`) or results
+ * files written by fss-pool.js. Dumps do not record the operations models,
+ * so they can be set with -o and -f.
+ *
+ *   node fss-import --store results [-o d6] [-f n] exp6s.jsonl exp7s.jsonl
+ */
+
+var requirejs = require('requirejs');
+
+requirejs.config({
+  baseUrl: __dirname + '/../lib',
+  nodeRequire: require
+});
+
+requirejs(['underscore','fs','logger','runner','resultStore'], function(_,fs,logger,Runner,ResultStore) {
+    var argv = require('minimist')(process.argv.slice(2));
+    var runner = new Runner();
+    var store = new ResultStore({
+        directory: argv.store?argv.store:'results',
+        batchSize: 10000
+    });
+    store.open();
+
+    /**
+     * Converts a number in MongoDB extended JSON (e.g. {"$numberLong": "5"}).
+     * @param {object} value - The value.
+     * @returns {Number} The number.
+     */
+    function toNumber(value) {
+        if(_.isObject(value)) {
+            value = value.$numberLong || value.$numberInt || value.$numberDouble;
+        }
+        return parseFloat(value);
+    }
+
+    var numRecords = 0;
+    _.each(argv._, function(filename) {
+        _.each(fs.readFileSync(filename, 'utf8').split('\n'), function(line) {
+            if(line.trim().length === 0) {
+                return;
+            }
+            var doc = JSON.parse(line);
+            if(!_.isString(doc.run)) {
+                logger.error('Skipping record without a design string in ' + filename);
+                return;
+            }
+            store.append([{
+                run: doc.run,
+                seed: toNumber(doc.seed),
+                ops: doc.ops!==undefined?doc.ops:argv.o,
+                fops: doc.fops!==undefined?doc.fops:argv.f,
+                player: toNumber(doc.player),
+                players: doc.players!==undefined?toNumber(doc.players):runner.getNumPlayers(doc.run),
+                initialCash: toNumber(doc.initialCash),
+                finalCash: toNumber(doc.finalCash),
+                totalCost: toNumber(doc.totalCost),
+                totalValue: toNumber(doc.totalValue)
+            }]);
+            numRecords++;
+        });
+    });
+    store.close();
+    console.info('Imported ' + numRecords + ' records into ' + store.directory);
+});
@@ -0,0 +1,95 @@
+/*
+ * Copyright 2015 Paul T. Grogan
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+/*
+ * Executes many games in one process and prints one JSON result per line.
+ *
+ * Jobs are read from a file with one JSON object per line, e.g.
+ *   {"run": "1.SmallSat@LEO1,VIS,pSGL 1.GroundSta@SUR1,pSGL", "seed": 0, "ops": "d6"}
+ *   node fss-jobs --jobs jobs.jsonl > results.jsonl
+ * or built from a design and a range of seeds using the options of fss.js:
+ *   node fss-jobs -d 24 -i 0 -o d6 --start 0 --stop 100 1.SmallSat@LEO1,VIS,pSGL 1.GroundSta@SUR1,pSGL
+ * Use --profile profile.jsonl to append time per phase and LP sizes for
+ * each game (see fss-profile.py).
+ * Use --lp-cache 10000 to reuse up to 10000 LP solutions across games and
+ * --lp-cache-file solutions.jsonl to keep them between invocations.
+ */
+
+var requirejs = require('requirejs');
+
+requirejs.config({
+  baseUrl: __dirname + '/../lib',
+  nodeRequire: require
+});
+
+requirejs(['underscore','logger','fs','profiler','solutionCache','runner'], function(_,logger,fs,profiler,solutionCache,Runner) {
+    var argv = require('minimist')(process.argv.slice(2));
+
+    var runner = new Runner({
+        numTurns: _.isNumber(argv.d)?argv.d:24,
+        initialCash: _.isNumber(argv.i)?argv.i:1200,
+        ops: argv.o?argv.o:'d6',
+        fops: argv.f?argv.f:undefined
+    });
+
+    // optionally record time per phase and LP sizes
+    profiler.enable(_.isString(argv.profile));
+
+    // optionally reuse LP solutions for repeated planning states
+    solutionCache.enable(_.isNumber(argv['lp-cache'])?argv['lp-cache']:0);
+    if(solutionCache.enabled && _.isString(argv['lp-cache-file'])) {
+        solutionCache.load(argv['lp-cache-file']);
+    }
+
+    var jobs = [];
+    if(argv.jobs) {
+        _.each(fs.readFileSync(argv.jobs, 'utf8').split('\n'), function(line) {
+            if(line.trim().length > 0) {
+                jobs.push(JSON.parse(line));
+            }
+        });
+    } else if(argv._.length > 0) {
+        var start = _.isNumber(argv.start)?argv.start:0;
+        var stop = _.isNumber(argv.stop)?argv.stop:10;
+        _.each(_.range(start, stop), function(seed) {
+            jobs.push({
+                designs: argv._,
+                seed: seed,
+                numPlayers: _.isNumber(argv.p)?argv.p:undefined
+            });
+        });
+    }
+
+    var startTime = Date.now();
+    runner.executeAll(jobs, function(result) {
+        if(result.profile) {
+            runner.writeProfile(argv.profile, result);
+            delete result.profile;
+        }
+        console.log(JSON.stringify(result));
+    }, function() {
+        var elapsed = (Date.now() - startTime)/1000;
+        logger.info('Executed ' + jobs.length + ' jobs in ' + elapsed + ' s ('
+                + (jobs.length/elapsed) + ' jobs/s)');
+        if(solutionCache.enabled) {
+            logger.info('LP solution cache: ' + solutionCache.stats.hits + ' hits, '
+                    + solutionCache.stats.misses + ' misses, ' + solutionCache.stats.evictions + ' evictions');
+            if(_.isString(argv['lp-cache-file'])) {
+                solutionCache.save(argv['lp-cache-file']);
+            }
+        }
+    });
+});
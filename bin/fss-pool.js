@@ -0,0 +1,187 @@
+/*
+ * Copyright 2015 Paul T. Grogan
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+/*
+ * Executes every (run, seed) pair on a pool of worker processes and appends
+ * one record per player to a JSON lines results file (see fss-aggregate.py).
+ *
+ * Runs are read from a file with one design string per line, or one JSON
+ * object per line to override options per run, e.g.
+ *   1.SmallSat@LEO1,VIS,pSGL 1.GroundSta@SUR1,pSGL
+ *   {"run": "1.SmallSat@LEO1,VIS,oSGL 2.GroundSta@SUR1,oSGL", "ops": "n", "fops": "d6"}
+ *
+ *   node fss-pool --runs runs.txt --start 0 --stop 100 --out results.jsonl [-w 4] [-d 24 -i 0 -o d6 -f n]
+ *
+ * Runs without operations models use -o and -f, or with -o auto the models
+ * fss-exp7.js chooses for the number of players and links of each design
+ * (see Runner.getExperimentOps), so a sweep of exp7 designs resumes it.
+ *
+ * Idle workers take the next pending job, so a slow run does not hold up
+ * the others. Jobs already in the results file are skipped, so an
+ * interrupted sweep resumes by running the same command again.
+ *
+ * With --store, records are appended in batches to a results store (see
+ * resultStore.js) instead of the results file. Buffered records are
+ * appended when the sweep ends or is interrupted.
+ *
+ * With --event-tape [dir], every run replays the same events for a seed
+ * (see eventTape.js), optionally caching the tapes in a directory. Results
+ * differ from runs without it, so use a separate results file.
+ */
+
+var requirejs = require('requirejs');
+
+requirejs.config({
+  baseUrl: __dirname + '/../lib',
+  nodeRequire: require
+});
+
+requirejs(['underscore','logger','fs','os','child_process','runner','resultStore','eventTape'], function(_,logger,fs,os,child_process,Runner,ResultStore,eventTape) {
+    var argv = require('minimist')(process.argv.slice(2));
+
+    // optionally replay the same events for a seed in every design
+    if(argv['event-tape']) {
+        eventTape.enable(_.isString(argv['event-tape'])?argv['event-tape']:undefined);
+    }
+
+    var runner = new Runner({
+        numTurns: _.isNumber(argv.d)?argv.d:24,
+        initialCash: _.isNumber(argv.i)?argv.i:1200,
+        ops: argv.o?argv.o:'d6',
+        fops: argv.f?argv.f:undefined
+    });
+
+    /**
+     * Gets the key identifying a job (or record) in the results file.
+     * @param {object} job - The job or record.
+     * @returns {String} The key.
+     */
+    function getKey(job) {
+        return [job.run, job.seed, job.ops, job.fops].join('|');
+    }
+
+    if(argv.worker) {
+        // worker process: execute jobs sent by the master until disconnected
+        process.on('message', function(job) {
+            runner.execute(job, function(result) {
+                process.send({key: job.key, records: runner.getRecords(result)});
+            });
+        });
+        process.send({ready: true});
+        return;
+    }
+
+    var outFile = argv.out?argv.out:'results.jsonl';
+    var start = _.isNumber(argv.start)?argv.start:0;
+    var stop = _.isNumber(argv.stop)?argv.stop:10;
+    var numWorkers = _.isNumber(argv.w)?argv.w:os.cpus().length;
+
+    // read runs
+    var runs = [];
+    _.each(fs.readFileSync(argv.runs, 'utf8').split('\n'), function(line) {
+        line = line.trim();
+        if(line.length > 0) {
+            runs.push(line.charAt(0)==='{'?JSON.parse(line):{run: line});
+        }
+    });
+
+    // read completed jobs from an existing results store or file
+    var completed = {};
+    var store;
+    if(argv.store) {
+        store = new ResultStore({directory: argv.store});
+        store.open();
+        store.closeOnExit();
+        _.each(store.read(), function(record) {
+            completed[getKey(record)] = true;
+        });
+    } else if(fs.existsSync(outFile)) {
+        _.each(fs.readFileSync(outFile, 'utf8').split('\n'), function(line) {
+            try {
+                completed[getKey(JSON.parse(line))] = true;
+            } catch(e) {
+                // skip blank or truncated lines
+            }
+        });
+    }
+
+    // build the (run, seed) cross product of pending jobs
+    var jobs = [];
+    var numSkipped = 0;
+    _.each(_.range(start, stop), function(seed) {
+        _.each(runs, function(run) {
+            var job = _.extend(runner.ops==='auto'?runner.getExperimentOps(run.run):{
+                ops: runner.ops,
+                fops: runner.fops
+            }, run, {seed: seed});
+            job.key = getKey(job);
+            if(completed[job.key]) {
+                numSkipped++;
+            } else {
+                jobs.push(job);
+            }
+        });
+    });
+    console.info('Executing ' + jobs.length + ' jobs (' + numSkipped
+            + ' already completed) on ' + numWorkers + ' workers');
+
+    var numJobs = jobs.length;
+    var nextJob = 0;
+    var numCompleted = 0;
+    var startTime = Date.now();
+    _.each(_.range(Math.min(numWorkers, numJobs)), function() {
+        // operations models are set per job
+        var args = ['--worker'];
+        _.each(['d','i','l'], function(option) {
+            if(argv[option] !== undefined && argv[option] !== true) {
+                args.push('-' + option, String(argv[option]));
+            }
+        });
+        if(argv['event-tape']) {
+            args.push(_.isString(argv['event-tape'])?'--event-tape=' + argv['event-tape']:'--event-tape');
+        }
+        var worker = child_process.fork(__filename, args);
+        worker.on('message', function(message) {
+            if(message.records) {
+                if(store) {
+                    store.append(message.records);
+                } else {
+                    // write all records of a job at once so an interrupted sweep
+                    // never leaves a partially-written job behind
+                    fs.appendFileSync(outFile, _.map(message.records, function(record) {
+                        return JSON.stringify(record) + '\n';
+                    }).join(''));
+                }
+                numCompleted++;
+                if(numCompleted % 100 === 0 || numCompleted === numJobs) {
+                    var elapsed = (Date.now() - startTime)/1000;
+                    console.info(numCompleted + '/' + numJobs + ' jobs complete ('
+                            + (numCompleted/elapsed).toFixed(2) + ' jobs/s)');
+                }
+            }
+            if(nextJob < numJobs) {
+                worker.send(jobs[nextJob++]);
+            } else {
+                worker.disconnect();
+            }
+        });
+        worker.on('exit', function(code) {
+            if(code !== 0) {
+                logger.error('Worker exited with code ' + code);
+            }
+        });
+    });
+});
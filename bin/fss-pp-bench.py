@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+ Copyright 2015 Paul T. Grogan
+
+ Licensed under the Apache License, Version 2.0 (the "License");
+ you may not use this file except in compliance with the License.
+ You may obtain a copy of the License at
+
+     http://www.apache.org/licenses/LICENSE-2.0
+
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+
+"""
+ Benchmarks the post-processing helpers in fsspp.py against the original
+ per-row implementations on synthetic data-exp.csv files.
+
+ Usage: python fss-pp-bench.py [-n 100000 1000000] [--legacy-max 100000]
+"""
+
+import argparse
+import csv
+import os
+import tempfile
+import time
+import numpy as np
+import fsspp
+
+def synthesize(filename, n, seed=0):
+	"""
+	Writes a synthetic data-exp.csv file with n rows.
+	"""
+	rs = np.random.RandomState(seed)
+	sizes = ['SmallSat', 'MediumSat', 'LargeSat']
+	with open(filename, 'wb') as csvfile:
+		writer = csv.writer(csvfile, delimiter=',')
+		writer.writerow(['Run', 'Players', 'Player', 'Satellites', 'Stations', 'ISL', 'Cost', 'Count', 'Min',
+				'Max', 'Avg', 'StdDev', 'StdErr', 'Total Cost','Total Value Avg','Total Value StdErr'])
+		rows = 0
+		while rows < n:
+			players = rs.randint(1, 4)
+			sgl = 'oSGL' if players > 1 and rs.rand() < 0.5 else 'pSGL'
+			isl = ['', '|pISL', '|oISL'][rs.randint(0, 3)]
+			satellites = rs.randint(1, 4)
+			run = ' '.join(['%d.%s@MEO%d|%s|%s%s %d.GroundSta@SUR%d|%s'%(
+						p, sizes[rs.randint(0, 3)], rs.randint(1, 7), ['VIS','SAR'][rs.randint(0, 2)], sgl, isl,
+						p, p, sgl) for p in range(1, players+1)])
+			cost = 1000 + 3000*rs.rand()
+			value = cost*(0.5 + 2*rs.rand())
+			for player in range(min(players, n - rows)):
+				writer.writerow([run, players, player, satellites, 1, 'true' if isl else 'false',
+						cost, 100, 0, 2*value, value, 0.2*value, 0.02*value,
+						players*cost, players*value, 0.02*players*value])
+				rows += 1
+
+def load_append(filename):
+	"""
+	Loads data-exp.csv with the original per-row np.append implementation.
+	"""
+	id = np.array([])
+	run = np.array([])
+	cost = np.array([])
+	exp_value = np.array([])
+	min_value = np.array([])
+	max_value = np.array([])
+	std_err = np.array([])
+	oisl = np.array([], dtype=np.bool_)
+	pisl = np.array([], dtype=np.bool_)
+	osgl = np.array([], dtype=np.bool_)
+	players = np.array([])
+	player = np.array([])
+	stations = np.array([])
+	satellites = np.array([])
+	totalCost = np.array([])
+	totalExpValue = np.array([])
+	totalStdErr = np.array([])
+	with open(filename,'rb') as csvfile:
+		reader = csv.reader(csvfile, delimiter=',')
+		next(reader) # skip header
+		counter = 0
+		for row in reader:
+			counter+=1
+			run = np.append(run, row[0])
+			id = np.append(id, counter)
+			players = np.append(players, int(row[1]))
+			player = np.append(player, int(row[2]))
+			satellites = np.append(satellites, int(row[3]))
+			stations = np.append(stations, int(row[4]))
+			pisl = np.append(pisl, 'pISL' in row[0])
+			oisl = np.append(oisl, 'oISL' in row[0])
+			osgl = np.append(osgl, 'oSGL' in row[0])
+			cost = np.append(cost, float(row[6]))
+			min_value = np.append(min_value, float(row[7]))
+			max_value = np.append(max_value, float(row[8]))
+			exp_value = np.append(exp_value, float(row[10]))
+			std_err = np.append(std_err, float(row[12]))
+			totalCost = np.append(totalCost, float(row[13]))
+			totalExpValue = np.append(totalExpValue, float(row[14]))
+			totalStdErr = np.append(totalStdErr, float(row[15]))
+	return {'id': id, 'run': run, 'cost': cost, 'exp_value': exp_value,
+			'std_err': std_err, 'pisl': pisl, 'oisl': oisl, 'osgl': osgl,
+			'players': players, 'player': player, 'totalCost': totalCost,
+			'totalExpValue': totalExpValue, 'totalStdErr': totalStdErr}
+
+def pareto_scan(id, cost, exp_value, std_err):
+	"""
+	Original O(n^2) Pareto scan from fss-exp7-pp.py.
+	"""
+	p_id = np.array([])
+	p_cost = np.array([])
+	p_value = np.array([])
+	p_exp = np.array([])
+	for i in range(0,np.size(cost)):
+		if exp_value[i] > 0 and np.sum(np.logical_and(cost<=cost[i], 
+				exp_value-1.96*std_err>exp_value[i]+1.96*std_err[i])) == 0:
+			p_id = np.append(p_id, id[i])
+			p_cost = np.append(p_cost, cost[i])
+			p_value = np.append(p_value, exp_value[i])
+			if np.sum(np.logical_and(cost<=cost[i], exp_value>exp_value[i])) == 0:
+				p_exp = np.append(p_exp, True)
+			else:
+				p_exp = np.append(p_exp, False)
+	return p_id, p_cost, p_value, p_exp
+
+def timed(function, *args):
+	start = time.time()
+	result = function(*args)
+	return result, time.time() - start
+
+def benchLoad(filename, n, legacyMax):
+	data, t_load = timed(fsspp.load, filename)
+	print('load %8d rows: fsspp.load %8.3fs'%(n, t_load))
+	if n <= legacyMax:
+		legacy, t_legacy = timed(load_append, filename)
+		print('load %8d rows: np.append  %8.3fs (%.1fx)'%(n, t_legacy, t_legacy/max(t_load, 1e-9)))
+		for name in legacy:
+			if n > 0 and not np.array_equal(legacy[name], data[name]):
+				raise ValueError('Mismatched column ' + name)
+	else:
+		print('load %8d rows: np.append  skipped (n > --legacy-max)'%n)
+	return data
+
+def benchPareto(data, n, legacyMax):
+	(front, exp), t_pareto = timed(fsspp.pareto, data.cost, data.exp_value, data.std_err)
+	print('pareto %6d rows: fsspp.pareto %8.3fs (%d on front)'%(n, t_pareto, np.sum(front)))
+	if n <= legacyMax:
+		(p_id, p_cost, p_value, p_exp), t_legacy = timed(pareto_scan,
+				data.id, data.cost, data.exp_value, data.std_err)
+		print('pareto %6d rows: O(n^2) scan  %8.3fs (%.1fx)'%(n, t_legacy, t_legacy/max(t_pareto, 1e-9)))
+		if not (np.array_equal(p_id, data.id[front]) and np.array_equal(p_exp, exp[front])):
+			raise ValueError('Mismatched Pareto front')
+	else:
+		print('pareto %6d rows: O(n^2) scan  skipped (n > --legacy-max)'%n)
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description='Benchmark fss post-processing helpers.')
+	parser.add_argument('-n', type=int, nargs='+', default=[100000, 1000000],
+			help='number of synthetic rows')
+	parser.add_argument('--legacy-max', type=int, default=100000,
+			help='largest file to process with the original implementation')
+	parser.add_argument('--seed', type=int, default=0)
+	args = parser.parse_args()
+
+	for n in args.n:
+		handle, filename = tempfile.mkstemp(suffix='.csv')
+		os.close(handle)
+		try:
+			synthesize(filename, n, args.seed)
+			data = benchLoad(filename, n, args.legacy_max)
+			benchPareto(data, n, args.legacy_max)
+		finally:
+			os.remove(filename)
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+ Copyright 2015 Paul T. Grogan
+
+ Licensed under the Apache License, Version 2.0 (the "License");
+ you may not use this file except in compliance with the License.
+ You may obtain a copy of the License at
+
+     http://www.apache.org/licenses/LICENSE-2.0
+
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+
+"""
+ Reports hot spots from the profiles written with `--profile` by fss.js and
+ fss-jobs.js (one JSON line per game with time and call counts per phase
+ and LP sizes per operations model and turn).
+
+ Usage: python fss-profile.py profile.jsonl [more.jsonl ...] [--top 10]
+"""
+
+import argparse
+import json
+import numpy as np
+
+# phases nested in other phases (not counted twice in the total)
+NESTED = {'ops.build': 'ops.execute', 'ops.solve': 'ops.execute', 'ops.apply': 'ops.execute',
+		'contract.resolve': 'ops.execute', 'contract.default': 'context.tock, ops.execute',
+		'context.propagate': 'context.tick, ops.build'}
+
+def profiles(filenames):
+	"""
+	Streams game profiles from JSON lines files.
+	"""
+	for filename in filenames:
+		with open(filename, 'rb') as f:
+			for line in f:
+				if line.strip():
+					yield json.loads(line)
+
+def summarize(filenames):
+	"""
+	Returns per-phase totals, per-model LP sizes, and per-game totals.
+	"""
+	phases = {}
+	programs = {}
+	games = []
+	for profile in profiles(filenames):
+		for name, phase in profile['phases'].iteritems():
+			total = phases.setdefault(name, [0, 0.])
+			total[0] += phase['count']
+			total[1] += phase['time']
+		for program in profile['programs']:
+			programs.setdefault(program['model'], []).append((program['columns'], program['rows']))
+		games.append((profile.get('elapsed', 0), profile.get('run'), profile.get('seed'),
+				profile.get('ops'), profile.get('fops'), profile['phases']))
+	return phases, programs, games
+
+def report(phases, programs, games, top=10):
+	elapsed = sum(game[0] for game in games)
+	print '%d games, %.1f s elapsed'%(len(games), elapsed/1e3)
+	print
+	print '%-20s %12s %12s %14s %8s'%('Phase', 'Calls', 'Time (s)', 'Per call (ms)', 'Share')
+	for name, (count, time) in sorted(phases.iteritems(), key=lambda item: -item[1][1]):
+		print '%-20s %12d %12.3f %14.4f %7.1f%%%s'%(name, count, time/1e3, time/max(count, 1),
+				100*time/max(elapsed, 1e-9), ' (in %s)'%NESTED[name] if name in NESTED else '')
+	print
+	if programs:
+		print '%-20s %8s %10s %10s %10s %10s'%('LP model', 'LPs', 'Avg cols', 'Max cols', 'Avg rows', 'Max rows')
+		for model, sizes in sorted(programs.iteritems()):
+			sizes = np.array(sizes)
+			print '%-20s %8d %10.0f %10d %10.0f %10d'%(model, len(sizes), sizes[:,0].mean(),
+					sizes[:,0].max(), sizes[:,1].mean(), sizes[:,1].max())
+		print
+	print 'Slowest games:'
+	for time, run, seed, ops, fops, game in sorted(games, key=lambda game: -game[0])[:top]:
+		hot = sorted([(phase['time'], name) for name, phase in game.iteritems()
+				if name not in NESTED], reverse=True)
+		print '%8.2f s  seed %s  ops %s/%s  %s  [%s]'%(time/1e3, seed, ops, fops, run,
+				', '.join('%s %.0f%%'%(name, 100*t/max(time, 1e-9)) for t, name in hot[:2]))
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description='Report hot spots from fss profiles.')
+	parser.add_argument('inputs', nargs='+', help='profiles written with --profile (.jsonl)')
+	parser.add_argument('--top', type=int, default=10, help='number of slowest games to list')
+	args = parser.parse_args()
+
+	report(*summarize(args.inputs), top=args.top)
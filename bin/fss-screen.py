@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+"""
+ Copyright 2015 Paul T. Grogan
+
+ Licensed under the Apache License, Version 2.0 (the "License");
+ you may not use this file except in compliance with the License.
+ You may obtain a copy of the License at
+
+     http://www.apache.org/licenses/LICENSE-2.0
+
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+
+"""
+ Screens candidate designs before simulation. A surrogate model is fit on
+ the designs already simulated (any results files or stores accepted by
+ fsspp.aggregate) to predict the expected total value, with uncertainty,
+ of the unsimulated designs in a runs file (e.g. from fss-designs.js).
+ Design features are the counts of each platform by orbit (e.g.
+ SmallSat@LEO), ground stations, and subsystem types (sensors, SGL, ISL,
+ storage, defense), the number of players, and the total cost (predicted
+ from the other features for unsimulated designs).
+
+ The unsimulated designs are written as a runs file (for fss-pool.js or
+ fss-adaptive.py) in priority order. Designs are ranked by how far their
+ optimistic value (mean + z*std) exceeds the best expected value of the
+ simulated designs for the same number of players at equal or lower cost,
+ i.e. their chance to extend the front of fsspp.pareto. A fraction of the
+ positions (--explore) instead goes to the designs with the largest
+ uncertainty. Use --limit to keep only the first designs.
+
+   python fss-screen.py --runs runs.txt --results results.jsonl [--out ranked.txt --limit 500 --explore 0.2 -z 1.96 --predictions screen.csv]
+"""
+
+import argparse
+import re
+import sys
+import numpy as np
+import fsspp
+
+def features(run):
+	"""
+	Counts the components of a design string by name: `Type@Orbit` for each
+	system (e.g. `SmallSat@LEO` or `GroundSta@SUR`) and the type of each
+	subsystem (e.g. `VIS`, `pSGL`, `oISL`). Subsystems may be separated by
+	commas or by `|` (as in data-exp.csv).
+	"""
+	counts = {}
+	for design in run.split():
+		specs = re.split(r'[,|]', design)
+		system = re.sub(r'\d+$', '', specs[0].split('.')[-1])
+		counts[system] = counts.get(system, 0) + 1
+		for subsystem in specs[1:]:
+			counts[subsystem] = counts.get(subsystem, 0) + 1
+	return counts
+
+def players(run):
+	"""
+	Returns the number of players of a design string (the largest player
+	number, or 1 if none as Runner.getNumPlayers).
+	"""
+	numbers = [int(player) for player in re.findall(r'(?:^|\s)(\d+)\.', run)]
+	return max(numbers) if numbers else 1
+
+def matrix(runs, names):
+	"""
+	Builds the feature matrix of design strings with one column per name.
+	"""
+	index = dict([(name, j) for j, name in enumerate(names)])
+	X = np.zeros((len(runs), len(names)))
+	for i, run in enumerate(runs):
+		for name, count in features(run).iteritems():
+			if name in index:
+				X[i, index[name]] = count
+	return X
+
+class Surrogate(object):
+	"""
+	Gaussian process regression with a squared exponential kernel on
+	standardized features around a linear (ridge) prior mean. Observations
+	have known noise (the squared standard error of each design's mean).
+	At most `max_train` designs (sampled at random) are used to fit.
+	"""
+	def __init__(self, length_scale=None, ridge=1e-3, max_train=2000, seed=0):
+		self.length_scale = length_scale
+		self.ridge = ridge
+		self.max_train = max_train
+		self.seed = seed
+
+	def standardize(self, X):
+		return (np.asarray(X, dtype=np.float_) - self.shift)/self.scale
+
+	def kernel(self, A, B):
+		d2 = np.sum(A**2, axis=1)[:,np.newaxis] + np.sum(B**2, axis=1)[np.newaxis,:] - 2*A.dot(B.T)
+		return self.variance*np.exp(-0.5*np.maximum(d2, 0)/self.length_scale**2)
+
+	def fit(self, X, y, noise):
+		X = np.asarray(X, dtype=np.float_)
+		y = np.asarray(y, dtype=np.float_)
+		noise = np.asarray(noise, dtype=np.float_)
+		if len(y) > self.max_train:
+			i = np.sort(np.random.RandomState(self.seed).choice(len(y), self.max_train, replace=False))
+			X, y, noise = X[i], y[i], noise[i]
+		self.shift = np.mean(X, axis=0)
+		self.scale = np.std(X, axis=0)
+		self.scale[self.scale == 0] = 1.
+		Z = self.standardize(X)
+
+		# linear prior mean (intercept not penalized)
+		A = np.hstack([np.ones((len(Z), 1)), Z])
+		penalty = self.ridge*len(Z)*np.eye(A.shape[1])
+		penalty[0,0] = 0
+		self.beta = np.linalg.solve(A.T.dot(A) + penalty, A.T.dot(y))
+		residual = y - A.dot(self.beta)
+		self.variance = max(np.var(residual), 1e-9)
+
+		# length scale: median distance between (up to 500) training designs
+		if self.length_scale is None:
+			S = Z[:500]
+			d2 = np.sum(S**2, axis=1)[:,np.newaxis] + np.sum(S**2, axis=1)[np.newaxis,:] - 2*S.dot(S.T)
+			d = np.sqrt(np.maximum(d2[np.triu_indices(len(S), 1)], 0))
+			self.length_scale = np.median(d[d > 0]) if np.any(d > 0) else 1.
+
+		K = self.kernel(Z, Z) + np.diag(noise + 1e-6*self.variance)
+		self.L = np.linalg.cholesky(K)
+		self.alpha = np.linalg.solve(self.L.T, np.linalg.solve(self.L, residual))
+		self.Z = Z
+		return self
+
+	def predict(self, X, chunk=2000):
+		"""
+		Returns the predicted mean and standard deviation for each row of X.
+		"""
+		Z = self.standardize(X)
+		mean = np.empty(len(Z))
+		std = np.empty(len(Z))
+		for start in range(0, len(Z), chunk):
+			S = Z[start:start+chunk]
+			Ks = self.kernel(self.Z, S)
+			V = np.linalg.solve(self.L, Ks)
+			mean[start:start+chunk] = self.beta[0] + S.dot(self.beta[1:]) + Ks.T.dot(self.alpha)
+			std[start:start+chunk] = np.sqrt(np.maximum(self.variance - np.sum(V**2, axis=0), 0))
+		return mean, std
+
+def incumbents(players, cost, exp_value, cand_players, cand_cost):
+	"""
+	Returns for each candidate the best expected value (at least 0) of the
+	simulated designs with the same number of players and equal or lower
+	cost.
+	"""
+	best = np.zeros(len(cand_cost))
+	for p in np.unique(cand_players):
+		i = np.flatnonzero(players == p)
+		j = np.flatnonzero(cand_players == p)
+		if len(i) == 0:
+			continue
+		order = i[np.argsort(cost[i], kind='mergesort')]
+		frontier = np.maximum.accumulate(exp_value[order])
+		k = np.searchsorted(cost[order], cand_cost[j], side='right') - 1
+		best[j] = np.where(k >= 0, np.maximum(frontier[np.maximum(k, 0)], 0), 0)
+	return best
+
+def prioritize(score, std, explore):
+	"""
+	Orders candidates by decreasing score, giving a fraction `explore` of
+	the positions (evenly spread) to the largest std instead.
+	"""
+	by_score = list(np.argsort(-score, kind='mergesort'))
+	by_std = list(np.argsort(-std, kind='mergesort'))
+	order = []
+	chosen = np.zeros(len(score), dtype=np.bool_)
+	for position in range(len(score)):
+		queue = by_std if np.floor((position+1)*explore) > np.floor(position*explore) else by_score
+		while chosen[queue[0]]:
+			queue.pop(0)
+		j = queue.pop(0)
+		chosen[j] = True
+		order.append(j)
+	return order
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description='Prioritize designs with a surrogate model.')
+	parser.add_argument('--runs', required=True, help='candidate runs file (see fss-pool.js)')
+	parser.add_argument('--results', required=True, nargs='+', help='results files or stores of simulated designs')
+	parser.add_argument('--out', help='prioritized runs file (default: stdout)')
+	parser.add_argument('--limit', type=int, help='maximum number of designs to write')
+	parser.add_argument('--explore', type=float, default=0.2, help='fraction of positions ranked by uncertainty')
+	parser.add_argument('-z', type=float, default=1.96, help='optimism of the score in std')
+	parser.add_argument('--max-train', type=int, default=2000, help='maximum designs used to fit')
+	parser.add_argument('--predictions', help='CSV file of predictions for the candidates')
+	args = parser.parse_args()
+
+	# statistics of player 0 (total cost and value are the same for all players)
+	designs = fsspp.aggregate(args.results, {})
+	stats = [(k[0], k[1], k[7], value) for k, (cash, value) in designs.iteritems() if k[2] == 0]
+	if len(stats) == 0:
+		sys.exit('no simulated designs in ' + ', '.join(args.results))
+	simulated = set([s[0] for s in stats])
+	candidates = [(run, line) for run, line in fsspp.read_runs(args.runs) if run not in simulated]
+
+	names = sorted(set([name for s in stats for name in features(s[0])]
+			+ [name for run, line in candidates for name in features(run)]))
+	X = np.hstack([matrix([s[0] for s in stats], names),
+			np.array([[s[1]] for s in stats], dtype=np.float_)])
+	sim_players = np.array([s[1] for s in stats])
+	sim_cost = np.array([s[2] for s in stats], dtype=np.float_)
+	exp_value = np.array([s[3].mean for s in stats])
+	count = np.array([s[3].count for s in stats], dtype=np.float_)
+	variance = np.array([s[3].variance() for s in stats])
+	# designs with one seed use the pooled variance of the others
+	pooled = np.mean(variance[count > 1]) if np.any(count > 1) else np.var(exp_value)
+	noise = np.where(count > 1, variance, pooled)/count
+
+	C = np.hstack([matrix([run for run, line in candidates], names),
+			np.array([[players(run)] for run, line in candidates], dtype=np.float_).reshape(-1, 1)])
+	# costs are linear in component counts, so they are recovered by least squares
+	A = np.hstack([np.ones((len(X), 1)), X])
+	coef = np.linalg.lstsq(A, sim_cost, rcond=None)[0]
+	cand_cost = np.hstack([np.ones((len(C), 1)), C]).dot(coef) if len(C) > 0 else np.zeros(0)
+
+	surrogate = Surrogate(max_train=args.max_train).fit(
+			np.hstack([X, sim_cost[:,np.newaxis]]), exp_value, noise)
+	if len(C) > 0:
+		mean, std = surrogate.predict(np.hstack([C, cand_cost[:,np.newaxis]]))
+	else:
+		mean, std = np.zeros(0), np.zeros(0)
+	cand_players = C[:,-1].astype(np.int_) if len(C) > 0 else np.zeros(0, dtype=np.int_)
+	score = mean + args.z*std - incumbents(sim_players, sim_cost, exp_value, cand_players, cand_cost)
+	order = prioritize(score, std, args.explore)[:args.limit]
+
+	sys.stderr.write('%d simulated designs, %d candidates, %d written (%d with positive score)\n' % (
+			len(stats), len(candidates), len(order), np.sum(score[order] > 0) if order else 0))
+	out = open(args.out, 'wb') if args.out else sys.stdout
+	try:
+		for j in order:
+			out.write(candidates[j][1] + '\n')
+	finally:
+		if args.out:
+			out.close()
+	if args.predictions:
+		with open(args.predictions, 'wb') as f:
+			f.write('Run,Players,Cost,Mean,Std,Score,Rank\n')
+			rank = dict([(j, r+1) for r, j in enumerate(order)])
+			for j, (run, line) in enumerate(candidates):
+				f.write(','.join([run.replace(',', '|'), '%d'%cand_players[j],
+						fsspp.number(round(cand_cost[j], 6)), fsspp.number(mean[j]),
+						fsspp.number(std[j]), fsspp.number(score[j]),
+						str(rank.get(j, ''))]) + '\n')
@@ -21,121 +21,69 @@ requirejs.config({
   nodeRequire: require
 });
 
-requirejs(['underscore','logger','mas','fss-ofs','game'], function(_,logger,mas,fss,Game) {
+requirejs(['underscore','fs','profiler','solutionCache','demandValues','eventTape','runner'], function(_,fs,profiler,solutionCache,demandValues,eventTape,Runner) {
     var argv = require('minimist')(process.argv.slice(2));
     
-    // define the game and build the context
-    var game = new Game({
+    // optionally record time per phase and LP sizes
+    profiler.enable(_.isString(argv.profile));
+    
+    // optionally reuse LP solutions for repeated planning states
+    solutionCache.enable(_.isNumber(argv['lp-cache'])?argv['lp-cache']:0);
+    if(solutionCache.enabled && _.isString(argv['lp-cache-file'])) {
+        solutionCache.load(argv['lp-cache-file']);
+        solutionCache.saveOnExit(argv['lp-cache-file']);
+    }
+    
+    // optionally save and load expected demand value tables in a directory
+    if(_.isString(argv['demand-cache'])) {
+        demandValues.enableCache(argv['demand-cache']);
+    }
+    
+    // optionally replay the same events for a seed in every design
+    if(argv['event-tape']) {
+        eventTape.enable(_.isString(argv['event-tape'])?argv['event-tape']:undefined);
+    }
+    
+    // execute the game and print the initial and final cash of each player
+    var runner = new Runner({
+        // verify the data index against full scans (debug)
+        checkIndex: argv['check-index']===true
+    });
+    var job = {
+        designs: argv._,
+        seed: (argv.s&&_.isNumber(argv.s))?argv.s:0,
+        ops: argv.o?argv.o:'d6',
+        fops: argv.f?argv.f:undefined,
         numTurns: _.isNumber(argv.d)?argv.d:24,
         numPlayers: _.isNumber(argv.p)?argv.p:1,
         initialCash: _.isNumber(argv.i)?argv.i:1200
-    });
-    var context = game.buildContext(
-            (argv.s&&_.isNumber(argv.s))?argv.s:0,
-            argv.o?argv.o:'d6',
-			argv.f?argv.f:undefined);
-    
-    // define the simulator
-    var sim = new mas.sim.Simulator({
-        entities: [context],
-        initTime: 0,
-        timeStep: 1,
-        maxTime: game.numTurns
-    });
-    
-    // define callback to initialize game
-    sim.on("init", function() {
-		var designSets = [];
-		_.each(context.federations[0].federates, function(federate, index) {
-			designSets[index] = [];
-		});
-		
-        _.each(argv._, function(design, designId) {
-            var specs = design.split(",");
-            if(specs.length > 0 && specs[0].split("@").length === 2) {
-                var systemType;
-				var fedInd = 0;
-                if(specs[0].split("@")[0].split(".").length === 2) {
-                    // determine player ownership
-                    fedInd = parseInt(specs[0].split("@")[0].split(".")[0],10)-1;
-                    systemType = specs[0].split("@")[0].split(".")[1];
-                } else {
-                    // default to player 1 ownership
-                    systemType = specs[0].split("@")[0];
-                }
-                var location = _.find(context.locations, {id: specs[0].split("@")[1]});
-                
-                var system;
-                if(def = _.findWhere(game.stationTypes, {type: systemType})) {
-                    system = new fss.GroundStation(def);
-					
-                } else if(def = _.findWhere(game.spacecraftTypes, {type: systemType})) {
-                    system = new fss.Spacecraft(def);
-                }
-				system.id = '(' + (designId+1) + ')' + system.type;
-                
-                if(system && location) {
-                    var subsystems = [];
-                    _.each(specs, function(subsystemType, index) {
-                        if(index > 0) {
-                            var subsystem;
-                            if(def = _.findWhere(game.sglTypes, {type: subsystemType})) {
-                                subsystem = new fss.SpaceGroundLink(def);
-                            } else if(def = _.findWhere(game.islTypes, {type: subsystemType})) {
-                                subsystem = new fss.InterSatelliteLink(def);
-                            } else if(def = _.findWhere(game.sensorTypes, {type: subsystemType})) {
-                                subsystem = new fss.Sensor(def);
-                            } else if(def = _.findWhere(game.storageTypes, {type: subsystemType})) {
-                                subsystem = new fss.Storage(def);
-                            } else if(def = _.findWhere(game.defenseTypes, {type: subsystemType})) {
-                                subsystem = new fss.Defense(def);
-                            }
-                            if(subsystem) {
-                                system.subsystems.push(subsystem);
-                            }
-                        }
-                    });
-                }
-				designSets[fedInd].push({system: system, location: location});
+    };
+    function report(result) {
+        if(argv.ndjson) {
+            // one JSON object per game on stdout (--ndjson) or appended to a file
+            var line = JSON.stringify(_.omit(result, 'profile'));
+            if(_.isString(argv.ndjson)) {
+                fs.appendFileSync(argv.ndjson, line + '\n');
+            } else {
+                console.log(line);
             }
+        } else {
+            console.log(_.map(result.federates, function(federate) { 
+                    return federate.initialCash+":"+federate.finalCash;
+            }).join());
+        }
+        if(result.profile) {
+            runner.writeProfile(argv.profile, result);
+        }
+    }
+    if(_.isNumber(argv.fork)) {
+        // run to the fork turn once and continue each branch (ops[:fops]) from a snapshot
+        var branches = _.map(argv.branch===undefined?[]:[].concat(argv.branch), function(branch) {
+            var models = String(branch).split(':');
+            return models.length > 1 ? {ops: models[0], fops: models[1]} : {ops: models[0]};
         });
-		_.each(designSets, function(designSet, index) {
-			var federate = context.federations[0].federates[index];
-			if(federate.initialCash===0) {
-				// special case if 0 initial cash: grant enough for initial design
-				federate.initialCash = _.reduce(designSet, function(memo, design){
-					return memo + design.system.getDesignCost() 
-							+ design.system.getCommissionCost(design.location);
-				}, 0);
-				federate.cash = federate.initialCash;
-			}
-			
-			_.each(designSet, function(design) {
-				federate.design(design.system);
-				federate.commission(design.system, design.location, context);
-			});
-		});
-    });
-    
-    // define callback to conclude game
-    sim.on("complete", function() {
-        _.each(context.federations, function(federation) {
-            _.each(federation.federates, function(federate) {
-                federate.liquidate(context);
-                while(federate.contracts.length > 0) {
-                    federate.defaultContract(federate.contracts[0], context);
-                }
-                logger.info(federate.id + ' final cash: ' + federate.cash);
-                logger.info(federate.id + ' ROI: ' + (federate.cash/federate.initialCash));
-            }, this);
-            console.log(_.map(federation.federates, function(federate) { 
-					// TODO replace with initial/final cash
-					// return federate.cash;
-					return federate.initialCash+":"+federate.cash;
-			}).join());
-        }, this);
-    });
-    
-    // execute the simulation
-    sim.execute();
-});
\ No newline at end of file
+        runner.executeBranches(job, argv.fork, branches.length > 0?branches:[{}], report);
+    } else {
+        runner.execute(job, report);
+    }
+});
@@ -0,0 +1,431 @@
+# -*- coding: utf-8 -*-
+"""
+ Copyright 2015 Paul T. Grogan
+
+ Licensed under the Apache License, Version 2.0 (the "License");
+ you may not use this file except in compliance with the License.
+ You may obtain a copy of the License at
+
+     http://www.apache.org/licenses/LICENSE-2.0
+
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+
+"""
+ Shared helpers for the fss-exp*-pp.py post-processing scripts and the
+ scripts that write data-exp.csv (fss-aggregate.py and fss-adaptive.py).
+"""
+
+import csv
+import json
+import multiprocessing
+import os
+import re
+import numpy as np
+
+# columns of data-exp.csv in file order: (field name, type)
+COLUMNS = [
+	('run', np.str_),
+	('players', np.int_),
+	('player', np.int_),
+	('satellites', np.int_),
+	('stations', np.int_),
+	('isl', np.bool_),
+	('cost', np.float_),
+	('count', np.int_),
+	('min_value', np.float_),
+	('max_value', np.float_),
+	('exp_value', np.float_),
+	('std_dev', np.float_),
+	('std_err', np.float_),
+	('totalCost', np.float_),
+	('totalExpValue', np.float_),
+	('totalStdErr', np.float_)
+]
+
+# header row of data-exp.csv
+HEADER = ['Run', 'Players', 'Player', 'Satellites', 'Stations', 'ISL', 'Cost', 'Count', 'Min',
+		'Max', 'Avg', 'StdDev', 'StdErr', 'Total Cost','Total Value Avg','Total Value StdErr']
+
+def load(filename='data-exp.csv'):
+	"""
+	Loads aggregated results (see fss-exp7-pp.js) into a record array.
+
+	Rows are read in a single pass and converted column-by-column, so load
+	time is linear in the number of rows. In addition to the file columns,
+	the record array has a 1-based row `id` and `pisl`, `oisl` and `osgl`
+	flags derived from the design string.
+	"""
+	with open(filename, 'rb') as csvfile:
+		csvfile.readline() # skip header
+		lines = [line.split(',', 1) for line in csvfile.read().splitlines() if line]
+
+	# design strings never contain commas (replaced by '|') so the
+	# remaining fields can be parsed as one flat numeric table
+	run = np.array([line[0] for line in lines], dtype=np.str_)
+	text = ','.join([line[1] for line in lines])
+	table = np.fromstring(text.replace('true', '1').replace('false', '0'),
+			sep=',').reshape(len(lines), len(COLUMNS)-1)
+
+	arrays = [np.arange(1, len(lines)+1), run]
+	names = ['id', 'run']
+	for i, (name, dtype) in enumerate(COLUMNS[1:]):
+		arrays.append(table[:,i].astype(dtype))
+		names.append(name)
+	for flag in ['pISL', 'oISL', 'oSGL']:
+		arrays.append(np.char.find(run, flag) >= 0)
+		names.append(flag.lower())
+
+	return np.rec.fromarrays(arrays, names=names)
+
+def dominated(cost, lower, upper):
+	"""
+	Returns a mask of designs i for which some design j has cost[j] <= cost[i]
+	and lower[j] > upper[i].
+
+	Designs are sorted by cost and swept once keeping the running maximum of
+	the lower bound, so run time is O(n log n) rather than O(n^2).
+	"""
+	cost = np.asarray(cost)
+	if np.size(cost) == 0:
+		return np.zeros(0, dtype=np.bool_)
+	order = np.argsort(cost, kind='mergesort')
+	best = np.maximum.accumulate(np.asarray(lower)[order])
+	# last sorted position with cost <= cost[i] (includes ties)
+	last = np.searchsorted(cost[order], cost, side='right') - 1
+	return best[last] > upper
+
+def pareto(cost, exp_value, std_err, z=1.96):
+	"""
+	Identifies Pareto-optimal designs (minimum cost, maximum value).
+
+	Returns two masks over the input: `front` keeps designs with positive
+	expected value that are not dominated with confidence, i.e. no design
+	with lower or equal cost has a lower confidence bound (exp_value -
+	z*std_err) above its upper confidence bound; `exp` marks the designs in
+	`front` that are also not dominated in expected value alone.
+	"""
+	exp_value = np.asarray(exp_value)
+	std_err = np.asarray(std_err)
+	front = np.logical_and(exp_value > 0, np.logical_not(dominated(
+			cost, exp_value - z*std_err, exp_value + z*std_err)))
+	exp = np.logical_and(front, np.logical_not(dominated(
+			cost, exp_value, exp_value)))
+	return front, exp
+
+def select(data, spec):
+	"""
+	Returns the mask of rows of data (see load) matching the filters of a
+	figure spec, e.g. {'label': '2-4', 'players': 2, 'player': 0,
+	'satellites': 4}. Keys other than players, player and satellites are
+	ignored.
+	"""
+	mask = np.ones(len(data), dtype=np.bool_)
+	for name in ['players', 'player', 'satellites']:
+		if name in spec:
+			mask = np.logical_and(mask, data[name] == spec[name])
+	return mask
+
+# figures of the current render call, inherited by forked workers
+_figures = []
+
+def _render(i):
+	draw, args = _figures[i]
+	draw(*args)
+
+def render(figures, processes=None):
+	"""
+	Renders figures, a list of (draw, args) pairs where draw(*args) draws
+	and saves one figure with pyplot, in a pool of worker processes.
+
+	Scripts should select the non-interactive Agg backend before importing
+	pyplot and compute shared data (masks, Pareto sets) before calling
+	render. Workers are forked after the figures are set and only receive
+	an index, so arrays in args are shared copy-on-write rather than
+	pickled. Figures are rendered in order in this process if fork is not
+	available or processes is 1.
+	"""
+	global _figures
+	_figures = figures
+	try:
+		if processes == 1 or len(figures) < 2 or not hasattr(os, 'fork'):
+			for i in range(len(figures)):
+				_render(i)
+		else:
+			pool = multiprocessing.Pool(processes)
+			try:
+				pool.map(_render, range(len(figures)), chunksize=1)
+			finally:
+				pool.close()
+				pool.join()
+	finally:
+		_figures = []
+
+def category(*flags):
+	"""
+	Encodes boolean flags (arrays or scalars) into an integer category code
+	where flag k contributes bit k, e.g. category(pisl, oisl, osgl).
+	"""
+	code = 0
+	for k, flag in enumerate(flags):
+		code = code + (np.asarray(flag, dtype=np.int_) << k)
+	return code
+
+def groups(code, size):
+	"""
+	Computes the index set of every category in one pass.
+
+	Returns a list of `size` index arrays where element c holds the indices
+	(in ascending order) of all designs with category code c.
+	"""
+	code = np.asarray(code, dtype=np.int_)
+	order = np.argsort(code, kind='mergesort')
+	counts = np.bincount(code, minlength=size)
+	return np.split(order, np.cumsum(counts)[:-1])
+
+class Accumulator(object):
+	"""
+	Mergeable running statistics (count, mean, min, max and sum of squared
+	deviations) using Welford's update for single samples and Chan's
+	pairwise merge for partial results, matching the reduce step of
+	fss-exp7-pp.js without holding the samples in memory.
+	"""
+	def __init__(self, count=0, mean=0., diff=0., min=float('inf'), max=float('-inf')):
+		self.count = count
+		self.mean = mean
+		self.diff = diff # sum((val-mean)^2)
+		self.min = min
+		self.max = max
+
+	def add(self, value):
+		self.count += 1
+		delta = value - self.mean
+		self.mean += delta/self.count
+		self.diff += delta*(value - self.mean)
+		self.min = value if value < self.min else self.min
+		self.max = value if value > self.max else self.max
+
+	def merge(self, other):
+		if other.count == 0:
+			return
+		count = self.count + other.count
+		delta = other.mean - self.mean
+		self.diff += other.diff + delta*delta*self.count*other.count/count
+		self.mean += delta*other.count/count
+		self.count = count
+		self.min = min(self.min, other.min)
+		self.max = max(self.max, other.max)
+
+	def variance(self):
+		return self.diff/self.count if self.count > 0 else 0.
+
+	def stddev(self):
+		return np.sqrt(self.variance())
+
+	def stderr(self):
+		return self.stddev()/np.sqrt(self.count) if self.count > 0 else 0.
+
+	def state(self):
+		return [self.count, self.mean, self.diff, self.min, self.max]
+
+def game_records(game):
+	"""
+	Converts a game object written by fss.js --ndjson into one record per
+	player (as Runner.getRecords). The per-turn cash (cashHistory), contract
+	counts and systems of each player are kept in the record.
+	"""
+	run = game['run']
+	total_cost = sum([f['initialCash'] for f in game['federates']])
+	total_value = sum([f['finalCash'] for f in game['federates']])
+	for player, federate in enumerate(game['federates']):
+		yield {
+			'run': run, 'seed': game['seed'], 'ops': game['ops'],
+			'fops': game.get('fops'), 'player': player, 'players': game['numPlayers'],
+			'initialCash': federate['initialCash'], 'finalCash': federate['finalCash'],
+			'stations': len(re.findall(r'%d\.GroundSta' % (player+1), run)),
+			'satellites': len(re.findall(r'%d\.(?:Small|Medium|Large)Sat' % (player+1), run)),
+			'totalStations': len(re.findall(r'GroundSta', run)),
+			'totalSatellites': len(re.findall(r'(?:Small|Medium|Large)Sat', run)),
+			'isl': 'ISL' in run, 'totalCost': total_cost, 'totalValue': total_value,
+			'cashHistory': federate.get('cash', []), 'resolved': federate.get('resolved'),
+			'defaulted': federate.get('defaulted'), 'systems': federate.get('systems', [])
+		}
+
+def records(filename):
+	"""
+	Streams per-seed records from a JSON lines or CSV file. JSON lines may
+	be per-player records or game objects written by fss.js --ndjson.
+	"""
+	with open(filename, 'rb') as f:
+		if filename.endswith('.csv'):
+			for row in csv.DictReader(f):
+				row['isl'] = row['isl'].lower() == 'true'
+				yield row
+		else:
+			for line in f:
+				for record in line_records(line):
+					yield record
+
+def line_records(line):
+	"""
+	Returns the per-player records of a JSON line (none if blank).
+	"""
+	if not line.strip():
+		return []
+	record = json.loads(line)
+	return game_records(record) if 'federates' in record else [record]
+
+def read_runs(filename):
+	"""
+	Reads runs (one design string or JSON object per line, as fss-pool.js)
+	into a list of (design string, line) pairs.
+	"""
+	runs = []
+	with open(filename, 'rb') as f:
+		for line in f:
+			line = line.strip()
+			if line:
+				runs.append((json.loads(line)['run'] if line.startswith('{') else line, line))
+	return runs
+
+def key(record):
+	"""
+	Returns the design key of a record (the emit key in fss-exp7-pp.js).
+	"""
+	return (record['run'], int(record['players']), int(record['player']),
+			int(record['totalStations']), int(record['totalSatellites']),
+			bool(record['isl']), float(record['initialCash']), float(record['totalCost']))
+
+def load_store(directory):
+	"""
+	Loads a results store written by resultStore.js without copying data.
+
+	Returns the design dictionary (a list of dicts indexed by design id) and
+	a dict of read-only memory-mapped column arrays (design, seed,
+	initialCash, finalCash, totalCost and totalValue), all of the length
+	of the shortest column file.
+	"""
+	with open(os.path.join(directory, 'designs.jsonl'), 'rb') as f:
+		designs = [json.loads(line) for line in f if line.strip()]
+	files = {}
+	for filename in os.listdir(directory):
+		name, ext = os.path.splitext(filename)
+		if re.match(r'^\.[fiu]\d$', ext):
+			files[name] = (os.path.join(directory, filename), np.dtype('<' + ext[1:]))
+	length = min([os.path.getsize(f)//dtype.itemsize for f, dtype in files.values()] or [0])
+	columns = {}
+	for name, (filename, dtype) in files.iteritems():
+		if length > 0:
+			columns[name] = np.memmap(filename, dtype=dtype, mode='r', shape=(length,))
+		else:
+			columns[name] = np.zeros(0, dtype=dtype)
+	return designs, columns
+
+def aggregate_store(directory, designs, maxSatellites=None):
+	"""
+	Adds all records in a results store to the (cash, value) accumulators
+	in designs.
+
+	Statistics are computed per stored design with one pass of bincount
+	per column and merged into the accumulators, so no per-record Python
+	code runs.
+	"""
+	dictionary, columns = load_store(directory)
+	if len(dictionary) == 0 or len(columns.get('design', [])) == 0:
+		return designs
+	ids = np.asarray(columns['design'], dtype=np.int_)
+	count = np.bincount(ids, minlength=len(dictionary))
+	stats = []
+	for name in ['finalCash', 'totalValue']:
+		values = np.asarray(columns[name], dtype=np.float_)
+		with np.errstate(divide='ignore', invalid='ignore'):
+			mean = np.bincount(ids, values, len(dictionary))/count
+		diff = np.bincount(ids, (values - mean[ids])**2, len(dictionary))
+		order = np.lexsort((values, ids))
+		first = np.searchsorted(ids[order], np.arange(len(dictionary)), side='left')
+		last = np.searchsorted(ids[order], np.arange(len(dictionary)), side='right') - 1
+		stats.append((mean, diff, values[order], first, last))
+	# design key attributes from the first record of each design
+	unique, row = np.unique(ids, return_index=True)
+	for d, r in zip(unique, row):
+		record = dict(dictionary[d])
+		record['initialCash'] = columns['initialCash'][r]
+		record['totalCost'] = columns['totalCost'][r]
+		k = key(record)
+		if maxSatellites is not None and k[4] > maxSatellites:
+			continue
+		if k not in designs:
+			designs[k] = (Accumulator(), Accumulator())
+		for acc, (mean, diff, ordered, first, last) in zip(designs[k], stats):
+			acc.merge(Accumulator(int(count[d]), mean[d], diff[d],
+					ordered[first[d]], ordered[last[d]]))
+	return designs
+
+def aggregate(filenames, designs, maxSatellites=None):
+	"""
+	Adds all records in filenames (records files or result store
+	directories) to the (cash, value) accumulators in designs.
+	"""
+	for filename in filenames:
+		if os.path.isdir(filename):
+			aggregate_store(filename, designs, maxSatellites)
+			continue
+		for record in records(filename):
+			add(designs, record, maxSatellites)
+	return designs
+
+def add(designs, record, maxSatellites=None):
+	"""
+	Adds one per-player record to the (cash, value) accumulators in designs.
+	"""
+	k = key(record)
+	if maxSatellites is not None and k[4] > maxSatellites:
+		return
+	if k not in designs:
+		designs[k] = (Accumulator(), Accumulator())
+	designs[k][0].add(float(record['finalCash']))
+	designs[k][1].add(float(record['totalValue']))
+
+def aggregate_from(filename, designs, offset=0):
+	"""
+	Adds the records of a JSON lines file after a byte offset to the (cash,
+	value) accumulators in designs and returns the offset after the last
+	complete line, so a growing results file is read once in total.
+	"""
+	with open(filename, 'rb') as f:
+		f.seek(offset)
+		while True:
+			line = f.readline()
+			# a partially written line is read again next time
+			if not line.endswith('\n'):
+				break
+			offset += len(line)
+			for record in line_records(line):
+				add(designs, record)
+	return offset
+
+def number(value):
+	"""
+	Formats a number the way JavaScript prints it (e.g. 1200 not 1200.0).
+	"""
+	return '%d'%value if float(value).is_integer() else repr(float(value))
+
+def write(filename, designs):
+	"""
+	Writes designs to filename in the data-exp.csv format of fss-exp7-pp.js.
+	"""
+	# sort by players, player, total cost and satellites as in fss-exp7-pp.js
+	items = sorted(designs.iteritems(), key=lambda item: (item[0][1], item[0][2], item[0][7], item[0][4]))
+	with open(filename, 'wb') as f:
+		f.write(','.join(HEADER) + '\n')
+		for (run, players, player, stations, satellites, isl, init, totalCost), (cash, value) in items:
+			f.write(','.join([run.replace(',', '|'), '%d'%players, '%d'%player,
+					'%d'%satellites, '%d'%stations, 'true' if isl else 'false',
+					number(init), '%d'%cash.count, number(cash.min),
+					number(cash.max), number(cash.mean), number(cash.stddev()),
+					number(cash.stderr()), number(totalCost), number(value.mean),
+					number(value.stderr())]) + '\n')
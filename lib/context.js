@@ -27,6 +27,9 @@ define('context', function(require) {
     var logger = require('logger');
     var mas = require('mas');
     var Random = require('random-js');
+    var profiler = require('profiler');
+    var demandValues = require('demandValues');
+    var eventTape = require('eventTape');
     
     /** 
      * @constructor
@@ -35,11 +38,13 @@ define('context', function(require) {
     function Context() {
         this.locations = [];
         this.events = [];
+        this.eventTypes = undefined; // event types of events (see `Game`)
         this.currentEvents = [];
         this.futureEvents = [];
         this.pastEvents = [];
         this.federations = [];
         this.seed = 0;
+        this.checkDataIndex = false; // verify data index against full scans
         
         // initialize superclass (assigns above attributes with arguments)
         mas.sim.Entity.apply(this, arguments);
@@ -51,6 +56,25 @@ define('context', function(require) {
                 this.sectors.push(location.sector);
             }
         }, this);
+        
+        // index locations by id and tabulate propagation over one period
+        this.locationIndex = {};
+        _.each(this.locations, function(location) {
+            this.locationIndex[location.id] = location;
+        }, this);
+        this.propagationTable = {};
+        _.each(this.locations, function(location) {
+            var period = Math.max(1, _.filter(this.locations, function(other) {
+                return other.altitude !== null && other.altitude===location.altitude;
+            }).length);
+            this.propagationTable[location.id] = _.map(_.range(period), function(duration) {
+                return this.propagateLocation(location, duration);
+            }, this);
+        }, this);
+        this.systemIndex = {}; // systemIndex[location.id]: systems at location
+        this.systemLocations = {}; // systemLocations[system.id]: indexed location id
+        this.dataIndex = {};
+        this.dataIndexStats = {hits: 0, misses: 0};
         this.id = 'context';
         this.time = 0;
         this.maxTime = 0;
@@ -64,19 +88,8 @@ define('context', function(require) {
      * @returns {object} The location, or `undefined` if not found.
      */
     Context.prototype.getDataLocation = function(contract) {
-        var returnValue;
-        _.each(this.federations, function(federation) {
-            _.each(federation.federates, function(federate) {
-                _.each(federate.systems, function(system) {
-                    _.each(system.subsystems, function(subsystem) {
-                        if(_.findWhere(subsystem.contents, {contract: contract.id})) {
-                            returnValue = this.getSystemLocation(system);
-                        }
-                    }, this)
-                }, this)
-            }, this)
-        }, this);
-        return returnValue;
+        var holder = this.findData(contract);
+        return holder?this.getSystemLocation(holder.system):undefined;
     }
     
     /**
@@ -85,14 +98,79 @@ define('context', function(require) {
      * @returns {object} The system, or `undefined` if not found.
      */
     Context.prototype.getSystemDataContainer = function(contract) {
+        var holder = this.findData(contract);
+        return holder?holder.system:undefined;
+    }
+    
+    /**
+     * Indexes the system holding data for a contract. Moves between
+     * subsystems of the same system (store and transfer) need no update.
+     * @param {object} data - The data.
+     * @param {object} system - The system holding the data.
+     */
+    Context.prototype.indexData = function(data, system) {
+        this.dataIndex[data.contract] = system;
+    }
+    
+    /**
+     * Removes data for a contract from the index.
+     * @param {object} contract - The contract.
+     */
+    Context.prototype.unindexData = function(contract) {
+        delete this.dataIndex[contract.id];
+    }
+    
+    /**
+     * Finds the system and subsystem holding data for a contract using the
+     * data index. Falls back to a full scan if the indexed system no longer
+     * holds the data (e.g. after a decommission or disturbance).
+     * @param {object} contract - The contract.
+     * @returns {object} The system and subsystem, or `undefined` if not found.
+     */
+    Context.prototype.findData = function(contract) {
+        var holder;
+        var system = this.dataIndex[contract.id];
+        if(system && _.has(this.systemIndex, system.location)
+                && _.contains(this.systemIndex[system.location], system)) {
+            _.each(system.subsystems, function(subsystem) {
+                if(_.findWhere(subsystem.contents, {contract: contract.id})) {
+                    holder = {system: system, subsystem: subsystem};
+                }
+            }, this);
+        }
+        if(holder) {
+            this.dataIndexStats.hits++;
+        } else {
+            this.dataIndexStats.misses++;
+            holder = this.scanData(contract);
+            if(holder) {
+                this.dataIndex[contract.id] = holder.system;
+            }
+        }
+        if(this.checkDataIndex) {
+            var scanned = this.scanData(contract);
+            if((scanned && (!holder || scanned.system !== holder.system
+                    || scanned.subsystem !== holder.subsystem)) || (!scanned && holder)) {
+                logger.error('Data index inconsistent for contract ' + contract.id);
+            }
+        }
+        return holder;
+    }
+    
+    /**
+     * Finds the system and subsystem holding data for a contract by scanning
+     * all systems.
+     * @param {object} contract - The contract.
+     * @returns {object} The system and subsystem, or `undefined` if not found.
+     */
+    Context.prototype.scanData = function(contract) {
         var returnValue;
-        contract.id
         _.each(this.federations, function(federation) {
             _.each(federation.federates, function(federate) {
                 _.each(federate.systems, function(system) {
                     _.each(system.subsystems, function(subsystem) {
                         if(_.findWhere(subsystem.contents, {contract: contract.id})) {
-                            returnValue = system;
+                            returnValue = {system: system, subsystem: subsystem};
                         }
                     }, this)
                 }, this)
@@ -107,7 +185,8 @@ define('context', function(require) {
      * @returns {object} The location, or `undefined` if not found.
      */
     Context.prototype.getSystemLocation = function(system) {
-        return _.findWhere(this.locations, {id: system.location});
+        return _.has(this.locationIndex, system.location)?
+                this.locationIndex[system.location]:undefined;
     }
     
     /**
@@ -116,17 +195,58 @@ define('context', function(require) {
      * @returns {array} The array of systems.
      */
     Context.prototype.getSystems = function(location) {
-        var systems = [];
+        return _.has(this.systemIndex, location.id)?
+                _.clone(this.systemIndex[location.id]):[];
+    }
+    
+    /**
+     * Rebuilds the index of systems by location from all federates (see
+     * `init`). Later changes update single entries (see `indexSystem`).
+     */
+    Context.prototype.indexSystems = function() {
+        this.systemIndex = {};
+        this.systemLocations = {};
         _.each(this.federations, function(federation) {
             _.each(federation.federates, function(federate) {
                 _.each(federate.systems, function(system) {
-                    if(system.location===location.id) {
-                        systems.push(system);
-                    }
+                    this.indexSystem(system);
                 }, this)
             }, this);
         }, this);
-        return systems;
+    }
+    
+    /**
+     * Updates the index entry of a system after it was commissioned or
+     * moved. Systems at their indexed location are not changed.
+     * @param {object} system - The system.
+     */
+    Context.prototype.indexSystem = function(system) {
+        if(this.systemLocations[system.id] === system.location) {
+            return;
+        }
+        this.unindexSystem(system);
+        if(system.location!==undefined) {
+            if(!_.has(this.systemIndex, system.location)) {
+                this.systemIndex[system.location] = [];
+            }
+            this.systemIndex[system.location].push(system);
+            this.systemLocations[system.id] = system.location;
+        }
+    }
+    
+    /**
+     * Removes the index entry of a system, e.g. after it was decommissioned.
+     * @param {object} system - The system.
+     */
+    Context.prototype.unindexSystem = function(system) {
+        var location = this.systemLocations[system.id];
+        if(location!==undefined) {
+            this.systemIndex[location] = _.without(this.systemIndex[location], system);
+            if(this.systemIndex[location].length===0) {
+                delete this.systemIndex[location];
+            }
+            delete this.systemLocations[system.id];
+        }
     }
     
     /**
@@ -136,6 +256,28 @@ define('context', function(require) {
      * @returns {object} The new location, or `undefined` if not found.
      */
     Context.prototype.propagate = function(location, duration) {
+        var start = profiler.start();
+        var table = location?this.propagationTable[location.id]:undefined;
+        var propagated;
+        if(table && table[0]!==undefined && this.locationIndex[location.id]===location
+                && duration >= 0 && duration%1===0) {
+            // locations repeat with a period of the number of sectors in the orbit
+            propagated = table[duration%table.length];
+        } else {
+            propagated = this.propagateLocation(location, duration);
+        }
+        profiler.stop('context.propagate', start);
+        return propagated;
+    }
+    
+    /**
+     * Propagates a location over a specified time duration without using
+     * the propagation table.
+     * @param {object} location - The location.
+     * @param {Number} duration - The propagation duration.
+     * @returns {object} The new location, or `undefined` if not found.
+     */
+    Context.prototype.propagateLocation = function(location, duration) {
         if(!location || location.isSurface()) {
             return location;
         } else if(location.altitude==="LEO") {
@@ -190,6 +332,40 @@ define('context', function(require) {
         return Random.shuffle(this.orderStream, _.clone(federation.federates));
     }
 
+    /**
+     * Gets the key describing which demand classes (phenomena and size) a
+     * spacecraft could currently sense, used to look up storage penalties.
+     * @param {object} spacecraft - The spacecraft.
+     * @returns {String} The sensing capability key.
+     */
+    Context.prototype.getSensingKey = function(spacecraft) {
+        return _.map(this.demandClasses, function(demandClass) {
+            return spacecraft.couldSense(demandClass.phenomena, demandClass.size)?1:0;
+        }).join('');
+    }
+    
+    /**
+     * Gets the storage penalty for a demand within a spacecraft: the
+     * negative expected maximum value of the demands the spacecraft (or
+     * number of spacecraft) could sense instead, looked up in the demand
+     * value table of the event types (see `demandValues`).
+     * @param {object} demand - The demand.
+     * @param {object} spacecraft - The spacecraft.
+     * @param {Number} numSC - The number of spacecraft (default 1).
+     * @returns {Number} The storage penalty.
+     */
+    Context.prototype.getStoragePenalty = function(demand, spacecraft, numSC) {
+        var key = this.getSensingKey(spacecraft);
+        var misses = demandValues.stats.misses;
+        var value = demandValues.getValue(this.demandValues, key, numSC);
+        if(demandValues.stats.misses > misses) {
+            this.storagePenaltyStats.misses++;
+        } else {
+            this.storagePenaltyStats.hits++;
+        }
+        return -1*value;
+    }
+    
     /**
      * Initializes this context.
      * @param {object} sim - The simulator.
@@ -211,12 +387,14 @@ define('context', function(require) {
         
         // random number streams for federate-specific rolls
         this.rollStreams = [];
+        this.streamSeeds = {shuffle: shuffleSeed, order: orderSeed, roll: {}};
         _.each(this.federations, function(federation) {
             _.each(federation.federates, function(federate) {
                 var rollStream = new Random.engines.mt19937();
                 var rollSeed = Random.integer(Math.pow(-2,53),Math.pow(2,53))(this.masterStream);
                 rollStream.seed(rollSeed);
                 this.rollStreams[federate.id] = rollStream;
+                this.streamSeeds.roll[federate.id] = rollSeed;
             }, this);
         }, this);
         
@@ -224,7 +402,26 @@ define('context', function(require) {
         this.currentEvents = [];
         this.pastEvents = [];
         this.futureEvents = [];
-        this.futureEvents = Random.shuffle(this.shuffleStream, _.clone(this.events));
+        if(eventTape.enabled) {
+            // deal events from the tape of this seed instead of the deck
+            this.eventTape = eventTape.get(this.seed, demandValues.hash(this.eventTypes?this.eventTypes:
+                    demandValues.getEventTypes(this.events)), this.events.length,
+                    this.sectors.length, sim.maxTime*this.sectors.length);
+            this.numDraws = 0;
+        } else {
+            this.eventTape = undefined;
+            this.futureEvents = Random.shuffle(this.shuffleStream, _.clone(this.events));
+        }
+        
+        // look up the demand value table shared by all games with these event types
+        this.demandValues = demandValues.get(this.eventTypes?this.eventTypes:
+                demandValues.getEventTypes(this.events));
+        this.demandClasses = this.demandValues.classes;
+        this.storagePenaltyStats = {hits: 0, misses: 0};
+        
+        // reset data index
+        this.dataIndex = {};
+        this.dataIndexStats = {hits: 0, misses: 0};
         
         // reset time
         this.time = sim.time;
@@ -234,6 +431,7 @@ define('context', function(require) {
         _.each(this.federations, function(federation) {
             federation.init(sim);
         });
+        this.indexSystems();
     };
 
     /**
@@ -241,20 +439,29 @@ define('context', function(require) {
      * @param {object} sim - The simulator.
      */
     Context.prototype.tick = function(sim) {
+        var start = profiler.start();
         _.each(this.federations, function(federation) {
             federation.tick(sim);
         }, this);
         // update time
         this.nextTime = sim.time;
+        profiler.stop('context.tick', start);
     };
 
     /** 
      * Tocks this context to commit state changes.
      */
     Context.prototype.tock = function() {
+        var start = profiler.start();
         // default any failed contracts
         _.each(this.federations, function(federation) {
             federation.tock();
+            // spacecraft have moved to new locations
+            _.each(federation.federates, function(federate) {
+                _.each(federate.systems, function(system) {
+                    this.indexSystem(system);
+                }, this);
+            }, this);
             _.each(federation.federates, function(federate) {
                 _.each(_.filter(federate.contracts, function(contract) { 
                     return contract.isDefaulted(this); 
@@ -292,7 +499,7 @@ define('context', function(require) {
         }
         // reveal and resolve new events in each sector
         _.each(this.sectors, function(sector) {
-            var event = this.futureEvents.pop();
+            var event = this.eventTape?eventTape.deal(this, this.numDraws++):this.futureEvents.pop();
             event.sector = sector;
             this.currentEvents.push(event);
             // log events in sectors where spacecraft exist
@@ -304,7 +511,7 @@ define('context', function(require) {
                 logger.debug("Sector " + sector + " event: " + event.id);
             }
             // if there are no more future events, shuffle past events
-            if(this.futureEvents.length===0) {
+            if(!this.eventTape && this.futureEvents.length===0) {
                 logger.info("Shuffling events...");
                 this.pastEvents = Random.shuffle(this.shuffleStream, this.pastEvents);
                 while(this.pastEvents.length > 0) {
@@ -341,7 +548,9 @@ define('context', function(require) {
         }, this);
         // update time
         this.time = this.nextTime;
+        profiler.stop('context.tock', start);
 		
+        start = profiler.start();
         logger.info('Start Operations for Turn ' + this.time);
 		_.each(this.getShuffledFederations(), function(federation) {
 			_.each(this.getShuffledFederates(federation), function(federate) {
@@ -351,6 +560,13 @@ define('context', function(require) {
 			federation.operations.execute(federation, this);
 		}, this);
         logger.info('End Operations for Turn ' + this.time);
+        profiler.stop('ops.execute', start);
+        // record cash at the end of the turn
+        _.each(this.federations, function(federation) {
+            _.each(federation.federates, function(federate) {
+                federate.cashHistory.push(federate.cash);
+            });
+        });
     };
     
     return Context;
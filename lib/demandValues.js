@@ -0,0 +1,220 @@
+/*
+ * Copyright 2015 Paul T. Grogan
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+if (typeof define !== 'function') {
+    var define = require('amdefine')(module);
+}
+
+/**
+ * A module to precompute the expected opportunity value of storing data
+ * (the expected maximum value of the demands a spacecraft could sense
+ * instead), used as the storage penalty of the operations models with
+ * `a`. Values depend only on the event types, so a table of values for
+ * every combination of demand classes (phenomena and size) and number of
+ * spacecraft is built once per event types (keyed by a hash) and shared
+ * by all games in a process. Tables are optionally saved to and loaded
+ * from a directory after `enableCache` is called.
+ * @module demandValues
+ */
+define('demandValues', function(require) {
+    var _ = require("underscore");
+    var crypto = require("crypto");
+    var fs = require("fs");
+    var path = require("path");
+    var math = require("mathjs");
+    var logger = require("logger");
+
+    var demandValues = {
+        directory: undefined, // cache directory (undefined to disable)
+        maxSpacecraft: 6, // numbers of spacecraft in each table
+        maxClasses: 10, // demand classes for which tables are filled on build
+        tables: {}, // tables[hash]: {hash, classes, values}
+        stats: {hits: 0, misses: 0, loads: 0, builds: 0}
+    };
+
+    /**
+     * Enables saving and loading tables in a directory.
+     * @param {String} directory - The directory (created if needed).
+     */
+    demandValues.enableCache = function(directory) {
+        if(!fs.existsSync(directory)) {
+            fs.mkdirSync(directory);
+        }
+        this.directory = directory;
+    }
+
+    /**
+     * Hashes event types to a table key. Demand identifiers (assigned to
+     * the specifications when building events) are ignored.
+     * @param {array} eventTypes - The event types (see `Game`).
+     * @returns {String} The key.
+     */
+    demandValues.hash = function(eventTypes) {
+        return crypto.createHash('md5').update(JSON.stringify(_.map(eventTypes, function(eventType) {
+            return [eventType.number, eventType.type, _.omit(eventType.spec, 'id')];
+        }))).digest('hex');
+    }
+
+    /**
+     * Gets the event types of a list of events (one type per event), for
+     * contexts built without event types.
+     * @param {array} events - The events.
+     * @returns {array} The event types.
+     */
+    demandValues.getEventTypes = function(events) {
+        return _.map(events, function(event) {
+            return event.isDemand()?{number: 1, type: 'demand', spec: {
+                phenomena: event.phenomena,
+                size: event.size,
+                valueSchedule: event.valueSchedule,
+                defaultValue: event.defaultValue
+            }}:{number: 1, type: 'disturb', spec: {}};
+        });
+    }
+
+    /**
+     * Gets the value of a demand event type at time 0 (as `Demand.getValueAt`).
+     * @param {object} eventType - The demand event type.
+     * @returns {Number} The value.
+     */
+    demandValues.getInitialValue = function(eventType) {
+        var schedule = _.find(eventType.spec.valueSchedule, function(entry) {
+            return 0 <= entry[0];
+        });
+        return schedule?schedule[1]:eventType.spec.defaultValue;
+    }
+
+    /**
+     * Computes the expected maximum value of the demands with the given
+     * classes over a number of spacecraft, counting all other events as
+     * value 0.
+     * @param {object} table - The table.
+     * @param {array} eventTypes - The event types.
+     * @param {String} key - The sensing capability key (one digit per class).
+     * @param {Number} numSC - The number of spacecraft.
+     * @returns {Number} The expected value.
+     */
+    demandValues.compute = function(table, eventTypes, key, numSC) {
+        var matching = _.filter(eventTypes, function(eventType) {
+            return eventType.type==='demand' && eventType.number > 0
+                    && _.some(table.classes, function(demandClass, i) {
+                        return key.charAt(i)==='1' && demandClass.phenomena===eventType.spec.phenomena
+                                && demandClass.size===eventType.spec.size;
+                    });
+        });
+        var values = _.union([0], _.map(matching, this.getInitialValue)).sort();
+        var counts = _.map(values, function(value) {
+            return _.reduce(matching, function(memo, eventType) {
+                return memo + (this.getInitialValue(eventType)===value?eventType.number:0);
+            }, 0, this);
+        }, this);
+        var total = _.reduce(eventTypes, function(memo, eventType) {
+            return memo + eventType.number;
+        }, 0);
+        counts[0] = total - _.reduce(matching, function(memo, eventType) {
+            return memo + eventType.number;
+        }, 0);
+        var cumulative = 0;
+        return _.reduce(values, function(memo, value, i) {
+            var previous = cumulative;
+            cumulative += counts[i];
+            return memo + value*(math.pow(cumulative, numSC) - math.pow(previous, numSC));
+        }, 0)/math.pow(cumulative, numSC);
+    }
+
+    /**
+     * Builds a table of values for every combination of demand classes (up
+     * to `maxClasses` classes; others are filled in on first use).
+     * @param {array} eventTypes - The event types.
+     * @returns {object} The table.
+     */
+    demandValues.build = function(eventTypes) {
+        var table = {
+            hash: this.hash(eventTypes),
+            classes: _.sortBy(_.uniq(_.map(_.filter(eventTypes, function(eventType) {
+                return eventType.type==='demand' && eventType.number > 0;
+            }), function(eventType) {
+                return {phenomena: eventType.spec.phenomena, size: eventType.spec.size};
+            }), false, function(demandClass) {
+                return demandClass.phenomena + ':' + demandClass.size;
+            }), function(demandClass) {
+                return demandClass.phenomena + ':' + demandClass.size;
+            }),
+            values: {} // values[key][numSC-1]: expected value
+        };
+        _.each(_.range(table.classes.length<=this.maxClasses?math.pow(2, table.classes.length):0), function(i) {
+            var key = _.map(table.classes, function(demandClass, j) {
+                return (i >> j) & 1;
+            }).join('');
+            table.values[key] = _.map(_.range(1, this.maxSpacecraft + 1), function(numSC) {
+                return this.compute(table, eventTypes, key, numSC);
+            }, this);
+        }, this);
+        this.stats.builds++;
+        return table;
+    }
+
+    /**
+     * Gets the table for event types, loading it from the cache directory
+     * or building (and saving) it if needed.
+     * @param {array} eventTypes - The event types.
+     * @returns {object} The table.
+     */
+    demandValues.get = function(eventTypes) {
+        var hash = this.hash(eventTypes);
+        if(!_.has(this.tables, hash)) {
+            var filename = this.directory?path.join(this.directory, hash + '.json'):undefined;
+            if(filename && fs.existsSync(filename)) {
+                this.tables[hash] = JSON.parse(fs.readFileSync(filename, 'utf8'));
+                this.stats.loads++;
+                logger.info('Loaded demand value table from ' + filename);
+            } else {
+                this.tables[hash] = this.build(eventTypes);
+                if(filename) {
+                    fs.writeFileSync(filename, JSON.stringify(this.tables[hash]));
+                    logger.info('Saved demand value table to ' + filename);
+                }
+            }
+            this.tables[hash].eventTypes = eventTypes;
+        }
+        return this.tables[hash];
+    }
+
+    /**
+     * Gets the expected value for a sensing capability key and number of
+     * spacecraft, computing it if not in the table.
+     * @param {object} table - The table (see `get`).
+     * @param {String} key - The sensing capability key.
+     * @param {Number} numSC - The number of spacecraft (default 1).
+     * @returns {Number} The expected value.
+     */
+    demandValues.getValue = function(table, key, numSC) {
+        numSC = numSC || 1;
+        var values = table.values[key];
+        if(values && numSC <= values.length) {
+            this.stats.hits++;
+            return values[numSC-1];
+        }
+        this.stats.misses++;
+        values = table.values[key] = values || [];
+        for(var n = values.length + 1; n <= numSC; n++) {
+            values.push(this.compute(table, table.eventTypes, key, n));
+        }
+        return values[numSC-1];
+    }
+
+    return demandValues;
+});
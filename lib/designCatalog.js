@@ -0,0 +1,90 @@
+/*
+ * Copyright 2015 Paul T. Grogan
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+if (typeof define !== 'function') {
+    var define = require('amdefine')(module);
+}
+
+/**
+ * A module with the catalogs of designs used by fss-batch.js and the
+ * benchmark suite (fss-bench.js): reference designs for a single player,
+ * from a single SmallSat to GEO relay constellations with ISLs, and
+ * federated designs for 2 and 3 players (as enumerated in fss-exp6.js and
+ * fss-exp7.js). Designs are referenced by index, so new designs are only
+ * appended.
+ * @module designCatalog
+ */
+define('designCatalog', function(require) {
+    var designCatalog = {
+        reference: [
+            "1.SmallSat@LEO1,VIS,pSGL 1.GroundSta@SUR1,pSGL", // 0
+            "1.SmallSat@LEO1,SAR,pSGL 1.GroundSta@SUR1,pSGL", // 1
+            "1.SmallSat@MEO1,VIS,pSGL 1.GroundSta@SUR1,pSGL", // 2
+            "1.SmallSat@MEO1,SAR,pSGL 1.GroundSta@SUR1,pSGL", // 3
+            "1.SmallSat@LEO1,VIS,pSGL 1.SmallSat@LEO3,VIS,pSGL 1.GroundSta@SUR1,pSGL", // 4
+            "1.SmallSat@LEO1,SAR,pSGL 1.SmallSat@LEO3,SAR,pSGL 1.GroundSta@SUR1,pSGL", // 5
+            "1.SmallSat@LEO1,VIS,pSGL 1.GroundSta@SUR1,pSGL 1.GroundSta@SUR3,pSGL", // 6
+            "1.SmallSat@LEO1,SAR,pSGL 1.GroundSta@SUR1,pSGL 1.GroundSta@SUR3,pSGL", // 7
+            "1.MediumSat@LEO1,SAR,VIS,DEF,pSGL 1.MediumSat@LEO3,SAR,VIS,DEF,pSGL 1.MediumSat@LEO5,SAR,VIS,DEF,pSGL 1.GroundSta@SUR1,pSGL 1.GroundSta@SUR3,pSGL 1.GroundSta@SUR5,pSGL", // 8
+            "1.SmallSat@LEO1,VIS,pSGL 1.SmallSat@LEO3,VIS,pSGL 1.SmallSat@LEO5,VIS,pSGL 1.GroundSta@SUR1,pSGL 1.GroundSta@SUR3,pSGL 1.GroundSta@SUR5,pSGL", // 9
+            "1.SmallSat@LEO1,SAR,pSGL 1.SmallSat@LEO3,SAR,pSGL 1.SmallSat@LEO5,SAR,pSGL 1.GroundSta@SUR1,pSGL 1.GroundSta@SUR3,pSGL 1.GroundSta@SUR5,pSGL", // 10
+            "1.SmallSat@LEO1,VIS,pSGL 1.SmallSat@LEO3,VIS,pSGL 1.SmallSat@LEO5,VIS,pSGL 1.GroundSta@SUR1,pSGL 1.GroundSta@SUR3,pSGL", // 11
+            "1.SmallSat@LEO1,VIS,pSGL 1.SmallSat@LEO3,VIS,pSGL 1.SmallSat@LEO5,VIS,pSGL 1.GroundSta@SUR1,pSGL", // 12
+            "1.SmallSat@LEO1,VIS,pSGL 1.SmallSat@LEO3,VIS,pSGL 1.GroundSta@SUR1,pSGL 1.GroundSta@SUR3,pSGL", // 13
+            "1.SmallSat@LEO1,SAR,pSGL 1.SmallSat@LEO3,SAR,pSGL 1.SmallSat@LEO5,SAR,pSGL 1.GroundSta@SUR1,pSGL", // 14
+            "1.MediumSat@LEO1,SAR,VIS,DEF,pSGL 1.MediumSat@LEO3,SAR,VIS,DEF,pSGL 1.MediumSat@LEO5,SAR,VIS,DEF,pSGL 1.GroundSta@SUR1,pSGL", // 15
+            "1.MediumSat@LEO1,SAR,VIS,DEF,pSGL 1.GroundSta@SUR1,pSGL", // 16
+            "1.MediumSat@LEO1,SAR,VIS,pSGL,pSGL 1.GroundSta@SUR1,pSGL,pSGL", // 17
+            "1.MediumSat@LEO1,VIS,DAT,DEF,pSGL 1.GroundSta@SUR1,pSGL", // 18
+            "1.MediumSat@LEO1,VIS,DAT,pSGL,pSGL 1.GroundSta@SUR1,pSGL,pSGL", // 19
+            "1.SmallSat@LEO6,VIS,pISL 1.SmallSat@GEO1,pISL,pSGL 1.SmallSat@LEO2,VIS,pISL 1.GroundSta@SUR1,pSGL", // 20
+            "1.SmallSat@LEO6,VIS,pISL 1.MediumSat@GEO1,pISL,pISL,pSGL,pSGL 1.SmallSat@LEO2,VIS,pISL 1.GroundSta@SUR1,pSGL,pSGL", // 21
+            "1.LargeSat@LEO1,SAR,VIS,pSGL,pSGL,DEF,DAT 1.GroundSta@SUR1,pSGL,pSGL", // 22
+            "1.LargeSat@LEO6,SAR,VIS,pISL,pISL,DEF,DAT 1.MediumSat@GEO1,pISL,pISL,pSGL,pSGL 1.GroundSta@SUR1,pSGL,pSGL", // 23
+            "1.MediumSat@LEO1,VIS,DAT,pSGL,pSGL 1.GroundSta@SUR1,pSGL,pSGL", // 24
+            "1.MediumSat@LEO1,VIS,DAT,pSGL,pSGL 1.SmallSat@LEO3,VIS,pSGL 1.GroundSta@SUR1,pSGL,pSGL", // 25
+            "1.LargeSat@LEO1,VIS,DAT,SAR,pSGL,pSGL,pSGL 1.GroundSta@SUR1,pSGL,pSGL,pSGL", // 26
+            "1.SmallSat@LEO1,VIS,pSGL 1.SmallSat@LEO1,SAR,pSGL 1.GroundSta@SUR1,pSGL,pSGL", // 27
+            "1.SmallSat@LEO6,VIS,pISL 1.MediumSat@LEO1,pISL,pISL,pSGL,pSGL 1.SmallSat@LEO2,VIS,pISL 1.GroundSta@SUR1,pSGL,pSGL", // 28
+            "1.SmallSat@LEO6,VIS,pISL 1.SmallSat@LEO1,pISL,pSGL 1.SmallSat@LEO2,VIS,pISL 1.SmallSat@LEO3,pISL,pSGL 1.GroundSta@SUR1,pSGL", // 29
+            "1.SmallSat@LEO6,VIS,pISL 1.MediumSat@LEO1,VIS,pISL,pSGL,pSGL 1.SmallSat@LEO2,VIS,pISL 1.MediumSat@LEO3,VIS,pISL,pSGL,pSGL 1.GroundSta@SUR1,pSGL,pSGL", // 30
+            "1.MediumSat@GEO1,pISL,pISL,pSGL,pSGL 1.SmallSat@LEO2,VIS,pISL 1.SmallSat@GEO3,pISL,pISL 1.SmallSat@LEO4,VIS,pISL 1.SmallSat@GEO5,pISL,pISL 1.SmallSat@LEO6,VIS,pISL 1.GroundSta@SUR1,pSGL,pSGL", // 31
+            "1.SmallSat@LEO1,VIS,pSGL 1.SmallSat@LEO2,VIS,pISL 1.SmallSat@LEO3,VIS,pSGL 1.SmallSat@LEO4,VIS,pISL 1.SmallSat@LEO5,VIS,pSGL 1.SmallSat@LEO6,VIS,pISL 1.MediumSat@GEO1,pSGL,pSGL,pISL,pISL 1.GroundSta@SUR1,pSGL,pSGL,pSGL", // 32
+            "1.SmallSat@MEO1,VIS,pSGL 1.SmallSat@MEO2,VIS,pSGL 1.SmallSat@MEO3,VIS,pSGL 1.SmallSat@MEO4,VIS,pSGL 1.SmallSat@MEO5,VIS,pSGL 1.SmallSat@MEO6,VIS,pSGL 1.GroundSta@SUR1,pSGL", // 33
+            "1.SmallSat@MEO1,SAR,pSGL 1.SmallSat@MEO2,SAR,pSGL 1.SmallSat@MEO3,SAR,pSGL 1.SmallSat@MEO4,SAR,pSGL 1.SmallSat@MEO5,SAR,pSGL 1.SmallSat@MEO6,SAR,pSGL 1.GroundSta@SUR1,pSGL", // 34
+            "1.SmallSat@MEO1,VIS,pSGL 1.SmallSat@MEO2,VIS,pSGL 1.SmallSat@MEO3,VIS,pSGL 1.SmallSat@MEO4,VIS,pSGL 1.SmallSat@MEO5,VIS,pSGL 1.SmallSat@MEO6,VIS,pSGL 1.GroundSta@SUR1,pSGL 1.GroundSta@SUR4,pSGL", // 35
+            "1.SmallSat@MEO1,SAR,pSGL 1.SmallSat@MEO2,SAR,pSGL 1.SmallSat@MEO3,SAR,pSGL 1.SmallSat@MEO4,SAR,pSGL 1.SmallSat@MEO5,SAR,pSGL 1.SmallSat@MEO6,SAR,pSGL 1.GroundSta@SUR1,pSGL 1.GroundSta@SUR4,pSGL", // 36
+            "1.MediumSat@LEO1,VIS,pISL,pSGL,pSGL 1.MediumSat@LEO2,VIS,DAT,pISL,pISL 1.MediumSat@LEO3,VIS,pISL,pSGL,pSGL 1.MediumSat@LEO4,VIS,DAT,pISL,pISL 1.MediumSat@LEO5,VIS,pISL,pSGL,pSGL 1.MediumSat@LEO6,VIS,DAT,pISL,pISL 1.GroundSta@SUR1,pSGL,pSGL", // 37
+            "1.MediumSat@LEO1,VIS,pISL,pSGL,pSGL 1.MediumSat@LEO2,VIS,DEF,pISL,pISL 1.MediumSat@LEO3,VIS,pISL,pSGL,pSGL 1.MediumSat@LEO4,VIS,DEF,pISL,pISL 1.MediumSat@LEO5,VIS,pISL,pSGL,pSGL 1.MediumSat@LEO6,VIS,DEF,pISL,pISL 1.GroundSta@SUR1,pSGL,pSGL", // 38
+            "1.MediumSat@LEO1,VIS,pISL,pISL,pSGL 1.MediumSat@LEO2,VIS,pISL,pISL,pISL 1.MediumSat@LEO3,VIS,pISL,pISL,pSGL 1.MediumSat@LEO4,VIS,pISL,pISL,pISL 1.MediumSat@LEO5,VIS,pISL,pISL,pSGL 1.MediumSat@LEO6,VIS,pISL,pISL,pISL 1.LargeSat@GEO1,pSGL,pSGL,pSGL,pISL,pISL,pISL 1.GroundSta@SUR1,pSGL,pSGL,pSGL", // 39
+            "1.MediumSat@LEO6,VIS,SAR,pISL,pISL 1.MediumSat@GEO1,pISL,pISL,pSGL,pSGL 1.GroundSta@SUR1,pSGL,pSGL", // 40
+            "1.MediumSat@LEO6,VIS,DAT,pISL,pISL 1.MediumSat@GEO1,pISL,pISL,pSGL,pSGL 1.GroundSta@SUR1,pSGL,pSGL", // 41
+            "1.MediumSat@LEO6,VIS,SAR,pISL,pISL 1.MediumSat@LEO2,VIS,SAR,pISL,pISL 1.MediumSat@GEO1,pISL,pISL,pSGL,pSGL 1.GroundSta@SUR1,pSGL,pSGL", // 42
+            "1.MediumSat@LEO6,VIS,SAR,pISL,pISL 1.MediumSat@LEO2,VIS,SAR,pISL,pISL 1.MediumSat@LEO4,VIS,SAR,pISL,pISL 1.MediumSat@GEO1,pISL,pISL,pSGL,pSGL 1.GroundSta@SUR1,pSGL,pSGL", // 43
+            "1.MediumSat@LEO6,VIS,SAR,pISL,pISL 1.MediumSat@LEO2,VIS,SAR,pISL,pISL 1.MediumSat@LEO4,VIS,SAR,pISL,pISL 1.LargeSat@GEO1,pISL,pISL,pISL,pSGL,pSGL,pSGL 1.GroundSta@SUR1,pSGL,pSGL,pSGL", // 44
+            "1.SmallSat@LEO1,VIS,pSGL 1.SmallSat@LEO1,SAR,pSGL 1.GroundSta@SUR1,pSGL" // 45
+        ],
+        federated: [
+            "1.SmallSat@MEO1,VIS,oSGL 1.GroundSta@SUR1,oSGL 2.SmallSat@MEO4,SAR,oSGL 2.GroundSta@SUR4,oSGL", // 0
+            "1.MediumSat@MEO1,VIS,SAR,oSGL,oISL 1.GroundSta@SUR1,oSGL 2.MediumSat@MEO4,VIS,SAR,oSGL,oISL 2.GroundSta@SUR4,oSGL", // 1
+            "1.SmallSat@MEO1,VIS,oSGL 1.SmallSat@MEO2,VIS,oISL 1.GroundSta@SUR1,oSGL 2.SmallSat@MEO4,SAR,oSGL 2.SmallSat@MEO5,SAR,oISL 2.GroundSta@SUR4,oSGL", // 2
+            "1.SmallSat@MEO1,VIS,oSGL 1.GroundSta@SUR1,oSGL 2.SmallSat@MEO3,VIS,oSGL 2.GroundSta@SUR3,oSGL 3.SmallSat@MEO5,SAR,oSGL 3.GroundSta@SUR5,oSGL", // 3
+            "1.MediumSat@MEO1,VIS,SAR,oSGL,oISL 1.GroundSta@SUR1,oSGL 2.MediumSat@MEO3,VIS,SAR,oSGL,oISL 2.GroundSta@SUR3,oSGL 3.MediumSat@MEO5,VIS,SAR,oSGL,oISL 3.GroundSta@SUR5,oSGL" // 4
+        ]
+    };
+
+    return designCatalog;
+});
@@ -0,0 +1,383 @@
+/*
+ * Copyright 2015 Paul T. Grogan
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+if (typeof define !== 'function') {
+    var define = require('amdefine')(module);
+}
+
+/**
+ * A module to enumerate design strings lazily, one canonical design at a
+ * time, as in the enumerations of fss-exp6.js and fss-exp7.js. Each player
+ * has a ground station in its sector (sized for its satellites) and
+ * `numSatellites` satellites in consecutive sectors before it, chosen
+ * from a catalog with the largest satellites in the first sectors.
+ *
+ * Designs are pruned before simulation if they are infeasible or
+ * dominated by a cheaper design with the same capability:
+ *  - satellites need a link, and a sensor or relay role for the link;
+ *  - satellites cannot carry sensors in GEO;
+ *  - a satellite uses the smallest platform that fits its modules;
+ *  - storage needs a sensor or ISL on the same satellite;
+ *  - an ISL needs a partner ISL (same owner for proprietary protocols),
+ *    and a satellite without an SGL needs a partner with one;
+ *  - a design needs at least one sensor.
+ * Designs equivalent under a rotation of sectors combined with a
+ * permutation of players (which only exist if the station sectors are
+ * symmetric) are yielded once.
+ * @module designSpace
+ */
+define('designSpace', function(require) {
+    var _ = require("underscore");
+    var Game = require("game");
+
+    /**
+     * @constructor
+     * @alias module:designSpace
+     */
+    function DesignSpace() {
+        this.numSatellites = 1; // satellites per player
+        this.sectors = [1]; // station sector of each player
+        this.sgl = 'pSGL';
+        this.isl = 'pISL'; // undefined for no ISL
+        this.orbits = ['MEO'];
+        this.symmetric = false; // all players choose the same satellites
+        this.satellites = undefined; // optional catalog, e.g. ["SmallSat@MEO,SAR,pSGL"]
+        this.maxMedium = Infinity; // medium satellites per player
+        this.maxLarge = Infinity; // large satellites per player
+        this.maxCost = Infinity; // initial cost per player
+
+        // override default attributes or methods
+        for(var n in arguments[0]) {
+            this[n] = arguments[0][n];
+        }
+
+        this.game = new Game();
+        this.catalog = this.buildCatalog();
+        this.symmetries = this.getSymmetries();
+    };
+
+    /**
+     * Gets the cost of a design or commission item.
+     * @param {String} type - The system or subsystem type.
+     * @returns {Number} The cost.
+     */
+    DesignSpace.prototype.getCost = function(type) {
+        var def = _.findWhere(_.union(this.game.spacecraftTypes, this.game.stationTypes,
+                this.game.sglTypes, this.game.islTypes, this.game.sensorTypes,
+                this.game.storageTypes, this.game.defenseTypes), {type: type});
+        return def?def.cost:0;
+    }
+
+    /**
+     * Builds a catalog satellite from a platform, orbit, and modules.
+     * @param {String} type - The spacecraft type, e.g. "SmallSat".
+     * @param {String} orbit - The orbit, e.g. "MEO".
+     * @param {array} modules - The subsystem types.
+     * @returns {object} The satellite.
+     */
+    DesignSpace.prototype.buildSatellite = function(type, orbit, modules) {
+        var platform = this.getCost(type);
+        return {
+            type: type,
+            orbit: orbit,
+            modules: modules,
+            cost: platform*(orbit==='MEO'?1.5:(orbit==='GEO'?2:1))
+                    + _.reduce(modules, function(memo, module) {
+                        return memo + this.getCost(module);
+                    }, 0, this),
+            sensors: _.intersection(modules, ['VIS','SAR']).length,
+            vis: _.contains(modules, 'VIS'),
+            sgl: _.contains(modules, this.sgl),
+            isl: this.isl!==undefined && _.contains(modules, this.isl),
+            size: _.findWhere(this.game.spacecraftTypes, {type: type}).maxSize
+        };
+    }
+
+    /**
+     * Builds the catalog of feasible, non-dominated satellites sorted with
+     * the largest first (most modules, then sensors, then VIS).
+     * @returns {array} The catalog.
+     */
+    DesignSpace.prototype.buildCatalog = function() {
+        var catalog = [];
+        if(this.satellites) {
+            catalog = _.map(this.satellites, function(spec) {
+                var specs = spec.split(',');
+                return this.buildSatellite(specs[0].split('@')[0],
+                        specs[0].split('@')[1], specs.slice(1));
+            }, this);
+        } else {
+            var modules = _.without(['VIS','SAR','DAT',this.sgl,this.isl], undefined);
+            var platforms = _.sortBy(this.game.spacecraftTypes, 'maxSize');
+            // every non-empty subset of modules on the smallest platform that fits
+            _.each(_.range(1, Math.pow(2, modules.length)), function(mask) {
+                var subset = _.filter(modules, function(module, i) {
+                    return (mask >> i) & 1;
+                });
+                var platform = _.find(platforms, function(platform) {
+                    return platform.maxSize >= subset.length;
+                });
+                if(platform) {
+                    _.each(this.orbits, function(orbit) {
+                        catalog.push(this.buildSatellite(platform.type, orbit, subset));
+                    }, this);
+                }
+            }, this);
+            catalog = _.filter(catalog, this.isFeasibleSatellite, this);
+        }
+        return _.sortBy(catalog, function(sat, index) {
+            return [99-sat.modules.length, 9-sat.sensors, sat.vis?0:1, 1000+index].join('|');
+        });
+    }
+
+    /**
+     * Checks if a satellite is feasible and not dominated by itself
+     * without a module.
+     * @param {object} sat - The catalog satellite.
+     * @returns {Boolean} True, if the satellite is kept.
+     */
+    DesignSpace.prototype.isFeasibleSatellite = function(sat) {
+        var dat = _.contains(sat.modules, 'DAT');
+        return (sat.sgl || sat.isl)
+                && (!sat.sgl || sat.sensors > 0 || sat.isl)
+                && (!sat.isl || sat.sensors > 0 || dat || sat.sgl)
+                && !(sat.orbit==='GEO' && sat.sensors > 0)
+                && !(dat && sat.sensors === 0 && !sat.isl);
+    }
+
+    /**
+     * Gets the symmetries of the station sectors: rotations combined with
+     * player permutations which map the station sectors onto themselves.
+     * @returns {array} The player permutations (excluding the identity).
+     */
+    DesignSpace.prototype.getSymmetries = function() {
+        var sectors = this.sectors;
+        var numSectors = this.game.numSectors;
+        var permutations = [[]];
+        _.each(sectors, function() {
+            permutations = _.flatten(_.map(permutations, function(permutation) {
+                return _.map(_.difference(_.range(sectors.length), permutation), function(p) {
+                    return permutation.concat([p]);
+                });
+            }), true);
+        });
+        var symmetries = [];
+        _.each(_.range(numSectors), function(r) {
+            _.each(permutations, function(permutation) {
+                if(_.every(sectors, function(sector, p) {
+                    return (sector - 1 + r)%numSectors === sectors[permutation[p]] - 1;
+                }) && !_.isEqual(permutation, _.range(sectors.length))) {
+                    symmetries.push(permutation);
+                }
+            });
+        });
+        return symmetries;
+    }
+
+    /**
+     * Gets the next candidate after the current one: a non-decreasing list
+     * of catalog indices for each player (or one list shared by all
+     * players if symmetric).
+     * @param {array} choices - The current candidate, or `undefined` for the first.
+     * @returns {array} The next candidate, or `undefined` if none.
+     */
+    DesignSpace.prototype.advance = function(choices) {
+        var numBlocks = this.symmetric?1:this.sectors.length;
+        var n = this.numSatellites;
+        if(choices === undefined) {
+            return this.catalog.length>0?_.map(_.range(numBlocks), function() {
+                return _.map(_.range(n), function() { return 0; });
+            }):undefined;
+        }
+        for(var b = numBlocks - 1; b >= 0; b--) {
+            for(var k = n - 1; k >= 0; k--) {
+                if(choices[b][k] < this.catalog.length - 1) {
+                    choices[b][k]++;
+                    for(var j = k + 1; j < n; j++) {
+                        choices[b][j] = choices[b][k];
+                    }
+                    for(var c = b + 1; c < numBlocks; c++) {
+                        for(j = 0; j < n; j++) {
+                            choices[c][j] = 0;
+                        }
+                    }
+                    return choices;
+                }
+            }
+        }
+        return undefined;
+    }
+
+    /**
+     * Gets the satellites of each player for a candidate.
+     * @param {array} choices - The candidate.
+     * @returns {array} The catalog satellites of each player.
+     */
+    DesignSpace.prototype.getPlayerSatellites = function(choices) {
+        return _.map(this.sectors, function(sector, p) {
+            return _.map(choices[this.symmetric?0:p], function(i) {
+                return this.catalog[i];
+            }, this);
+        }, this);
+    }
+
+    /**
+     * Gets the number of SGL modules for a player's ground station (as
+     * `sizeStation` in fss-exp7.js).
+     * @param {array} sats - The satellites of each player.
+     * @param {Number} p - The player index.
+     * @returns {Number} The number of SGL modules.
+     */
+    DesignSpace.prototype.getStationSize = function(sats, p) {
+        var counts = {};
+        _.each(sats, function(playerSats, q) {
+            _.each(playerSats, function(sat, k) {
+                if(sat.sgl && (q === p || this.sgl === 'oSGL')) {
+                    var sector = this.getSatelliteSector(q, k);
+                    counts[sector] = (counts[sector] || 0) + 1;
+                }
+            }, this);
+        }, this);
+        return Math.max(1, Math.min(3, _.max(_.values(counts).concat([0]))));
+    }
+
+    /**
+     * Gets the orbit sector of a satellite.
+     * @param {Number} p - The player index.
+     * @param {Number} k - The satellite index.
+     * @returns {Number} The sector.
+     */
+    DesignSpace.prototype.getSatelliteSector = function(p, k) {
+        var numSectors = this.game.numSectors;
+        return ((this.sectors[p] - 2 - k)%numSectors + numSectors)%numSectors + 1;
+    }
+
+    /**
+     * Checks if a candidate is feasible and not dominated.
+     * @param {array} choices - The candidate.
+     * @returns {Boolean} True, if the candidate is kept.
+     */
+    DesignSpace.prototype.isFeasible = function(choices) {
+        var sats = this.getPlayerSatellites(choices);
+        var all = _.flatten(sats);
+        if(!_.some(all, function(sat) { return sat.sensors > 0; })) {
+            return false;
+        }
+        return _.every(sats, function(playerSats, p) {
+            var cost = this.getCost('GroundSta') + this.getStationSize(sats, p)*this.getCost(this.sgl)
+                    + _.reduce(playerSats, function(memo, sat) { return memo + sat.cost; }, 0);
+            return _.where(playerSats, {type: 'MediumSat'}).length <= this.maxMedium
+                    && _.where(playerSats, {type: 'LargeSat'}).length <= this.maxLarge
+                    && cost <= this.maxCost
+                    && _.every(playerSats, function(sat, k) {
+                        // ISL partners: other satellites with ISL (of the same owner if proprietary)
+                        var partners = _.filter(this.isl==='oISL'?all:playerSats, function(other) {
+                            return other !== sat && other.isl;
+                        });
+                        // (the same catalog satellite may appear twice)
+                        if(_.filter(this.isl==='oISL'?all:playerSats, function(other) {
+                            return other === sat;
+                        }).length > 1 && sat.isl) {
+                            partners.push(sat);
+                        }
+                        return (!sat.isl || partners.length > 0)
+                                && (sat.sgl || _.some(partners, function(other) { return other.sgl; }));
+                    }, this);
+        }, this);
+    }
+
+    /**
+     * Checks if a candidate is the first of its symmetry class, i.e. no
+     * symmetry maps it to a candidate with smaller catalog indices.
+     * @param {array} choices - The candidate.
+     * @returns {Boolean} True, if the candidate is canonical.
+     */
+    DesignSpace.prototype.isCanonical = function(choices) {
+        if(this.symmetric) {
+            return true;
+        }
+        var key = _.flatten(choices);
+        return !_.some(this.symmetries, function(permutation) {
+            var mapped = [];
+            _.each(permutation, function(q, p) {
+                mapped[q] = choices[p];
+            });
+            mapped = _.flatten(mapped);
+            for(var i = 0; i < key.length; i++) {
+                if(mapped[i] !== key[i]) {
+                    return mapped[i] < key[i];
+                }
+            }
+            return false;
+        });
+    }
+
+    /**
+     * Gets the design string of a candidate.
+     * @param {array} choices - The candidate.
+     * @returns {String} The design string.
+     */
+    DesignSpace.prototype.getDesign = function(choices) {
+        var sats = this.getPlayerSatellites(choices);
+        return _.map(sats, function(playerSats, p) {
+            return _.map(playerSats, function(sat, k) {
+                return [(p+1) + '.' + sat.type + '@' + sat.orbit + this.getSatelliteSector(p, k)]
+                        .concat(sat.modules).join(',');
+            }, this).concat([[(p+1) + '.GroundSta@SUR' + this.sectors[p]].concat(_.map(
+                    _.range(this.getStationSize(sats, p)), function() {
+                        return this.sgl;
+                    }, this)).join(',')]).join(' ');
+        }, this).join(' ');
+    }
+
+    /**
+     * Gets an iterator over the designs of this space.
+     * @returns {object} The iterator with a `next` method which returns
+     * the next design string or `undefined` when done.
+     */
+    DesignSpace.prototype.iterator = function() {
+        var space = this;
+        var choices;
+        return {
+            next: function() {
+                while((choices = space.advance(choices)) !== undefined) {
+                    if(space.isFeasible(choices) && space.isCanonical(choices)) {
+                        return space.getDesign(choices);
+                    }
+                }
+                return undefined;
+            }
+        };
+    }
+
+    /**
+     * Calls a function for each design of this space.
+     * @param {function} callback - The function, called with each design string.
+     * @returns {Number} The number of designs.
+     */
+    DesignSpace.prototype.each = function(callback) {
+        var iterator = this.iterator();
+        var count = 0;
+        var design;
+        while((design = iterator.next()) !== undefined) {
+            callback(design);
+            count++;
+        }
+        return count;
+    }
+
+    return DesignSpace;
+});
@@ -27,8 +27,9 @@ define('dynamicFixedCostFederationOperations', function(require) {
     var Operations = require("operations");
     var lpsolve = require("lp_solve");
     var logger = require("logger");
+    var profiler = require("profiler");
+    var solutionCache = require("solutionCache");
     var fs = require("fs");
-    var math = require("mathjs");
 	
     
     function DynamicFixedCostFederationOperations() {
@@ -76,35 +77,9 @@ define('dynamicFixedCostFederationOperations', function(require) {
      * @returns {Number} The storage penalty.
      */
 	DynamicFixedCostFederationOperations.prototype.getStoragePenalty = function(demand, spacecraft, context) {
-		// compute expected net value of all possible other demands (compared to existing demand)
-		// memoizes results: 	assumes context events does not change during simulation
-		// 						and spacecraft do not change sensing capabilities
-		// 						and demand types have consistent revenue schedules
-		
-		return _.memoize(function(demand, spacecraft) {
-				var events =  _.filter(context.events, function(event) {
-					return event.isDemand() && spacecraft.couldSense(event.phenomena, event.size);
-				});
-				var numSC = 1;
-				var values = _.union([0], _.map(events, function(event) {
-					return event.getValueAt(0);
-				})).sort();
-				var counts = _.map(values, function(value) {
-					return _.size(_.filter(events, function(event) {
-						return event.getValueAt(0)===value;
-					}));
-				});
-				counts[0] = _.size(_.difference(context.events, events));
-				var expValMax =  _.reduce(values, function(memo, value, i) {
-							return memo + values[i]*(math.pow(_.reduce(counts.slice(0,i+1), function(memo,count){return memo + count;},0), numSC)
-									- math.pow(_.reduce(counts.slice(0,i), function(memo,count){return memo + count;},0), numSC));
-						}, 0)/math.pow(_.reduce(counts, function(memo,count){return memo + count;},0),numSC);
-				//console.log('exp val max for ' + spacecraft.id + " with " + numSC + " SC " + ': ' + expValMax);
-				//return Math.min(0, demand.getValueAt(elapsedTime+1) - expValMax);
-				return -1*expValMax;
-		}, function(demand, spacecraft) {
-			return demand.type + spacecraft.id;
-		})(demand, spacecraft);
+		// look up expected net value of all possible other demands (compared to existing demand)
+		// from the table shared by all operations models in this context
+		return context.getStoragePenalty(demand, spacecraft);
 	};
 	
     /**
@@ -116,51 +91,30 @@ define('dynamicFixedCostFederationOperations', function(require) {
         var minTime = context.time;
         var maxTime = Math.min(context.maxTime, context.time + this.planningHorizon);
 		
-		var allSystems = _.flatten(_.map(federation.federates, function(federate) {
-					return _.filter(federate.systems, 
-							function(system) {
-								return system.isCommissioned();
-							});
-				}));
-		var allSpacecrafts = _.filter(allSystems, function(system) {
-					return system.isSpace();
-				});
-		var allSpacecraftsISL = _.filter(allSpacecrafts, function(spacecraft) {
-			return _.some(spacecraft.subsystems, function(subsystem) {
-				return subsystem.isTransceiver() && subsystem.isISL();
-			})
-		});
-		var allStations = _.filter(allSystems, function(system) {
-					return system.isGround();
-				});
-		var allContracts = _.flatten(_.map(federation.federates, function(federate) {
-					return federate.contracts;
-				}));
-		var SGLprotocols = _.union(_.flatten(_.map(allSystems, function(system) {
-					return _.map(_.filter(system.subsystems, function(subsystem) {
-						return subsystem.isTransceiver() && subsystem.isSGL();
-					}), function(sgl) {
-						return sgl.protocol;
-					});
-				})));
-		var ISLprotocols = _.union(_.flatten(_.map(allSystems, function(system) {
-					return _.map(_.filter(system.subsystems, function(subsystem) {
-						return subsystem.isTransceiver() && subsystem.isISL();
-					}), function(sgl) {
-						return sgl.protocol;
-					});
-				})));
+		// federation-wide structure shared by the programs of all federates
+		var skeleton = this.buildSkeleton(federation, context);
+		var allSystems = skeleton.systems;
+		var allSpacecrafts = skeleton.spacecraft;
+		var allSpacecraftsISL = skeleton.spacecraftISL;
+		var allStations = skeleton.stations;
+		var SGLprotocols = skeleton.SGLprotocols;
+		var ISLprotocols = skeleton.ISLprotocols;
 		var phenomenas = ['VIS','SAR',undefined];
 				
 		// FIXME: need to shuffle order of federates
 		// TODO: add planning horizon but restrict storage in non-owned system
 		_.each(federation.federates, function(federate) {
 		
+			var buildStart = profiler.start();
 			var lp = new lpsolve.LinearProgram();
 			lp.setOutputFile('');
 			// objective function
 			var J = new lpsolve.Row();
 			
+			// link columns are only created where a link is feasible
+			var numSkippedColumns = 0;
+			var numSkippedRows = 0;
+			
 			var C = []; // constraints
 			var S = []; // S[i][j]: own spacecraft i senses demand j
 			var E_d = []; // E_d[t][i][j]: at time t own spacecraft i holds data for demand j
@@ -309,38 +263,45 @@ define('dynamicFixedCostFederationOperations', function(require) {
 							T_c[t][i][j][k] = [];
                             var c_vis = new lpsolve.Row();
                             var maxSize = 0;
+                            var couldLink = this.getSharedLinkCheck(skeleton, spacecraft, station, protocol, origLoc, destLoc, context, time-context.time);
 							_.each(demands, function(demand, l) {
+								if(!couldLink(demand.size)) {
+									numSkippedColumns++;
+									return;
+								}
 								// transmit from spacecraft i to ground station j using protocol k data for demand l
 								T_d[t][i][j][k][l] = lp.addColumn(spacecraft.id + "-" + station.id + '-T' + '(' + protocol + ')-' + demand.id+"@"+time, true);
-								if(!_.contains(ownStations, station)) {
+								if(skeleton.owners[station.id]!==federate) {
 									J.Add(T_d[t][i][j][k][l], -1*this.downlinkCost);
 								}
                                 c_vis.Add(T_d[t][i][j][k][l], demand.size);
-                                maxSize = Math.max(maxSize, (spacecraft.couldTransmit(protocol, 
-                                        origLoc, destLoc, demand.size, station, context) 
-                                    && station.couldReceive(protocol, origLoc, destLoc, 
-                                        spacecraft, demand.size, context))?demand.size:0);
+                                maxSize = Math.max(maxSize, demand.size);
 							}, this);
 							_.each(ownContracts, function(contract, l) {
+								if(!couldLink(contract.demand.size)) {
+									numSkippedColumns++;
+									return;
+								}
 								// transmit from spacecraft i to ground station j using protocol k data for own contract l
 								T_c[t][i][j][k][l] = lp.addColumn(spacecraft.id + '-' + station.id + '-T' + '(' + protocol + ')-' + contract.demand.id+"@"+time, true);
-								if(!_.contains(ownStations, station)) {
+								if(skeleton.owners[station.id]!==federate) {
 									J.Add(T_c[t][i][j][k][l], -1*this.downlinkCost);
 								}
                                 c_vis.Add(T_c[t][i][j][k][l], contract.demand.size);
-                                maxSize = Math.max(maxSize, (spacecraft.couldTransmit(protocol, 
-                                        origLoc, destLoc, contract.demand.size, station, context) 
-                                    && station.couldReceive(protocol, origLoc, destLoc, 
-                                        spacecraft, contract.demand.size, context))?contract.demand.size:0);
+                                maxSize = Math.max(maxSize, contract.demand.size);
 							}, this);
 							
-                            // constrain transmission by visibility
-                            C.push({
-                                row: c_vis, 
-                                constraint: 'LE', 
-                                constant: maxSize,
-                                name: spacecraft.id + '-' + station.id + ' ' + protocol + ' visibility at ' + time
-                            });
+                            if(maxSize > 0) {
+                                // constrain transmission by visibility
+                                C.push({
+                                    row: c_vis, 
+                                    constraint: 'LE', 
+                                    constant: maxSize,
+                                    name: spacecraft.id + '-' + station.id + ' ' + protocol + ' visibility at ' + time
+                                });
+                            } else {
+                                numSkippedRows++;
+                            }
 						}, this);
 					}, this);
 				}, this);
@@ -350,10 +311,10 @@ define('dynamicFixedCostFederationOperations', function(require) {
                         _.each(SGLprotocols, function(protocol, k) {
                             var c_tx = new lpsolve.Row();
                             _.each(demands, function(demand, l) {
-                                c_tx.Add(T_d[t][i][j][k][l], demand.size);
+                                this.addTerm(c_tx, T_d[t][i][j][k][l], demand.size);
                             }, this);
                             _.each(ownContracts, function(contract, l) {
-                                c_tx.Add(T_c[t][i][j][k][l], contract.demand.size);
+                                this.addTerm(c_tx, T_c[t][i][j][k][l], contract.demand.size);
                             }, this);
                             // constrain maximum data transmitted from spacecraft i
                             C.push({
@@ -371,10 +332,10 @@ define('dynamicFixedCostFederationOperations', function(require) {
 						var c_rx = new lpsolve.Row();
 						_.each(allSpacecrafts, function(spacecraft, i) {
 							_.each(demands, function(demand, l) {
-								c_rx.Add(T_d[t][i][j][k][l], demand.size);
+								this.addTerm(c_rx, T_d[t][i][j][k][l], demand.size);
 							}, this);
 							_.each(ownContracts, function(contract, l) {
-								c_rx.Add(T_c[t][i][j][k][l], contract.demand.size);
+								this.addTerm(c_rx, T_c[t][i][j][k][l], contract.demand.size);
 							}, this);
 						}, this);
 						// constrain maximum data received by ground station j
@@ -385,7 +346,7 @@ define('dynamicFixedCostFederationOperations', function(require) {
 								constant: station.getMaxReceived(protocol) - station.getReceived(protocol),
 								name: station.id + ' max receive ' + protocol + ' at ' + time
 							});
-						} else if(_.contains(ownStations, station)) {
+						} else if(skeleton.owners[station.id]===federate) {
 							C.push({
 								row: c_rx, 
 								constraint: 'LE', 
@@ -419,46 +380,51 @@ define('dynamicFixedCostFederationOperations', function(require) {
 							L_c[t][i][j][k] = [];
                             var c_vis = new lpsolve.Row();
                             var maxSize = 0;
+                            var couldLink = this.getSharedLinkCheck(skeleton, spacecraft, spacecraft2, protocol, origLoc, destLoc, context, time-context.time);
 							_.each(demands, function(demand, l) {
+								if(!couldLink(demand.size)) {
+									numSkippedColumns++;
+									return;
+								}
 								// transmit from spacecraft i to spacecraft j using protocol k data for demand l
 								L_d[t][i][j][k][l] = lp.addColumn(spacecraft.id + "-" + spacecraft2.id + '-T' + '(' + protocol + ')-' + demand.id+"@"+time, true);
-								if(!_.contains(ownSpacecrafts, spacecraft) || !_.contains(ownSpacecrafts, spacecraft2)) {
+								if(skeleton.owners[spacecraft.id]!==federate || skeleton.owners[spacecraft2.id]!==federate) {
 									J.Add(L_d[t][i][j][k][l], -1*this.crosslinkCost);
 								} else {
 									// small penalty to discourage cycles
 									J.Add(L_d[t][i][j][k][l], this.islPenalty);
 								}
                                 c_vis.Add(L_d[t][i][j][k][l], demand.size);
-                                maxSize = Math.max(maxSize, (spacecraft.couldTransmit(protocol, 
-                                        origLoc, destLoc, demand.size, spacecraft2, context) 
-                                    && spacecraft2.couldReceive(protocol, 
-                                        origLoc, destLoc, spacecraft, demand.size, context)
-                                    && spacecraft !== spacecraft2)?demand.size:0);
+                                maxSize = Math.max(maxSize, demand.size);
 							}, this);
 							_.each(ownContracts, function(contract, l) {
+								if(!couldLink(contract.demand.size)) {
+									numSkippedColumns++;
+									return;
+								}
 								// transmit from spacecraft i to spacecraft j using protocol k data for own contract l
 								L_c[t][i][j][k][l] = lp.addColumn(spacecraft.id + '-' + spacecraft2.id + '-T' + '(' + protocol + ')-' + contract.demand.id+"@"+time, true);
 								// small penalty to discourage cycles
-								if(!_.contains(ownSpacecrafts, spacecraft) || !_.contains(ownSpacecrafts, spacecraft2)) {
+								if(skeleton.owners[spacecraft.id]!==federate || skeleton.owners[spacecraft2.id]!==federate) {
 									J.Add(L_c[t][i][j][k][l], -1*this.crosslinkCost);
 								} else {
 									// small penalty to discourage cycles
 									J.Add(L_c[t][i][j][k][l], this.islPenalty);
 								}
                                 c_vis.Add(L_c[t][i][j][k][l], contract.demand.size)
-                                maxSize = Math.max(maxSize, (spacecraft.couldTransmit(protocol, 
-                                        origLoc, destLoc, contract.demand.size, spacecraft2, context) 
-                                    && spacecraft2.couldReceive(protocol, 
-                                        origLoc, destLoc, spacecraft, contract.demand.size, context)
-                                    && spacecraft !== spacecraft2)?contract.demand.size:0);
+                                maxSize = Math.max(maxSize, contract.demand.size);
 							}, this);
-                            // constrain transmission by visibility
-                            C.push({
-                                row: c_vis, 
-                                constraint: 'LE', 
-                                constant: maxSize,
-                                name: spacecraft.id + '-' + spacecraft2.id + ' ' + protocol + ' visibility at ' + time
-                            });
+                            if(maxSize > 0) {
+                                // constrain transmission by visibility
+                                C.push({
+                                    row: c_vis, 
+                                    constraint: 'LE', 
+                                    constant: maxSize,
+                                    name: spacecraft.id + '-' + spacecraft2.id + ' ' + protocol + ' visibility at ' + time
+                                });
+                            } else {
+                                numSkippedRows++;
+                            }
 						}, this);
 					}, this);
 				}, this);
@@ -468,10 +434,10 @@ define('dynamicFixedCostFederationOperations', function(require) {
                         _.each(SGLprotocols, function(protocol, k) {
                             var c_tx = new lpsolve.Row();
                             _.each(demands, function(demand, l) {
-                                c_tx.Add(L_d[t][i][j][k][l], demand.size);
+                                this.addTerm(c_tx, L_d[t][i][j][k][l], demand.size);
                             }, this);
                             _.each(ownContracts, function(contract, l) {
-                                c_tx.Add(L_c[t][i][j][k][l], contract.demand.size);
+                                this.addTerm(c_tx, L_c[t][i][j][k][l], contract.demand.size);
                             }, this);
                             // constrain maximum data transmitted from spacecraft i
                             C.push({
@@ -489,10 +455,10 @@ define('dynamicFixedCostFederationOperations', function(require) {
 						var c_rx = new lpsolve.Row();
 						_.each(allSpacecraftsISL, function(spacecraft, i) {
 							_.each(demands, function(demand, l) {
-								c_rx.Add(L_d[t][i][j][k][l], demand.size);
+								this.addTerm(c_rx, L_d[t][i][j][k][l], demand.size);
 							}, this);
 							_.each(ownContracts, function(contract, l) {
-								c_rx.Add(L_c[t][i][j][k][l], contract.demand.size);
+								this.addTerm(c_rx, L_c[t][i][j][k][l], contract.demand.size);
 							}, this);
 						}, this);
 						// constrain maximum data received by spacecraft j
@@ -503,7 +469,7 @@ define('dynamicFixedCostFederationOperations', function(require) {
 								constant: spacecraft2.getMaxReceived(protocol) - spacecraft2.getReceived(protocol),
 								name: spacecraft2.id + ' max receive ' + protocol + ' at ' + time
 							});
-						} else if(_.contains(ownSpacecrafts, spacecraft2)) {
+						} else if(skeleton.owners[spacecraft2.id]===federate) {
 							C.push({
 								row: c_rx, 
 								constraint: 'LE', 
@@ -556,7 +522,7 @@ define('dynamicFixedCostFederationOperations', function(require) {
 							
 				_.each(allSpacecrafts, function(spacecraft, i) {
 					var SE_i = _.indexOf(ownSpacecrafts, spacecraft);
-					var R_i = _.indexOf(allSystems, spacecraft);
+					var R_i = skeleton.systemIndex[spacecraft.id];
 					_.each(demands, function(demand, j) {
 						var c_nf = new lpsolve.Row();
 						if(SE_i > -1) {
@@ -570,14 +536,14 @@ define('dynamicFixedCostFederationOperations', function(require) {
 						c_nf.Add(R_d[t][R_i][j],-1);
 						_.each(allStations, function(station, k) {
 						   _.each(SGLprotocols, function(protocol, l) {
-								c_nf.Add(T_d[t][i][k][l][j],-1);
+								this.addTerm(c_nf, T_d[t][i][k][l][j], -1);
 						   }, this);
 						}, this);
-						if((isl_i = _.indexOf(allSpacecraftsISL, spacecraft)) >= 0) {
+						if((isl_i = _.has(skeleton.islIndex, spacecraft.id)?skeleton.islIndex[spacecraft.id]:-1) >= 0) {
 							_.each(allSpacecraftsISL, function(spacecraft2, k) {
 							   _.each(ISLprotocols, function(protocol, l) {
-									c_nf.Add(L_d[t][isl_i][k][l][j],-1);
-									c_nf.Add(L_d[t][k][isl_i][l][j],1);
+									this.addTerm(c_nf, L_d[t][isl_i][k][l][j], -1);
+									this.addTerm(c_nf, L_d[t][k][isl_i][l][j], 1);
 							   }, this);
 							}, this);
 						}
@@ -602,14 +568,14 @@ define('dynamicFixedCostFederationOperations', function(require) {
 						c_nf.Add(R_c[t][R_i][j],-1);
 						_.each(allStations, function(station, k) {
 						   _.each(SGLprotocols, function(protocol, l) {
-								c_nf.Add(T_c[t][i][k][l][j],-1);
+								this.addTerm(c_nf, T_c[t][i][k][l][j], -1);
 						   }, this);
 						}, this);
-						if((isl_i = _.indexOf(allSpacecraftsISL, spacecraft)) >= 0) {
+						if((isl_i = _.has(skeleton.islIndex, spacecraft.id)?skeleton.islIndex[spacecraft.id]:-1) >= 0) {
 							_.each(allSpacecraftsISL, function(spacecraft2, k) {
 							   _.each(ISLprotocols, function(protocol, l) {
-									c_nf.Add(L_c[t][isl_i][k][l][j],-1);
-									c_nf.Add(L_c[t][k][isl_i][l][j],1);
+									this.addTerm(c_nf, L_c[t][isl_i][k][l][j], -1);
+									this.addTerm(c_nf, L_c[t][k][isl_i][l][j], 1);
 							   }, this);
 							}, this);
 						}
@@ -649,13 +615,13 @@ define('dynamicFixedCostFederationOperations', function(require) {
                 }
 							
 				_.each(allStations, function(station, k) {
-					var R_k = _.indexOf(allSystems, station);
+					var R_k = skeleton.systemIndex[station.id];
 					_.each(demands, function(demand, j) {
 						var c_nf = new lpsolve.Row();
 						c_nf.Add(R_d[t][R_k][j],-1);
 						_.each(allSpacecrafts, function(spacecraft, i) {
 							_.each(SGLprotocols, function(protocol, l) {
-								c_nf.Add(T_d[t][i][k][l][j],1);
+								this.addTerm(c_nf, T_d[t][i][k][l][j], 1);
 							}, this);
 						}, this);
 						// constrain net flow at each station
@@ -671,7 +637,7 @@ define('dynamicFixedCostFederationOperations', function(require) {
 						c_nf.Add(R_c[t][R_k][j],-1);
 						_.each(allSpacecrafts, function(spacecraft, i) {
 						   _.each(SGLprotocols, function(protocol, l) {
-								c_nf.Add(T_c[t][i][k][l][j],1);
+								this.addTerm(c_nf, T_c[t][i][k][l][j], 1);
 						   }, this);
 						}, this);
 						// constrain net flow at each station
@@ -697,8 +663,8 @@ define('dynamicFixedCostFederationOperations', function(require) {
 				_.each(allSpacecrafts, function(spacecraft, i) {
 					_.each(allStations, function(station, j) {
 						_.each(SGLprotocols, function(protocol, k) {
-							if(!_.contains(ownStations, station)) {
-								c_cash.Add(T_d[0][i][j][k][l], this.downlinkCost);
+							if(skeleton.owners[station.id]!==federate) {
+								this.addTerm(c_cash, T_d[0][i][j][k][l], this.downlinkCost);
 							}
 						}, this);
 					}, this);
@@ -706,8 +672,8 @@ define('dynamicFixedCostFederationOperations', function(require) {
 				_.each(allSpacecraftsISL, function(spacecraft, i) {
 					_.each(allSpacecraftsISL, function(spacecraft2, j) {
 						_.each(ISLprotocols, function(protocol, k) {
-							if(!_.contains(ownSpacecrafts, spacecraft2)) {
-								c_cash.Add(L_d[0][i][j][k][l], this.crosslinkCost);
+							if(skeleton.owners[spacecraft2.id]!==federate) {
+								this.addTerm(c_cash, L_d[0][i][j][k][l], this.crosslinkCost);
 							}
 						}, this);
 					}, this);
@@ -724,8 +690,8 @@ define('dynamicFixedCostFederationOperations', function(require) {
 				_.each(allSpacecrafts, function(spacecraft, i) {
 					_.each(allStations, function(station, j) {
 						_.each(SGLprotocols, function(protocol, k) {
-							if(!_.contains(ownStations, station)) {
-								c_cash.Add(T_c[0][i][j][k][l], this.downlinkCost);
+							if(skeleton.owners[station.id]!==federate) {
+								this.addTerm(c_cash, T_c[0][i][j][k][l], this.downlinkCost);
 							}
 						}, this);
 					}, this);
@@ -733,8 +699,8 @@ define('dynamicFixedCostFederationOperations', function(require) {
 				_.each(allSpacecraftsISL, function(spacecraft, i) {
 					_.each(allSpacecraftsISL, function(spacecraft2, j) {
 						_.each(ISLprotocols, function(protocol, k) {
-							if(!_.contains(ownSpacecrafts, spacecraft2)) {
-								c_cash.Add(L_c[0][i][j][k][l], this.crosslinkCost);
+							if(skeleton.owners[spacecraft2.id]!==federate) {
+								this.addTerm(c_cash, L_c[0][i][j][k][l], this.crosslinkCost);
 							}
 						}, this);
 					}, this);
@@ -751,11 +717,27 @@ define('dynamicFixedCostFederationOperations', function(require) {
 			_.each(C, function(c) {
 				lp.addConstraint(c.row, c.constraint, c.constant, c.name);
 			}, this);
+			// columns are only collected for the profiler and the solution cache
+			var columns = (profiler.enabled || solutionCache.enabled)?
+					this.getColumns([S, E_d, E_c, T_d, T_c, L_d, L_c, R_d, R_c]):undefined;
+			if(profiler.enabled) {
+				this.logProgramSize(federate.id, context.time, columns.length,
+						C.length, numSkippedColumns, numSkippedRows);
+			}
 			
 			// set objective function and solve linear program
 			lp.setObjective(J, false);
 			
-			var result = lp.solve();
+			profiler.stop('ops.build', buildStart);
+			var solveStart = profiler.start();
+			var result = this.solveProgram(lp, columns, solutionCache.enabled?this.getStateKey(
+					federate, context, ['dynamicFixedCost', this.planningHorizon, this.storagePenalty, 
+						this.islPenalty, this.downlinkCost, this.crosslinkCost],
+					allSystems, demands, ownContracts, [federate], maxTime - minTime,
+					this.countColumns([T_d[0], T_c[0]])*this.downlinkCost 
+						+ this.countColumns([L_d[0], L_c[0]])*this.crosslinkCost):undefined);
+			var solution = result.solution;
+			profiler.stop('ops.solve', solveStart);
 			
 			if(result.code>1) {
 				logger.error(result.description);
@@ -763,6 +745,8 @@ define('dynamicFixedCostFederationOperations', function(require) {
 				logger.info('lp_solve dump written to file lp_debug.txt');
 				// process.exit(1);
 			} else {
+				var applyStart = profiler.start();
+				
 				// recursive function to transport data from contracts
 				var transportContract = function(operations, spacecraft, contract, context) {
 					var federate1 = operations.getSystemOwner(spacecraft, federation);
@@ -773,20 +757,20 @@ define('dynamicFixedCostFederationOperations', function(require) {
 					var j = _.indexOf(ownContracts, contract);
 					if((data = federate1.getData(contract)) !== undefined) {
                         var isl_i = _.indexOf(allSpacecraftsISL, spacecraft);
-						if(lp.get(R_c[0][R_i][j]) > 0) {
+						if(solution.get(R_c[0][R_i][j]) > 0) {
 							// don't default in federation operations
 							// federate2.defaultContract(contract, context);
-						} else if(E_i >= 0 && lp.get(E_c[0][E_i][j]) > 0) {
+						} else if(E_i >= 0 && solution.get(E_c[0][E_i][j]) > 0) {
                             spacecraft.store(data);
                         } else if(_.some(_.range(0,allStations.length), function(k) {
                             return _.some(_.range(0,SGLprotocols.length), function(l) {
-                                return lp.get(T_c[0][i][k][l][j]) > 0;
+                                return operations.getValue(solution, T_c[0][i][k][l][j]) > 0;
                             });
                         })) {
 							_.each(allStations, function(station, k) {
 								var federate3 = operations.getSystemOwner(station, federation);
 								_.each(SGLprotocols, function(protocol, l) {
-                                    if(lp.get(T_c[0][i][k][l][j]) > 0) {
+                                    if(operations.getValue(solution, T_c[0][i][k][l][j]) > 0) {
 										federate1.transport(data, protocol, 
 												spacecraft, station, context);
 										federate2.resolveContract(contract, context);
@@ -800,13 +784,13 @@ define('dynamicFixedCostFederationOperations', function(require) {
 							}, this);
                         } else if(isl_i >= 0 && _.some(_.range(0,allSpacecraftsISL.length), function(k) {
                             return _.some(_.range(0,ISLprotocols.length), function(l) {
-                                return lp.get(L_c[0][isl_i][k][l][j]) > 0;
+                                return operations.getValue(solution, L_c[0][isl_i][k][l][j]) > 0;
                             });
                         })) {
                             _.each(allSpacecraftsISL, function(spacecraft2, k) {
                                 var federate3 = operations.getSystemOwner(spacecraft2, federation);
                                 _.each(ISLprotocols, function(protocol, l) {
-                                    if(lp.get(L_c[0][isl_i][k][l][j]) > 0) {
+                                    if(operations.getValue(solution, L_c[0][isl_i][k][l][j]) > 0) {
                                         federate1.transport(data, protocol, 
                                                 spacecraft, spacecraft2, context);
                                         if(federate2 !== federate3) {
@@ -833,20 +817,20 @@ define('dynamicFixedCostFederationOperations', function(require) {
 					if((contract = federate2.getContract(demand)) !== undefined
 							&& (data = federate1.getData(contract)) !== undefined) {
                         var isl_i = _.indexOf(allSpacecraftsISL, spacecraft);
-						if(lp.get(R_d[0][R_i][j]) > 0) {
+						if(solution.get(R_d[0][R_i][j]) > 0) {
 							// don't default 
 							// federate2.defaultContract(contract, context);
-						} else if(E_i >= 0 && lp.get(E_d[0][E_i][j]) > 0) {
+						} else if(E_i >= 0 && solution.get(E_d[0][E_i][j]) > 0) {
                             spacecraft.store(data);
                         } else if(_.some(_.range(0,allStations.length), function(k) {
                             return _.some(_.range(0,SGLprotocols.length), function(l) {
-                                return lp.get(T_d[0][i][k][l][j]) > 0;
+                                return operations.getValue(solution, T_d[0][i][k][l][j]) > 0;
                             });
                         })) {
 							_.each(allStations, function(station, k) {
 								var federate3 = operations.getSystemOwner(station, federation);
 								_.each(SGLprotocols, function(protocol, l) {
-									if(lp.get(T_d[0][i][k][l][j]) > 0) {
+									if(operations.getValue(solution, T_d[0][i][k][l][j]) > 0) {
 										federate1.transport(data, protocol, 
 												spacecraft, station, context);
 										federate2.resolveContract(contract, context);
@@ -860,13 +844,13 @@ define('dynamicFixedCostFederationOperations', function(require) {
 							}, this);
                         } else if(isl_i >= 0 && _.some(_.range(0,allSpacecraftsISL.length), function(k) {
                             return _.some(_.range(0,ISLprotocols.length), function(l) {
-                                return lp.get(L_d[0][isl_i][k][l][j]) > 0;
+                                return operations.getValue(solution, L_d[0][isl_i][k][l][j]) > 0;
                             });
                         })) {
                             _.each(allSpacecraftsISL, function(spacecraft2, k) {
                                 var federate3 = operations.getSystemOwner(spacecraft2, federation);
                                 _.each(ISLprotocols, function(protocol, l) {
-                                    if(lp.get(L_d[0][isl_i][k][l][j]) > 0) {
+                                    if(operations.getValue(solution, L_d[0][isl_i][k][l][j]) > 0) {
                                         federate1.transport(data, protocol, 
                                                 spacecraft, spacecraft2, context);
                                         if(federate2 !== federate3) {
@@ -885,7 +869,7 @@ define('dynamicFixedCostFederationOperations', function(require) {
 				// first, transport contracts to resolution
 				_.each(ownContracts, function(contract, j) {
 					if(_.some(_.range(0,allSystems.length,1), function(i) {
-						return lp.get(R_c[0][i][j]) > 0;
+						return solution.get(R_c[0][i][j]) > 0;
 					}, this)) {
                         logger.debug('Transporting contract ' + contract.demand.id + ' for resolution...')
                         var spacecraft = context.getSystemDataContainer(contract);
@@ -896,11 +880,11 @@ define('dynamicFixedCostFederationOperations', function(require) {
 				// second, sense and transport demands to resolution
 				_.each(demands, function(demand, j) {
 					if(_.some(_.range(0,allSystems.length,1), function(i) {
-						return lp.get(R_d[0][i][j]) > 0;
+						return solution.get(R_d[0][i][j]) > 0;
 					}, this)) {
                         logger.debug('Sensing and transporting demand ' + demand.id + ' for resolution...')
                         var spacecraft = _.reduce(ownSpacecrafts, function(memo, spacecraft, i) {
-                            return (lp.get(S[i][j]) > 0)?spacecraft:memo;
+                            return (solution.get(S[i][j]) > 0)?spacecraft:memo;
                         }, undefined, this);
                         var contract = federate.contract(demand, context);
                         federate.sense(contract, spacecraft, context);
@@ -911,13 +895,13 @@ define('dynamicFixedCostFederationOperations', function(require) {
 				// third, sense all demands to be stored
 				_.each(demands, function(demand, j) {
 					if(_.every(_.range(0,allSystems.length,1), function(i) {
-						return lp.get(R_d[0][i][j]) < 1;
+						return solution.get(R_d[0][i][j]) < 1;
 					}, this) && _.some(_.range(0,ownSpacecrafts.length,1), function(i) {
-                        return lp.get(S[i][j]) > 0;
+                        return solution.get(S[i][j]) > 0;
                     }, this)) {
                         logger.debug('Sensing demand ' + demand.id + ' for storage...')
                         var spacecraft = _.reduce(ownSpacecrafts, function(memo, spacecraft, i) {
-                            return (lp.get(S[i][j]) > 0)?spacecraft:memo;
+                            return (solution.get(S[i][j]) > 0)?spacecraft:memo;
                         }, undefined, this);
                         var contract = federate.contract(demand, context);
                         federate.sense(contract, spacecraft, context);
@@ -927,13 +911,13 @@ define('dynamicFixedCostFederationOperations', function(require) {
 				// fourth, transport demands to storage
 				_.each(demands, function(demand, j) {
 					if(_.every(_.range(0,allSystems.length,1), function(i) {
-						return lp.get(R_d[0][i][j]) < 1;
+						return solution.get(R_d[0][i][j]) < 1;
 					}, this) && _.some(_.range(0,ownSpacecrafts.length,1), function(i) {
-                        return lp.get(S[i][j]) > 0;
+                        return solution.get(S[i][j]) > 0;
                     }, this)) {
                         logger.debug('Transporting demand ' + demand.id + ' for storage...')
                         var spacecraft = _.reduce(ownSpacecrafts, function(memo, spacecraft, i) {
-                            return (lp.get(S[i][j]) > 0)?spacecraft:memo;
+                            return (solution.get(S[i][j]) > 0)?spacecraft:memo;
                         }, undefined, this);
                         transportDemand(this, spacecraft, demand, context);
 					}
@@ -942,13 +926,14 @@ define('dynamicFixedCostFederationOperations', function(require) {
 				// finally, transport contracts to storage
 				_.each(ownContracts, function(contract, j) {
 					if(_.every(_.range(0,allSystems.length,1), function(i) {
-						return lp.get(R_c[0][i][j]) < 1;
+						return solution.get(R_c[0][i][j]) < 1;
 					}, this)) {
                         logger.debug('Transporting contract ' + contract.demand.id + ' for storage...')
                         var spacecraft = context.getSystemDataContainer(contract);
                         transportContract(this, spacecraft, contract, context);
 					}
 				}, this);
+				profiler.stop('ops.apply', applyStart);
 			}
 		}, this);
     };
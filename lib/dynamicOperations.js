@@ -27,13 +27,16 @@ define('dynamicOperations', function(require) {
     var Operations = require("operations");
     var lpsolve = require("lp_solve");
     var logger = require("logger");
+    var profiler = require("profiler");
+    var solutionCache = require("solutionCache");
     var fs = require("fs");
-    var math = require("mathjs");
     
     function DynamicOperations() {
 		this.planningHorizon = 6;
 		this.storagePenalty = -10;
 		this.islPenalty = -10;
+		this.links = {}; // links[time][key]: link topology at time (see getTopology)
+		this.linkStats = {reused: 0, added: 0}; // link topologies in the current turn
         // initialize superclass (assigns above attributes with arguments)
         Operations.apply(this, arguments);
     };
@@ -102,37 +105,60 @@ define('dynamicOperations', function(require) {
      * @returns {Number} The storage penalty.
      */
 	DynamicOperations.prototype.getStoragePenalty = function(demand, spacecraft, context) {
-		// compute expected net value of all possible other demands (compared to existing demand)
-		// memoizes results: 	assumes context events does not change during simulation
-		// 						and spacecraft do not change sensing capabilities
-		// 						and demand types have consistent revenue schedules
-		
-		return _.memoize(function(demand, spacecraft) {
-				var events =  _.filter(context.events, function(event) {
-					return event.isDemand() && spacecraft.couldSense(event.phenomena, event.size);
-				});
-				var numSC = 1;
-				var values = _.union([0], _.map(events, function(event) {
-					return event.getValueAt(0);
-				})).sort();
-				var counts = _.map(values, function(value) {
-					return _.size(_.filter(events, function(event) {
-						return event.getValueAt(0)===value;
-					}));
-				});
-				counts[0] = _.size(_.difference(context.events, events));
-				var expValMax =  _.reduce(values, function(memo, value, i) {
-							return memo + values[i]*(math.pow(_.reduce(counts.slice(0,i+1), function(memo,count){return memo + count;},0), numSC)
-									- math.pow(_.reduce(counts.slice(0,i), function(memo,count){return memo + count;},0), numSC));
-						}, 0)/math.pow(_.reduce(counts, function(memo,count){return memo + count;},0),numSC);
-				//console.log('exp val max for ' + spacecraft.id + " with " + numSC + " SC " + ': ' + expValMax);
-				//return Math.min(0, demand.getValueAt(elapsedTime+1) - expValMax);
-				return -1*expValMax;
-		}, function(demand, spacecraft) {
-			return demand.type + spacecraft.id;
-		})(demand, spacecraft);
+		// look up expected net value of all possible other demands (compared to existing demand)
+		// from the table shared by all operations models in this context
+		return context.getStoragePenalty(demand, spacecraft);
 	};
 				
+    /**
+     * Retires the link topologies of times before the planning horizon.
+     * Topologies of later times are kept for the next turns, as the
+     * location of a system at a time does not depend on the turn from
+     * which it is propagated.
+     * @param {Number} minTime - The first time in the planning horizon.
+     * @param {object} context - The context.
+     */
+	DynamicOperations.prototype.updateLinks = function(minTime, context) {
+		if(this.linksContext !== context) {
+			this.links = {};
+			this.linksContext = context;
+		}
+		_.each(_.keys(this.links), function(time) {
+			if(parseInt(time, 10) < minTime) {
+				delete this.links[time];
+			}
+		}, this);
+		this.linkStats = {reused: 0, added: 0};
+	};
+	
+    /**
+     * Gets a function which checks if a system could transmit data of a
+     * given size to another system at a time in the planning horizon (see
+     * `getLinkCheck`). The link topology is reused from earlier turns for
+     * times shared by their planning horizons.
+     * @param {object} origin - The transmitting system.
+     * @param {object} destination - The receiving system.
+     * @param {String} protocol - The protocol.
+     * @param {object} origLoc - The origin location at time.
+     * @param {object} destLoc - The destination location at time.
+     * @param {Number} time - The time.
+     * @param {object} context - The context.
+     * @returns {function} The function of data size returning true if data could be transmitted.
+     */
+	DynamicOperations.prototype.getHorizonLinkCheck = function(origin, destination, protocol, origLoc, destLoc, time, context) {
+		if(!_.has(this.links, time)) {
+			this.links[time] = {};
+		}
+		var key = origin.id + '|' + destination.id + '|' + protocol;
+		if(_.has(this.links[time], key)) {
+			this.linkStats.reused++;
+		} else {
+			this.linkStats.added++;
+		}
+		return this.getLinkCheck(origin, destination, protocol, origLoc, destLoc, context, 
+				this.getTopology(this.links[time], key, origin, destination, protocol, origLoc, destLoc, context));
+	};
+	
     /**
      * Operates this model.
      * @param {object} controller - The controller.
@@ -141,7 +167,11 @@ define('dynamicOperations', function(require) {
     DynamicOperations.prototype.operate = function(controller, context) {
         var minTime = context.time;
         var maxTime = Math.min(context.maxTime, context.time + this.planningHorizon);
+		this.updateLinks(minTime, context);
 		
+        // the model is rebuilt every turn: the lp_solve wrapper cannot update
+        // a model in place or warm start from a previous basis
+        var buildStart = profiler.start();
         var lp = new lpsolve.LinearProgram();
         lp.setOutputFile('');
         
@@ -159,6 +189,10 @@ define('dynamicOperations', function(require) {
        
         var J = new lpsolve.Row(); // objective function
         
+        // link columns are only created where a link is feasible
+        var numSkippedColumns = 0;
+        var numSkippedRows = 0;
+        
         var demands = _.filter(context.currentEvents, function(event) {
             return event.isDemand();
         });
@@ -313,32 +347,39 @@ define('dynamicOperations', function(require) {
                         T_c[t][i][j][k] = [];
                         var c_vis = new lpsolve.Row();
                         var maxSize = 0;
+                        var couldLink = this.getHorizonLinkCheck(spacecraft, station, protocol, origLoc, destLoc, time, context);
                         _.each(demands, function(demand, l) {
+                            if(!couldLink(demand.size)) {
+                                numSkippedColumns++;
+                                return;
+                            }
                             // transmit from spacecraft i to ground station j using protocol k data for demand l
                             T_d[t][i][j][k][l] = lp.addColumn(spacecraft.id + "-" + station.id + '-T' + '(' + protocol + ')-' + demand.id+"@"+time, true);
                             c_vis.Add(T_d[t][i][j][k][l], demand.size);
-                            maxSize = Math.max(maxSize, (spacecraft.couldTransmit(protocol, 
-                                    origLoc, destLoc, demand.size, station, context) 
-                                && station.couldReceive(protocol, origLoc, destLoc, 
-                                    spacecraft, demand.size, context))?demand.size:0);
+                            maxSize = Math.max(maxSize, demand.size);
                         }, this);
                         _.each(contracts, function(contract, l) {
+                            if(!couldLink(contract.demand.size)) {
+                                numSkippedColumns++;
+                                return;
+                            }
                             // transmit from spacecraft i to ground station j using protocol k data for contract l
                             T_c[t][i][j][k][l] = lp.addColumn(spacecraft.id + '-' + station.id + '-T' + '(' + protocol + ')-' + contract.demand.id+"@"+time, true);
                             c_vis.Add(T_c[t][i][j][k][l], contract.demand.size);
-                            maxSize = Math.max(maxSize, (spacecraft.couldTransmit(protocol, 
-                                    origLoc, destLoc, contract.demand.size, station, context) 
-                                && station.couldReceive(protocol, origLoc, destLoc, 
-                                    spacecraft, contract.demand.size, context))?contract.demand.size:0);
+                            maxSize = Math.max(maxSize, contract.demand.size);
                         }, this);
                             
-                        // constrain transmission by visibility
-                        C.push({
-                            row: c_vis, 
-                            constraint: 'LE', 
-                            constant: maxSize,
-                            name: spacecraft.id + '-' + station.id + ' ' + protocol + ' visibility at ' + time
-                        });
+                        if(maxSize > 0) {
+                            // constrain transmission by visibility
+                            C.push({
+                                row: c_vis, 
+                                constraint: 'LE', 
+                                constant: maxSize,
+                                name: spacecraft.id + '-' + station.id + ' ' + protocol + ' visibility at ' + time
+                            });
+                        } else {
+                            numSkippedRows++;
+                        }
                     }, this);
                 }, this);
             }, this);
@@ -348,10 +389,10 @@ define('dynamicOperations', function(require) {
                     c_tx = new lpsolve.Row();
                     _.each(stations, function(station, j) {
                         _.each(demands, function(demand, l) {
-                            c_tx.Add(T_d[t][i][j][k][l], demand.size);
+                            this.addTerm(c_tx, T_d[t][i][j][k][l], demand.size);
                         }, this);
                         _.each(contracts, function(contract, l) {
-                            c_tx.Add(T_c[t][i][j][k][l], contract.demand.size);
+                            this.addTerm(c_tx, T_c[t][i][j][k][l], contract.demand.size);
                         }, this);
                     }, this);
                     // constrain maximum data transmitted from spacecraft i
@@ -369,10 +410,10 @@ define('dynamicOperations', function(require) {
                     var c_rx = new lpsolve.Row();
                     _.each(spacecrafts, function(spacecraft, i) {
                         _.each(demands, function(demand, l) {
-                            c_rx.Add(T_d[t][i][j][k][l], demand.size);
+                            this.addTerm(c_rx, T_d[t][i][j][k][l], demand.size);
                         }, this);
                         _.each(contracts, function(contract, l) {
-                            c_rx.Add(T_c[t][i][j][k][l], contract.demand.size);
+                            this.addTerm(c_rx, T_c[t][i][j][k][l], contract.demand.size);
                         }, this);
                     }, this);
                     // constrain maximum data received by ground station j
@@ -400,38 +441,43 @@ define('dynamicOperations', function(require) {
                         L_c[t][i][j][k] = [];
                         var c_vis = new lpsolve.Row();
                         var maxSize = 0;
+                        var couldLink = this.getHorizonLinkCheck(spacecraft, spacecraft2, protocol, origLoc, destLoc, time, context);
                         _.each(demands, function(demand, l) {
+                            if(!couldLink(demand.size)) {
+                                numSkippedColumns++;
+                                return;
+                            }
                             // transmit from spacecraft i to spacecraft j using protocol k data for demand l
                             L_d[t][i][j][k][l] = lp.addColumn(spacecraft.id + "-" + spacecraft2.id + '-T' + '(' + protocol + ')-' + demand.id+"@"+time, true);
                             // small penalty to discourage cycles
                             J.Add(L_d[t][i][j][k][l], this.islPenalty);
                             c_vis.Add(L_d[t][i][j][k][l], demand.size)
-                            maxSize = Math.max(maxSize, (spacecraft.couldTransmit(protocol, 
-                                    origLoc, destLoc, demand.size, spacecraft2, context) 
-                                && spacecraft2.couldReceive(protocol, 
-                                    origLoc, destLoc, spacecraft, demand.size, context)
-                                && spacecraft !== spacecraft2)?demand.size:0);
+                            maxSize = Math.max(maxSize, demand.size);
                         }, this);
                         _.each(contracts, function(contract, l) {
+                            if(!couldLink(contract.demand.size)) {
+                                numSkippedColumns++;
+                                return;
+                            }
                             // transmit from spacecraft i to spacecraft j using protocol k data for contract l
                             L_c[t][i][j][k][l] = lp.addColumn(spacecraft.id + '-' + spacecraft2.id + '-T' + '(' + protocol + ')-' + contract.demand.id+"@"+time, true);
                             // small penalty to discourage cycles
                             J.Add(L_c[t][i][j][k][l], this.islPenalty);
                             c_vis.Add(L_c[t][i][j][k][l], contract.demand.size)
-                            maxSize = Math.max(maxSize, (spacecraft.couldTransmit(protocol, 
-                                    origLoc, destLoc, contract.demand.size, spacecraft2, context) 
-                                && spacecraft2.couldReceive(protocol, 
-                                    origLoc, destLoc, spacecraft, contract.demand.size, context)
-                                && spacecraft !== spacecraft2)?contract.demand.size:0);
+                            maxSize = Math.max(maxSize, contract.demand.size);
                         }, this);
                         
-                        // constrain transmission by visibility
-                        C.push({
-                            row: c_vis, 
-                            constraint: 'LE', 
-                            constant: maxSize,
-                            name: spacecraft.id + '-' + spacecraft2.id + ' ' + protocol + ' visibility at ' + time
-                        });
+                        if(maxSize > 0) {
+                            // constrain transmission by visibility
+                            C.push({
+                                row: c_vis, 
+                                constraint: 'LE', 
+                                constant: maxSize,
+                                name: spacecraft.id + '-' + spacecraft2.id + ' ' + protocol + ' visibility at ' + time
+                            });
+                        } else {
+                            numSkippedRows++;
+                        }
                     }, this);
                 }, this);
             }, this);
@@ -441,10 +487,10 @@ define('dynamicOperations', function(require) {
                     c_tx = new lpsolve.Row();
                     _.each(spacecraftsISL, function(spacecraft2, j) {
                         _.each(demands, function(demand, l) {
-                            c_tx.Add(L_d[t][i][j][k][l], demand.size);
+                            this.addTerm(c_tx, L_d[t][i][j][k][l], demand.size);
                         }, this);
                         _.each(contracts, function(contract, l) {
-                            c_tx.Add(L_c[t][i][j][k][l], contract.demand.size);
+                            this.addTerm(c_tx, L_c[t][i][j][k][l], contract.demand.size);
                         }, this);
                     }, this);
                     // constrain maximum data transmitted from spacecraft i
@@ -462,10 +508,10 @@ define('dynamicOperations', function(require) {
                     var c_rx = new lpsolve.Row();
                     _.each(spacecraftsISL, function(spacecraft, i) {
                         _.each(demands, function(demand, l) {
-                            c_rx.Add(L_d[t][i][j][k][l], demand.size);
+                            this.addTerm(c_rx, L_d[t][i][j][k][l], demand.size);
                         }, this);
                         _.each(contracts, function(contract, l) {
-                            c_rx.Add(L_c[t][i][j][k][l], contract.demand.size);
+                            this.addTerm(c_rx, L_c[t][i][j][k][l], contract.demand.size);
                         }, this);
                     }, this);
                     // constrain maximum data received by spacecraft j
@@ -524,14 +570,14 @@ define('dynamicOperations', function(require) {
 					c_nf.Add(R_d[t][R_i][j],-1);
                     _.each(stations, function(station, k) {
                        _.each(SGLprotocols, function(protocol, l) {
-                            c_nf.Add(T_d[t][i][k][l][j],-1);
+                            this.addTerm(c_nf, T_d[t][i][k][l][j], -1);
                        }, this);
                     }, this);
 					if((isl_i = _.indexOf(spacecraftsISL, spacecraft)) >= 0) {
 						_.each(spacecraftsISL, function(spacecraft2, k) {
 						   _.each(ISLprotocols, function(protocol, l) {
-								c_nf.Add(L_d[t][isl_i][k][l][j],-1);
-								c_nf.Add(L_d[t][k][isl_i][l][j],1);
+								this.addTerm(c_nf, L_d[t][isl_i][k][l][j], -1);
+								this.addTerm(c_nf, L_d[t][k][isl_i][l][j], 1);
 						   }, this);
 						}, this);
 					}
@@ -554,14 +600,14 @@ define('dynamicOperations', function(require) {
                     c_nf.Add(R_c[t][R_i][j],-1);
                     _.each(stations, function(station, k) {
                        _.each(SGLprotocols, function(protocol, l) {
-                            c_nf.Add(T_c[t][i][k][l][j],-1);
+                            this.addTerm(c_nf, T_c[t][i][k][l][j], -1);
                        }, this);
                     }, this);
 					if((isl_i = _.indexOf(spacecraftsISL, spacecraft)) >= 0) {
 						_.each(spacecraftsISL, function(spacecraft2, k) {
 						   _.each(ISLprotocols, function(protocol, l) {
-								c_nf.Add(L_c[t][isl_i][k][l][j],-1);
-								c_nf.Add(L_c[t][k][isl_i][l][j],1);
+								this.addTerm(c_nf, L_c[t][isl_i][k][l][j], -1);
+								this.addTerm(c_nf, L_c[t][k][isl_i][l][j], 1);
 						   }, this);
 						}, this);
 					}
@@ -601,7 +647,7 @@ define('dynamicOperations', function(require) {
                     c_nf.Add(R_d[t][R_k][j],-1);
                     _.each(spacecrafts, function(spacecraft, i) {
                         _.each(SGLprotocols, function(protocol, l) {
-                            c_nf.Add(T_d[t][i][k][l][j],1);
+                            this.addTerm(c_nf, T_d[t][i][k][l][j], 1);
                         }, this);
                     }, this);
                     // constrain net flow at each station
@@ -617,7 +663,7 @@ define('dynamicOperations', function(require) {
                     c_nf.Add(R_c[t][R_k][j],-1);
                     _.each(spacecrafts, function(spacecraft, i) {
                        _.each(SGLprotocols, function(protocol, l) {
-                            c_nf.Add(T_c[t][i][k][l][j],1);
+                            this.addTerm(c_nf, T_c[t][i][k][l][j], 1);
                        }, this);
                     }, this);
                     // constrain net flow at each station
@@ -663,11 +709,26 @@ define('dynamicOperations', function(require) {
         _.each(C, function(c) {
             lp.addConstraint(c.row, c.constraint, c.constant, c.name);
         }, this);
+        // columns are only collected for the profiler and the solution cache
+        var columns = (profiler.enabled || solutionCache.enabled)?
+                this.getColumns([S, E_d, E_c, T_d, T_c, L_d, L_c, R_d, R_c]):undefined;
+        if(profiler.enabled) {
+            this.logProgramSize(controller.id, context.time, columns.length,
+                    C.length, numSkippedColumns, numSkippedRows);
+        }
+        logger.verbose('Link topologies for ' + controller.id + ' at ' + context.time + ': ' 
+                + this.linkStats.reused + ' reused, ' + this.linkStats.added + ' added');
         
         // set objective function and solve linear program
         lp.setObjective(J, false);
         
-		var result = lp.solve();
+		profiler.stop('ops.build', buildStart);
+		var solveStart = profiler.start();
+		var result = this.solveProgram(lp, columns, solutionCache.enabled?this.getStateKey(
+				controller, context, ['dynamic', this.planningHorizon, this.storagePenalty, this.islPenalty],
+				systems, demands, contracts, federates, maxTime - minTime, 0):undefined);
+		var solution = result.solution;
+		profiler.stop('ops.solve', solveStart);
         
 		if(result.code>1) {
 			logger.error(result.description);
@@ -675,6 +736,8 @@ define('dynamicOperations', function(require) {
 			logger.info('lp_solve dump written to file lp_debug.txt');
 			// process.exit(1);
 		} else {
+			var applyStart = profiler.start();
+			
 			// recursive function to transport data from contracts
 			var transportContract = function(operations, spacecraft, contract, context) {
 				var federate1 = operations.getSystemOwner(spacecraft, controller);
@@ -684,18 +747,18 @@ define('dynamicOperations', function(require) {
 				var j = _.indexOf(contracts, contract);
 				if((data = federate1.getData(contract)) !== undefined) {
                     var isl_i = _.indexOf(spacecraftsISL, spacecraft);
-					if(lp.get(R_c[0][R_i][j]) > 0) {
+					if(solution.get(R_c[0][R_i][j]) > 0) {
 						federate2.defaultContract(contract, context);
-					} else if(lp.get(E_c[0][i][j]) > 0) {
+					} else if(solution.get(E_c[0][i][j]) > 0) {
                         spacecraft.store(data);
                     } else if(_.some(_.range(0,stations.length), function(k) {
                         return _.some(_.range(0,SGLprotocols.length), function(l) {
-                            return lp.get(T_c[0][i][k][l][j]) > 0;
+                            return operations.getValue(solution, T_c[0][i][k][l][j]) > 0;
                         });
                     })) {
                         _.each(stations, function(station, k) {
                             _.each(SGLprotocols, function(protocol, l) {
-                                if(lp.get(T_c[0][i][k][l][j]) > 0) {
+                                if(operations.getValue(solution, T_c[0][i][k][l][j]) > 0) {
                                     federate1.transport(data, protocol, 
                                             spacecraft, station, context);
                                     federate2.resolveContract(contract, context);
@@ -704,12 +767,12 @@ define('dynamicOperations', function(require) {
                         }, this);
                     } else if(isl_i >= 0 && _.some(_.range(0,spacecraftsISL.length), function(k) {
                         return _.some(_.range(0,ISLprotocols.length), function(l) {
-                            return lp.get(L_c[0][isl_i][k][l][j]) > 0;
+                            return operations.getValue(solution, L_c[0][isl_i][k][l][j]) > 0;
                         });
                     })) {
                         _.each(spacecraftsISL, function(spacecraft2, k) {
                             _.each(ISLprotocols, function(protocol, l) {
-                                if(lp.get(L_c[0][isl_i][k][l][j]) > 0) {
+                                if(operations.getValue(solution, L_c[0][isl_i][k][l][j]) > 0) {
                                     federate1.transport(data, protocol, 
                                             spacecraft, spacecraft2, context);
                                     transportContract(operations, spacecraft2, 
@@ -731,18 +794,18 @@ define('dynamicOperations', function(require) {
 				if((contract = federate2.getContract(demand)) !== undefined
 						&& (data = federate1.getData(contract)) !== undefined) {
                     var isl_i = _.indexOf(spacecraftsISL, spacecraft);
-					if(lp.get(R_d[0][R_i][j]) > 0) {
+					if(solution.get(R_d[0][R_i][j]) > 0) {
 						federate2.defaultContract(contract, context);
-					} else if(lp.get(E_d[0][i][j]) > 0) {
+					} else if(solution.get(E_d[0][i][j]) > 0) {
                         spacecraft.store(data);
                     } else if(_.some(_.range(0,stations.length), function(k) {
                         return _.some(_.range(0,SGLprotocols.length), function(l) {
-                            return lp.get(T_d[0][i][k][l][j]) > 0;
+                            return operations.getValue(solution, T_d[0][i][k][l][j]) > 0;
                         });
                     })) {
 						_.each(stations, function(station, k) {
 							_.each(SGLprotocols, function(protocol, l) {
-								if(lp.get(T_d[0][i][k][l][j]) > 0) {
+								if(operations.getValue(solution, T_d[0][i][k][l][j]) > 0) {
 									federate1.transport(data, protocol, 
 											spacecraft, station, context);
 									federate2.resolveContract(contract, context);
@@ -751,12 +814,12 @@ define('dynamicOperations', function(require) {
 						}, this);
                     } else if(isl_i >= 0 && _.some(_.range(0,spacecraftsISL.length), function(k) {
                         return _.some(_.range(0,ISLprotocols.length), function(l) {
-                            return lp.get(L_d[0][isl_i][k][l][j]) > 0;
+                            return operations.getValue(solution, L_d[0][isl_i][k][l][j]) > 0;
                         });
                     })) {
                         _.each(spacecraftsISL, function(spacecraft2, k) {
                             _.each(ISLprotocols, function(protocol, l) {
-                                if(lp.get(L_d[0][isl_i][k][l][j]) > 0) {
+                                if(operations.getValue(solution, L_d[0][isl_i][k][l][j]) > 0) {
                                     federate1.transport(data, protocol, 
                                             spacecraft, spacecraft2, context);
                                     transportDemand(operations, spacecraft2,
@@ -771,7 +834,7 @@ define('dynamicOperations', function(require) {
 			// first, transport contracts to resolution
 			_.each(contracts, function(contract, j) {
 				if(_.some(_.range(0,systems.length,1), function(i) {
-					return lp.get(R_c[0][i][j]) > 0;
+					return solution.get(R_c[0][i][j]) > 0;
 				}, this)) {
                     logger.debug('Transporting contract ' + contract.demand.id + ' for resolution...')
                     var spacecraft = context.getSystemDataContainer(contract);
@@ -782,11 +845,11 @@ define('dynamicOperations', function(require) {
 			// second, sense and transport demands to resolution
 			_.each(demands, function(demand, j) {
 				if(_.some(_.range(0,systems.length,1), function(i) {
-					return lp.get(R_d[0][i][j]) > 0;
+					return solution.get(R_d[0][i][j]) > 0;
 				}, this)) {
                     logger.debug('Sensing and transporting demand ' + demand.id + ' for resolution...')
                     var spacecraft = _.reduce(spacecrafts, function(memo, spacecraft, i) {
-                        return (lp.get(S[i][j]) > 0)?spacecraft:memo;
+                        return (solution.get(S[i][j]) > 0)?spacecraft:memo;
                     }, undefined, this);
                     var federate = this.getSystemOwner(spacecraft, controller);
                     var contract = federate.contract(demand, context);
@@ -798,13 +861,13 @@ define('dynamicOperations', function(require) {
 			// third, sense all demands to be stored
 			_.each(demands, function(demand, j) {
 				if(_.every(_.range(0,systems.length,1), function(i) {
-					return lp.get(R_d[0][i][j]) < 1;
+					return solution.get(R_d[0][i][j]) < 1;
 				}, this) && _.some(_.range(0,spacecrafts.length,1), function(i) {
-                    return lp.get(S[i][j]) > 0;
+                    return solution.get(S[i][j]) > 0;
                 }, this)) {
                     logger.debug('Sensing demand ' + demand.id + ' for storage...')
                     var spacecraft = _.reduce(spacecrafts, function(memo, spacecraft, i) {
-                        return (lp.get(S[i][j]) > 0)?spacecraft:memo;
+                        return (solution.get(S[i][j]) > 0)?spacecraft:memo;
                     }, undefined, this);
                     var federate = this.getSystemOwner(spacecraft, controller);
                     var contract = federate.contract(demand, context);
@@ -815,13 +878,13 @@ define('dynamicOperations', function(require) {
 			// fourth, transport demands to storage
 			_.each(demands, function(demand, j) {
 				if(_.every(_.range(0,systems.length,1), function(i) {
-					return lp.get(R_d[0][i][j]) < 1;
+					return solution.get(R_d[0][i][j]) < 1;
 				}, this) && _.some(_.range(0,spacecrafts.length,1), function(i) {
-                    return lp.get(S[i][j]) > 0;
+                    return solution.get(S[i][j]) > 0;
                 }, this)) {
                     logger.debug('Transporting demand ' + demand.id + ' for storage...')
                     var spacecraft = _.reduce(spacecrafts, function(memo, spacecraft, i) {
-                        return (lp.get(S[i][j]) > 0)?spacecraft:memo;
+                        return (solution.get(S[i][j]) > 0)?spacecraft:memo;
                     }, undefined, this);
                     transportDemand(this, spacecraft, demand, context);
 				}
@@ -830,13 +893,14 @@ define('dynamicOperations', function(require) {
 			// finally, transport contracts to storage
 			_.each(contracts, function(contract, j) {
 				if(_.every(_.range(0,systems.length,1), function(i) {
-					return lp.get(R_c[0][i][j]) < 1;
+					return solution.get(R_c[0][i][j]) < 1;
 				}, this)) {
                     logger.debug('Transporting contract ' + contract.demand.id + ' for storage...')
                     var spacecraft = context.getSystemDataContainer(contract);
                     transportContract(this, spacecraft, contract, context);
 				}
 			}, this);
+			profiler.stop('ops.apply', applyStart);
 		}
     };
     
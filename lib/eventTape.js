@@ -0,0 +1,173 @@
+/*
+ * Copyright 2015 Paul T. Grogan
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+if (typeof define !== 'function') {
+    var define = require('amdefine')(module);
+}
+
+/**
+ * A module to replay the same sequence of events for a seed in every
+ * game (common random numbers across designs). Without a tape, contracted
+ * demands are held out of the deck until resolved, so the sequence after
+ * the first reshuffle depends on the design. A tape is the sequence of
+ * event indices (into `Context.events`) dealt by the same shuffles if no
+ * demand were contracted, stored as an Int16Array. Contexts deal a copy
+ * of the event for each entry instead of drawing from the deck. Tapes are
+ * generated once per seed and event types (keyed by a hash, see
+ * `demandValues.hash`) and optionally saved to and loaded from a
+ * directory. The tape is off until `enable` is called.
+ * @module eventTape
+ */
+define('eventTape', function(require) {
+    var _ = require("underscore");
+    var fs = require("fs");
+    var path = require("path");
+    var Random = require("random-js");
+    var logger = require("logger");
+
+    var eventTape = {
+        enabled: false,
+        directory: undefined, // cache directory (undefined to disable)
+        tapes: {}, // tapes[key]: {key, seed, hash, numEvents, numSectors, draws}
+        stats: {hits: 0, loads: 0, builds: 0}
+    };
+
+    /**
+     * Enables the tape.
+     * @param {String} directory - The cache directory (optional, created if needed).
+     */
+    eventTape.enable = function(directory) {
+        if(directory && !fs.existsSync(directory)) {
+            fs.mkdirSync(directory);
+        }
+        this.directory = directory;
+        this.enabled = true;
+    }
+
+    /**
+     * Generates the event indices dealt for a seed with the shuffles of
+     * `Context.init` and `Context.tock` if no demand is contracted.
+     * @param {Number} seed - The seed.
+     * @param {Number} numEvents - The number of events.
+     * @param {Number} numSectors - The number of sectors (draws per turn).
+     * @param {Number} numDraws - The number of draws.
+     * @returns {Int16Array} The event indices.
+     */
+    eventTape.generate = function(seed, numEvents, numSectors, numDraws) {
+        // derive the shuffle stream as in Context.init
+        var masterStream = new Random.engines.mt19937();
+        masterStream.seed(seed);
+        var shuffleStream = new Random.engines.mt19937();
+        shuffleStream.seed(Random.integer(Math.pow(-2,53),Math.pow(2,53))(masterStream));
+
+        var draws = new Int16Array(numDraws);
+        var current = [];
+        var past = [];
+        var future = Random.shuffle(shuffleStream, _.range(numEvents));
+        var sector = 0;
+        for(var i = 0; i < numDraws; i++) {
+            draws[i] = future.pop();
+            current.push(draws[i]);
+            if(future.length===0) {
+                // current events of this turn stay out of the reshuffle
+                past = Random.shuffle(shuffleStream, past);
+                while(past.length > 0) {
+                    future.push(past.pop());
+                }
+            }
+            if(++sector===numSectors) {
+                // next turn: move current events to past
+                while(current.length > 0) {
+                    past.push(current.pop());
+                }
+                sector = 0;
+            }
+        }
+        this.stats.builds++;
+        return draws;
+    }
+
+    /**
+     * Gets the tape for a seed, loading it from the cache directory or
+     * generating (and saving) it if needed.
+     * @param {Number} seed - The seed.
+     * @param {String} hash - The hash of the event types.
+     * @param {Number} numEvents - The number of events.
+     * @param {Number} numSectors - The number of sectors.
+     * @param {Number} numDraws - The minimum number of draws.
+     * @returns {object} The tape.
+     */
+    eventTape.get = function(seed, hash, numEvents, numSectors, numDraws) {
+        var key = hash + '-' + numSectors + '-' + seed;
+        var tape = this.tapes[key];
+        if(tape && tape.draws.length >= numDraws) {
+            this.stats.hits++;
+            return tape;
+        }
+        var filename = this.directory?path.join(this.directory, key + '.i2'):undefined;
+        var draws, buffer, i;
+        if(filename && fs.existsSync(filename) && fs.statSync(filename).size >= 2*numDraws) {
+            buffer = fs.readFileSync(filename);
+            draws = new Int16Array(buffer.length/2);
+            for(i = 0; i < draws.length; i++) {
+                draws[i] = buffer.readInt16LE(2*i);
+            }
+            this.stats.loads++;
+        } else {
+            draws = this.generate(seed, numEvents, numSectors, numDraws);
+            if(filename) {
+                buffer = Buffer.alloc(2*draws.length);
+                for(i = 0; i < draws.length; i++) {
+                    buffer.writeInt16LE(draws[i], 2*i);
+                }
+                fs.writeFileSync(filename, buffer);
+            }
+        }
+        this.tapes[key] = {key: key, seed: seed, hash: hash, numEvents: numEvents,
+                numSectors: numSectors, draws: draws};
+        return this.tapes[key];
+    }
+
+    /**
+     * Deals a copy of the event of a draw. Copies have the identifier of
+     * the event with the draw number appended, so an event dealt again
+     * while contracted is a separate demand.
+     * @param {object} context - The context (with `eventTape` set in `init`).
+     * @param {Number} draw - The draw number.
+     * @returns {object} The event.
+     */
+    eventTape.deal = function(context, draw) {
+        var tape = context.eventTape;
+        if(draw >= tape.draws.length) {
+            logger.warn('Extending event tape for seed ' + tape.seed);
+            tape = context.eventTape = this.get(tape.seed, tape.hash, tape.numEvents,
+                    tape.numSectors, 2*(draw + 1));
+        }
+        var template = context.events[tape.draws[draw]];
+        var event = Object.create(Object.getPrototypeOf(template));
+        for(var n in template) {
+            if(template.hasOwnProperty(n)) {
+                event[n] = template[n];
+            }
+        }
+        if(template.id !== undefined) {
+            event.id = template.id + '#' + draw;
+        }
+        return event;
+    }
+
+    return eventTape;
+});
@@ -26,6 +26,7 @@ define('federate', function(require) {
     var _ = require("underscore");
     var mas = require("mas");
     var logger = require("logger");
+    var profiler = require("profiler");
     var Operations = require("operations");
     var Contract = require("contract");
     
@@ -36,6 +37,9 @@ define('federate', function(require) {
     function Federate() {
         this.cash = 0;
         this.initialCash = 0;
+        this.cashHistory = [];
+        this.numResolved = 0;
+        this.numDefaulted = 0;
         this.systems = [];
         this.contracts = [];
         this.operations = new Operations();
@@ -77,6 +81,7 @@ define('federate', function(require) {
             logger.error('System commission cost exceeds cash.');
         } else if(system.commission(location, context)) {
             this.cash -= system.getCommissionCost(location);
+            context.indexSystem(system);
             logger.info(this.id + " commissioned " + system.getTag() + " for " + system.getCommissionCost(location));
             return true;
         } else {
@@ -96,6 +101,9 @@ define('federate', function(require) {
         if(index > -1) {
             // this.cash += system.getDecommissionValue(context);
             this.systems.splice(index, 1);
+            if(context) {
+                context.unindexSystem(system);
+            }
             logger.info(this.id + " decommissioned " + system.getTag() + " for " + system.getDecommissionValue(context));
             return true;
         } else {
@@ -215,15 +223,19 @@ define('federate', function(require) {
      * @returns {Boolean} True, if this federate defaulted on the contract.
      */
     Federate.prototype.defaultContract = function(contract, context) {
+        var start = profiler.start();
         var index = this.contracts.indexOf(contract);
         if(index > -1) {
             this.cash += contract.demand.defaultValue;
+            this.numDefaulted++;
             this.deleteData(contract, context);
             this.contracts.splice(index, 1);
 			context.pastEvents.push(contract.demand);
             logger.info(this.id + " defaulted on " + contract.demand.id + " contract for " + contract.demand.defaultValue);
+            profiler.stop('contract.default', start);
             return true;
         }
+        profiler.stop('contract.default', start);
         return false;
     };
     
@@ -239,6 +251,7 @@ define('federate', function(require) {
                 data.contract === contract.id;
             });
         }, this);
+        context.unindexData(contract);
     }
     
     /**
@@ -248,15 +261,19 @@ define('federate', function(require) {
      * @returns {Boolean} True, if this federate resolved the contract.
      */
     Federate.prototype.resolveContract = function(contract, context) {
+        var start = profiler.start();
         var index = this.contracts.indexOf(contract);
         if(index > -1 && contract.isCompleted(context)) {
             this.cash += contract.getValue();
+            this.numResolved++;
             this.deleteData(contract, context);
             this.contracts.splice(index, 1);
 			context.pastEvents.push(contract.demand);
             logger.info(this.id + " completed contract " + contract.demand.id + " for " + contract.getValue());
+            profiler.stop('contract.resolve', start);
             return true;
         }
+        profiler.stop('contract.resolve', start);
         return false;
     };
     
@@ -266,6 +283,9 @@ define('federate', function(require) {
      */
     Federate.prototype.init = function(sim) {
         this.cash = this.initialCash;
+        this.cashHistory = []; // cash at the end of each turn
+        this.numResolved = 0;
+        this.numDefaulted = 0;
         for(var i = 0; i < this.systems.length; i++) {
             this.systems[i].init(sim);
         }
@@ -27,8 +27,8 @@ define('fixedCostFederationOperations', function(require) {
     var Operations = require("operations");
     var lpsolve = require("lp_solve");
     var logger = require("logger");
+    var profiler = require("profiler");
     var fs = require("fs");
-    var math = require("mathjs");
     
     function FixedCostFederationOperations() {
 		this.storagePenalty = -10;
@@ -74,35 +74,9 @@ define('fixedCostFederationOperations', function(require) {
      * @returns {Number} The storage penalty.
      */
 	FixedCostFederationOperations.prototype.getStoragePenalty = function(demand, spacecraft, context) {
-		// compute expected net value of all possible other demands (compared to existing demand)
-		// memoizes results: 	assumes context events does not change during simulation
-		// 						and spacecraft do not change sensing capabilities
-		// 						and demand types have consistent revenue schedules
-		
-		return _.memoize(function(demand, spacecraft) {
-				var events =  _.filter(context.events, function(event) {
-					return event.isDemand() && spacecraft.couldSense(event.phenomena, event.size);
-				});
-				var numSC = 1;
-				var values = _.union([0], _.map(events, function(event) {
-					return event.getValueAt(0);
-				})).sort();
-				var counts = _.map(values, function(value) {
-					return _.size(_.filter(events, function(event) {
-						return event.getValueAt(0)===value;
-					}));
-				});
-				counts[0] = _.size(_.difference(context.events, events));
-				var expValMax =  _.reduce(values, function(memo, value, i) {
-							return memo + values[i]*(math.pow(_.reduce(counts.slice(0,i+1), function(memo,count){return memo + count;},0), numSC)
-									- math.pow(_.reduce(counts.slice(0,i), function(memo,count){return memo + count;},0), numSC));
-						}, 0)/math.pow(_.reduce(counts, function(memo,count){return memo + count;},0),numSC);
-				//console.log('exp val max for ' + spacecraft.id + " with " + numSC + " SC " + ': ' + expValMax);
-				//return Math.min(0, demand.getValueAt(elapsedTime+1) - expValMax);
-				return -1*expValMax;
-		}, function(demand, spacecraft) {
-			return demand.type + spacecraft.id;
-		})(demand, spacecraft);
+		// look up expected net value of all possible other demands (compared to existing demand)
+		// from the table shared by all operations models in this context
+		return context.getStoragePenalty(demand, spacecraft);
 	};
 	
     /**
@@ -111,45 +85,20 @@ define('fixedCostFederationOperations', function(require) {
      * @param {object} context - The context.
      */
     FixedCostFederationOperations.prototype.operate = function(federation, context) {        
-		var allSystems = _.flatten(_.map(federation.federates, function(federate) {
-					return _.filter(federate.systems, 
-							function(system) {
-								return system.isCommissioned();
-							});
-				}));
-		var allSpacecrafts = _.filter(allSystems, function(system) {
-					return system.isSpace();
-				});
-		var allSpacecraftsISL = _.filter(allSpacecrafts, function(spacecraft) {
-			return _.some(spacecraft.subsystems, function(subsystem) {
-				return subsystem.isTransceiver() && subsystem.isISL();
-			})
-		});
-		var allStations = _.filter(allSystems, function(system) {
-					return system.isGround();
-				});
-		var allContracts = _.flatten(_.map(federation.federates, function(federate) {
-					return federate.contracts;
-				}));
-		var SGLprotocols = _.union(_.flatten(_.map(allSystems, function(system) {
-					return _.map(_.filter(system.subsystems, function(subsystem) {
-						return subsystem.isTransceiver() && subsystem.isSGL();
-					}), function(sgl) {
-						return sgl.protocol;
-					});
-				})));
-		var ISLprotocols = _.union(_.flatten(_.map(allSystems, function(system) {
-					return _.map(_.filter(system.subsystems, function(subsystem) {
-						return subsystem.isTransceiver() && subsystem.isISL();
-					}), function(sgl) {
-						return sgl.protocol;
-					});
-				})));
+		// federation-wide structure shared by the programs of all federates
+		var skeleton = this.buildSkeleton(federation, context);
+		var allSystems = skeleton.systems;
+		var allSpacecrafts = skeleton.spacecraft;
+		var allSpacecraftsISL = skeleton.spacecraftISL;
+		var allStations = skeleton.stations;
+		var SGLprotocols = skeleton.SGLprotocols;
+		var ISLprotocols = skeleton.ISLprotocols;
 		var phenomenas = ['VIS','SAR',undefined];
 				
 		// FIXME: need to shuffle order of federates
 		// TODO: add planning horizon but restrict storage in non-owned system
 		_.each(federation.federates, function(federate) {
+			var buildStart = profiler.start();
 			var lp = new lpsolve.LinearProgram();
 			lp.setOutputFile('');
 			// objective function
@@ -296,29 +245,24 @@ define('fixedCostFederationOperations', function(require) {
                         T_c[i][j][k] = [];
                         var c_vis = new lpsolve.Row();
                         var maxSize = 0;
+                        var couldLink = this.getSharedLinkCheck(skeleton, spacecraft, station, protocol, origLoc, destLoc, context);
                         _.each(demands, function(demand, l) {
                             // transmit from spacecraft i to ground station j using protocol k data for demand l
                             T_d[i][j][k][l] = lp.addColumn(spacecraft.id + "-" + station.id + '-T' + '(' + protocol + ')-' + demand.id, true);
-							if(!_.contains(ownStations, station)) {
+							if(skeleton.owners[station.id]!==federate) {
 								J.Add(T_d[i][j][k][l], -1*this.downlinkCost);
 							}
                             c_vis.Add(T_d[i][j][k][l], demand.size);
-                            maxSize = Math.max(maxSize, (spacecraft.couldTransmit(protocol, 
-                                    origLoc, destLoc, demand.size, station, context) 
-                                && station.couldReceive(protocol, origLoc, destLoc, 
-                                    spacecraft, demand.size, context))?demand.size:0);
+                            maxSize = Math.max(maxSize, couldLink(demand.size)?demand.size:0);
                         }, this);
                         _.each(ownContracts, function(contract, l) {
                             // transmit from spacecraft i to ground station j using protocol k data for own contract l
                             T_c[i][j][k][l] = lp.addColumn(spacecraft.id + '-' + station.id + '-T' + '(' + protocol + ')-' + contract.demand.id, true);
-							if(!_.contains(ownStations, station)) {
+							if(skeleton.owners[station.id]!==federate) {
 								J.Add(T_c[i][j][k][l], -1*this.downlinkCost);
 							}
                             c_vis.Add(T_c[i][j][k][l], contract.demand.size);
-                            maxSize = Math.max(maxSize, (spacecraft.couldTransmit(protocol, 
-                                    origLoc, destLoc, contract.demand.size, station, context) 
-                                && station.couldReceive(protocol, origLoc, destLoc, 
-                                    spacecraft, contract.demand.size, context))?contract.demand.size:0);
+                            maxSize = Math.max(maxSize, couldLink(contract.demand.size)?contract.demand.size:0);
                         }, this);
                         // constrain transmission by visibility
                         C.push({
@@ -386,38 +330,31 @@ define('fixedCostFederationOperations', function(require) {
                         L_c[i][j][k] = [];
                         var c_vis = new lpsolve.Row();
                         var maxSize = 0;
+                        var couldLink = this.getSharedLinkCheck(skeleton, spacecraft, spacecraft2, protocol, origLoc, destLoc, context);
                         _.each(demands, function(demand, l) {
                             // transmit from spacecraft i to spacecraft j using protocol k data for demand l
                             L_d[i][j][k][l] = lp.addColumn(spacecraft.id + "-" + spacecraft2.id + '-T' + '(' + protocol + ')-' + demand.id, true);
-							if(!_.contains(ownSpacecrafts, spacecraft) || !_.contains(ownSpacecrafts, spacecraft2)) {
+							if(skeleton.owners[spacecraft.id]!==federate || skeleton.owners[spacecraft2.id]!==federate) {
 								J.Add(L_d[i][j][k][l], -1*this.crosslinkCost);
 							} else {
 								// small penalty to discourage cycles
 								J.Add(L_d[i][j][k][l], this.islPenalty);
 							}
                             c_vis.Add(L_d[i][j][k][l], demand.size)
-                            maxSize = Math.max(maxSize, (spacecraft.couldTransmit(protocol, 
-                                    origLoc, destLoc, demand.size, spacecraft2, context) 
-                                && spacecraft2.couldReceive(protocol, 
-                                    origLoc, destLoc, spacecraft, demand.size, context)
-                                && spacecraft !== spacecraft2)?demand.size:0);
+                            maxSize = Math.max(maxSize, couldLink(demand.size)?demand.size:0);
                         }, this);
                         _.each(ownContracts, function(contract, l) {
                             // transmit from spacecraft i to spacecraft j using protocol k data for own contract l
                             L_c[i][j][k][l] = lp.addColumn(spacecraft.id + '-' + spacecraft2.id + '-T' + '(' + protocol + ')-' + contract.demand.id, true);
 							// small penalty to discourage cycles
-							if(!_.contains(ownSpacecrafts, spacecraft) || !_.contains(ownSpacecrafts, spacecraft2)) {
+							if(skeleton.owners[spacecraft.id]!==federate || skeleton.owners[spacecraft2.id]!==federate) {
 								J.Add(L_c[i][j][k][l], -1*this.crosslinkCost);
 							} else {
 								// small penalty to discourage cycles
 								J.Add(L_c[i][j][k][l], this.islPenalty);
 							}
                             c_vis.Add(L_c[i][j][k][l], contract.demand.size)
-                            maxSize = Math.max(maxSize, (spacecraft.couldTransmit(protocol, 
-                                    origLoc, destLoc, contract.demand.size, spacecraft2, context) 
-                                && spacecraft2.couldReceive(protocol, 
-                                    origLoc, destLoc, spacecraft, contract.demand.size, context)
-                                && spacecraft !== spacecraft2)?contract.demand.size:0);
+                            maxSize = Math.max(maxSize, couldLink(contract.demand.size)?contract.demand.size:0);
                         }, this);
                         // constrain transmission by visibility
                         C.push({
@@ -503,7 +440,7 @@ define('fixedCostFederationOperations', function(require) {
 			            
 			_.each(allSpacecrafts, function(spacecraft, i) {
 				var SE_i = _.indexOf(ownSpacecrafts, spacecraft);
-				var R_i = _.indexOf(allSystems, spacecraft);
+				var R_i = skeleton.systemIndex[spacecraft.id];
 				_.each(demands, function(demand, j) {
 					var c_nf = new lpsolve.Row();
 					if(SE_i > -1) {
@@ -516,7 +453,7 @@ define('fixedCostFederationOperations', function(require) {
 							c_nf.Add(T_d[i][k][l][j],-1);
 					   }, this);
 					}, this);
-					if((isl_i = _.indexOf(allSpacecraftsISL, spacecraft)) >= 0) {
+					if((isl_i = _.has(skeleton.islIndex, spacecraft.id)?skeleton.islIndex[spacecraft.id]:-1) >= 0) {
 						_.each(allSpacecraftsISL, function(spacecraft2, k) {
 						   _.each(ISLprotocols, function(protocol, l) {
 								c_nf.Add(L_d[isl_i][k][l][j],-1);
@@ -585,7 +522,7 @@ define('fixedCostFederationOperations', function(require) {
             }
 						
 			_.each(allStations, function(station, k) {
-				var R_k = _.indexOf(allSystems, station);
+				var R_k = skeleton.systemIndex[station.id];
 				_.each(demands, function(demand, j) {
 					var c_nf = new lpsolve.Row();
 					c_nf.Add(R_d[R_k][j],-1);
@@ -632,7 +569,7 @@ define('fixedCostFederationOperations', function(require) {
 				_.each(allSpacecrafts, function(spacecraft, i) {
 					_.each(allStations, function(station, j) {
 						_.each(SGLprotocols, function(protocol, k) {
-							if(!_.contains(ownStations, station)) {
+							if(skeleton.owners[station.id]!==federate) {
 								c_cash.Add(T_d[i][j][k][l], this.downlinkCost);
 							}
 						}, this);
@@ -641,7 +578,7 @@ define('fixedCostFederationOperations', function(require) {
 				_.each(allSpacecraftsISL, function(spacecraft, i) {
 					_.each(allSpacecraftsISL, function(spacecraft2, j) {
 						_.each(ISLprotocols, function(protocol, k) {
-							if(!_.contains(ownSpacecrafts, spacecraft2)) {
+							if(skeleton.owners[spacecraft2.id]!==federate) {
 								c_cash.Add(L_d[i][j][k][l], this.crosslinkCost);
 							}
 						}, this);
@@ -659,7 +596,7 @@ define('fixedCostFederationOperations', function(require) {
 				_.each(allSpacecrafts, function(spacecraft, i) {
 					_.each(allStations, function(station, j) {
 						_.each(SGLprotocols, function(protocol, k) {
-							if(!_.contains(ownStations, station)) {
+							if(skeleton.owners[station.id]!==federate) {
 								c_cash.Add(T_c[i][j][k][l], this.downlinkCost);
 							}
 						}, this);
@@ -668,7 +605,7 @@ define('fixedCostFederationOperations', function(require) {
 				_.each(allSpacecraftsISL, function(spacecraft, i) {
 					_.each(allSpacecraftsISL, function(spacecraft2, j) {
 						_.each(ISLprotocols, function(protocol, k) {
-							if(!_.contains(ownSpacecrafts, spacecraft2)) {
+							if(skeleton.owners[spacecraft2.id]!==federate) {
 								c_cash.Add(L_c[i][j][k][l], this.crosslinkCost);
 							}
 						}, this);
@@ -686,11 +623,18 @@ define('fixedCostFederationOperations', function(require) {
 			_.each(C, function(c) {
 				lp.addConstraint(c.row, c.constraint, c.constant, c.name);
 			}, this);
+			if(profiler.enabled) {
+				this.logProgramSize(federate.id, context.time, this.countColumns([S, E_d, E_c, T_d, T_c, L_d, L_c, R_d, R_c]),
+						C.length, 0, 0);
+			}
 			
 			// set objective function and solve linear program
 			lp.setObjective(J, false);
 			
+			profiler.stop('ops.build', buildStart);
+			var solveStart = profiler.start();
 			var result = lp.solve();
+			profiler.stop('ops.solve', solveStart);
 			
 			if(result.code>1) {
 				logger.error(result.description);
@@ -698,6 +642,8 @@ define('fixedCostFederationOperations', function(require) {
 				logger.info('lp_solve dump written to file lp_debug.txt');
 				// process.exit(1);
 			} else {
+				var applyStart = profiler.start();
+				
 				// recursive function to transport data from contracts
 				var transportContract = function(operations, spacecraft, contract, context) {
 					var federate1 = operations.getSystemOwner(spacecraft, federation);
@@ -883,6 +829,7 @@ define('fixedCostFederationOperations', function(require) {
                         transportContract(this, spacecraft, contract, context);
 					}
 				}, this);
+				profiler.stop('ops.apply', applyStart);
 			}
 		}, this);
     };
@@ -243,6 +243,7 @@ define('game',function(require) {
         return new fss.Context({
             locations: locations,
             events: events,
+            eventTypes: this.eventTypes,
             seed: seed,
             federations: [
                 new fss.Federation({
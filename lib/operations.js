@@ -23,7 +23,11 @@ if (typeof define !== 'function') {
  * @module operations
  */
 define('operations', function(require) {
+    var _ = require("underscore");
     var mas = require("mas");
+    var logger = require("logger");
+    var profiler = require("profiler");
+    var solutionCache = require("solutionCache");
     
     function Operations() {
         // initialize superclass (assigns above attributes with arguments)
@@ -39,5 +43,313 @@ define('operations', function(require) {
      */
     Operations.prototype.execute = function(controller, context) { }
     
+    /**
+     * Gets a function which checks if a system could transmit data of a
+     * given size to another system using a protocol. Results are memoized by
+     * data size as transceiver states do not change while building a linear
+     * program. Feasibility is monotonic in data size (transceiver capacity).
+     * @param {object} origin - The transmitting system.
+     * @param {object} destination - The receiving system.
+     * @param {String} protocol - The protocol.
+     * @param {object} origLoc - The origin location.
+     * @param {object} destLoc - The destination location.
+     * @param {object} context - The context.
+     * @param {Boolean} topology - False if the link topology is known to be
+     * infeasible, so no data size is checked (default true; see `getTopology`).
+     * @returns {function} The function of data size returning true if data could be transmitted.
+     */
+    Operations.prototype.getLinkCheck = function(origin, destination, protocol, origLoc, destLoc, context, topology) {
+        var feasible = {};
+        return function(dataSize) {
+            if(!_.has(feasible, dataSize)) {
+                feasible[dataSize] = topology !== false && origin.couldTransmit(protocol, 
+                        origLoc, destLoc, dataSize, destination, context) 
+                    && destination.couldReceive(protocol, 
+                        origLoc, destLoc, origin, dataSize, context)
+                    && origin !== destination;
+            }
+            return feasible[dataSize];
+        };
+    };
+    
+    /**
+     * Builds the federation-wide structure shared by the linear programs of
+     * all federates in one turn: commissioned systems, spacecraft (with
+     * ISL), ground stations, protocols, system owners and indices (by
+     * system id), and link topology (see `getSharedLinkCheck`).
+     * Only federate-specific columns, costs, and bounds are built per
+     * federate.
+     * @param {object} federation - The federation.
+     * @param {object} context - The context.
+     * @returns {object} The skeleton.
+     */
+    Operations.prototype.buildSkeleton = function(federation, context) {
+        var skeleton = {
+            systems: [],
+            spacecraft: [],
+            spacecraftISL: [],
+            stations: [],
+            SGLprotocols: [],
+            ISLprotocols: [],
+            owners: {}, // owners[system.id]: federate
+            systemIndex: {}, // systemIndex[system.id]: index in systems
+            islIndex: {}, // islIndex[system.id]: index in spacecraftISL
+            links: {} // links[key]: true if a link could exist regardless of capacity
+        };
+        _.each(federation.federates, function(federate) {
+            _.each(federate.systems, function(system) {
+                if(!system.isCommissioned()) {
+                    return;
+                }
+                skeleton.owners[system.id] = federate;
+                skeleton.systemIndex[system.id] = skeleton.systems.length;
+                skeleton.systems.push(system);
+                var transceivers = _.filter(system.subsystems, function(subsystem) {
+                    return subsystem.isTransceiver();
+                });
+                _.each(transceivers, function(transceiver) {
+                    if(transceiver.isSGL() && !_.contains(skeleton.SGLprotocols, transceiver.protocol)) {
+                        skeleton.SGLprotocols.push(transceiver.protocol);
+                    } else if(transceiver.isISL() && !_.contains(skeleton.ISLprotocols, transceiver.protocol)) {
+                        skeleton.ISLprotocols.push(transceiver.protocol);
+                    }
+                });
+                if(system.isSpace()) {
+                    skeleton.spacecraft.push(system);
+                    if(_.some(transceivers, function(transceiver) {
+                        return transceiver.isISL();
+                    })) {
+                        skeleton.islIndex[system.id] = skeleton.spacecraftISL.length;
+                        skeleton.spacecraftISL.push(system);
+                    }
+                } else if(system.isGround()) {
+                    skeleton.stations.push(system);
+                }
+            });
+        });
+        return skeleton;
+    }
+
+    /**
+     * Checks if a link topology could exist regardless of transceiver
+     * capacity: protocols, locations, and proprietary ownership (checked
+     * with zero data size, for which capacity never binds). Results are
+     * memoized in a table by key.
+     * @param {object} links - The table of memoized topologies by key.
+     * @param {String} key - The key of the link.
+     * @param {object} origin - The transmitting system.
+     * @param {object} destination - The receiving system.
+     * @param {String} protocol - The protocol.
+     * @param {object} origLoc - The origin location.
+     * @param {object} destLoc - The destination location.
+     * @param {object} context - The context.
+     * @returns {Boolean} True, if the link topology could exist.
+     */
+    Operations.prototype.getTopology = function(links, key, origin, destination, protocol, origLoc, destLoc, context) {
+        if(!_.has(links, key)) {
+            links[key] = origin !== destination
+                    && origin.couldTransmit(protocol, origLoc, destLoc, 0, destination, context)
+                    && destination.couldReceive(protocol, origLoc, destLoc, origin, 0, context);
+        }
+        return links[key];
+    }
+
+    /**
+     * Gets a function which checks if a system could transmit data of a
+     * given size to another system using a protocol (as `getLinkCheck`).
+     * The link topology is checked once per turn and shared by all
+     * federates through the skeleton; data sizes are only checked (with the
+     * transceiver capacity as it changes when earlier federates transmit
+     * data) for links with a feasible topology.
+     * @param {object} skeleton - The skeleton (see `buildSkeleton`).
+     * @param {object} origin - The transmitting system.
+     * @param {object} destination - The receiving system.
+     * @param {String} protocol - The protocol.
+     * @param {object} origLoc - The origin location.
+     * @param {object} destLoc - The destination location.
+     * @param {object} context - The context.
+     * @param {Number} offset - The time offset of the locations (default 0).
+     * @returns {function} The function of data size returning true if data could be transmitted.
+     */
+    Operations.prototype.getSharedLinkCheck = function(skeleton, origin, destination, protocol, origLoc, destLoc, context, offset) {
+        var key = origin.id + '|' + destination.id + '|' + protocol + '|' + (offset || 0);
+        return this.getLinkCheck(origin, destination, protocol, origLoc, destLoc, context,
+                this.getTopology(skeleton.links, key, origin, destination, protocol, origLoc, destLoc, context));
+    };
+
+    /**
+     * Adds a term to a linear program row if the column exists. Columns for
+     * infeasible links are not created (see `getLinkCheck`).
+     * @param {object} row - The row.
+     * @param {String} column - The column, or `undefined` if not created.
+     * @param {Number} coefficient - The coefficient.
+     */
+    Operations.prototype.addTerm = function(row, column, coefficient) {
+        if(column !== undefined) {
+            row.Add(column, coefficient);
+        }
+    }
+    
+    /**
+     * Gets the value of a column in a linear program solution.
+     * @param {object} lp - The solved linear program or cached solution (see `solveProgram`).
+     * @param {String} column - The column, or `undefined` if not created.
+     * @returns {Number} The value, or 0 if the column was not created.
+     */
+    Operations.prototype.getValue = function(lp, column) {
+        return column===undefined?0:lp.get(column);
+    }
+    
+    /**
+     * Counts the columns created in nested arrays of linear program columns.
+     * @param {array} variables - The arrays of columns.
+     * @returns {Number} The number of columns.
+     */
+    Operations.prototype.countColumns = function(variables) {
+        return this.getColumns(variables).length;
+    }
+    
+    /**
+     * Gets the columns created in nested arrays of linear program columns
+     * in a canonical order (see `solveProgram`).
+     * @param {array} variables - The arrays of columns.
+     * @returns {array} The columns.
+     */
+    Operations.prototype.getColumns = function(variables) {
+        return _.filter(_.flatten(variables), function(column) {
+            return column !== undefined;
+        });
+    }
+    
+    /**
+     * Gets the key of a planning state for the solution cache (see
+     * `solutionCache`). The state includes everything a linear program is
+     * built from, in model order but without system, demand, or contract
+     * identifiers, so equal keys give equal programs up to column names.
+     * Federate cash is only included if it could bind the cash constraint.
+     * @param {object} controller - The controller.
+     * @param {object} context - The context.
+     * @param {array} params - The model parameters, e.g. penalties and costs.
+     * @param {array} systems - The systems.
+     * @param {array} demands - The demands.
+     * @param {array} contracts - The contracts.
+     * @param {array} federates - The federates with cash constraints.
+     * @param {Number} numTimes - The number of times in the planning horizon.
+     * @param {Number} costBound - The largest service cost in a cash constraint.
+     * @returns {String} The key.
+     */
+    Operations.prototype.getStateKey = function(controller, context, params, systems, demands, contracts, federates, numTimes, costBound) {
+        var getOwner = function(property, item) {
+            var owner;
+            _.each(context.federations, function(federation) {
+                _.each(federation.federates, function(federate) {
+                    if(_.contains(federate[property], item)) {
+                        owner = federate;
+                    }
+                });
+            });
+            return owner;
+        };
+        var getDemandState = function(demand) {
+            return [demand.phenomena, demand.size, demand.sector, 
+                    demand.valueSchedule, demand.defaultValue];
+        };
+        var contractIds = _.pluck(contracts, 'id');
+        
+        // largest possible default penalty and service costs paid in one turn
+        var cashBound = costBound;
+        _.each(_.union(demands, _.pluck(contracts, 'demand')), function(demand) {
+            var minValue = _.min(_.map(demand.valueSchedule, function(value) {
+                return value[1];
+            }).concat([demand.defaultValue]));
+            cashBound += systems.length*Math.max(0, -minValue);
+        });
+        
+        return solutionCache.hash([
+            controller.id, params, numTimes, 
+            Math.min(context.maxTime - context.time, numTimes + 1),
+            _.map(systems, function(system) {
+                var owner = getOwner('systems', system);
+                return [system.type, system.location, owner?owner.id:null, 
+                    _.map(system.subsystems, function(subsystem) {
+                        return [subsystem.type, subsystem.protocol, subsystem.sensed, 
+                            subsystem.transmitted, subsystem.received, 
+                            _.map(subsystem.contents, function(data) {
+                                return [_.indexOf(contractIds, data.contract), 
+                                        data.phenomena, data.size];
+                            })];
+                    })];
+            }),
+            _.map(demands, getDemandState),
+            _.map(contracts, function(contract) {
+                var owner = getOwner('contracts', contract);
+                return [getDemandState(contract.demand), contract.elapsedTime, 
+                        owner?owner.id:null, 
+                        owner?owner.cash + contract.demand.defaultValue > 0:null];
+            }),
+            _.map(federates, function(federate) {
+                return [federate.id, federate.cash<cashBound?federate.cash:null];
+            })
+        ]);
+    }
+    
+    /**
+     * Solves a linear program or reuses a cached solution for the same
+     * planning state (see `getStateKey`).
+     * @param {object} lp - The linear program.
+     * @param {array} columns - The columns in canonical order (see `getColumns`).
+     * @param {String} key - The state key, or `undefined` to always solve.
+     * @returns {object} The result (`code` and `description`) with a
+     * `solution` object to get column values.
+     */
+    Operations.prototype.solveProgram = function(lp, columns, key) {
+        var values = key===undefined?undefined:solutionCache.get(key, columns.length);
+        if(values !== undefined) {
+            var solution = {};
+            _.each(values, function(value) {
+                solution[columns[value[0]]] = value[1];
+            });
+            return {
+                code: 0, 
+                description: 'cached solution', 
+                solution: {
+                    get: function(column) {
+                        return _.has(solution, column)?solution[column]:0;
+                    }
+                }
+            };
+        }
+        var result = lp.solve();
+        if(key !== undefined && result.code <= 1) {
+            values = [];
+            _.each(columns, function(column, index) {
+                var value = lp.get(column);
+                if(value !== 0) {
+                    values.push([index, value]);
+                }
+            });
+            solutionCache.put(key, columns.length, values);
+        }
+        return {code: result.code, description: result.description, solution: lp};
+    }
+    
+    /**
+     * Logs and records (see `profiler`) the size of a linear program with
+     * sparse link columns. Only called while profiling, as counting the
+     * columns visits every column array.
+     * @param {String} model - The operations model (controller id).
+     * @param {Number} time - The turn.
+     * @param {Number} numColumns - The number of columns.
+     * @param {Number} numRows - The number of constraints.
+     * @param {Number} numSkippedColumns - The number of infeasible link columns skipped.
+     * @param {Number} numSkippedRows - The number of empty constraints skipped.
+     */
+    Operations.prototype.logProgramSize = function(model, time, numColumns, numRows, numSkippedColumns, numSkippedRows) {
+        logger.verbose('LP for ' + model + ' at ' + time + ': ' + numColumns + ' variables (' 
+                + (numColumns+numSkippedColumns) + ' dense), ' + numRows + ' constraints ('
+                + (numRows+numSkippedRows) + ' dense)');
+        profiler.recordProgram(model, time, numColumns, numRows);
+    }
+    
     return Operations;
 });
\ No newline at end of file
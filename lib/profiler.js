@@ -0,0 +1,101 @@
+/*
+ * Copyright 2015 Paul T. Grogan
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+if (typeof define !== 'function') {
+    var define = require('amdefine')(module);
+}
+
+/**
+ * A module to record wall time and call counts per simulation phase and
+ * linear program sizes per operations model and turn. Profiling is off
+ * until `enable` is called so instrumented code only pays for one check.
+ * @module profiler
+ */
+define('profiler', function(require) {
+    var _ = require("underscore");
+
+    var profiler = {
+        enabled: false,
+        phases: {}, // phases[name]: {count, time (ms)}
+        programs: [] // {model, time, columns, rows}
+    };
+
+    /**
+     * Enables or disables profiling.
+     * @param {Boolean} enabled - True to enable profiling (default).
+     */
+    profiler.enable = function(enabled) {
+        this.enabled = (enabled !== false);
+    }
+
+    /**
+     * Clears all recorded phases and programs.
+     */
+    profiler.reset = function() {
+        this.phases = {};
+        this.programs = [];
+    }
+
+    /**
+     * Starts timing a phase.
+     * @returns {Array} The start time, or `undefined` if profiling is disabled.
+     */
+    profiler.start = function() {
+        return this.enabled?process.hrtime():undefined;
+    }
+
+    /**
+     * Stops timing a phase and records the elapsed time.
+     * @param {String} phase - The phase name, e.g. "ops.solve".
+     * @param {Array} start - The start time from `start`.
+     */
+    profiler.stop = function(phase, start) {
+        if(start !== undefined) {
+            var elapsed = process.hrtime(start);
+            if(!_.has(this.phases, phase)) {
+                this.phases[phase] = {count: 0, time: 0};
+            }
+            this.phases[phase].count++;
+            this.phases[phase].time += elapsed[0]*1e3 + elapsed[1]/1e6;
+        }
+    }
+
+    /**
+     * Records the size of a linear program.
+     * @param {String} model - The operations model (controller id).
+     * @param {Number} time - The turn.
+     * @param {Number} columns - The number of columns (variables).
+     * @param {Number} rows - The number of rows (constraints).
+     */
+    profiler.recordProgram = function(model, time, columns, rows) {
+        if(this.enabled) {
+            this.programs.push({model: model, time: time, columns: columns, rows: rows});
+        }
+    }
+
+    /**
+     * Gets a machine-readable summary of the recorded phases and programs.
+     * @returns {object} The summary.
+     */
+    profiler.summary = function() {
+        return {
+            phases: _.clone(this.phases),
+            programs: _.clone(this.programs)
+        };
+    }
+
+    return profiler;
+});
@@ -0,0 +1,239 @@
+/*
+ * Copyright 2015 Paul T. Grogan
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+if (typeof define !== 'function') {
+    var define = require('amdefine')(module);
+}
+
+/**
+ * A module to store per-player game results in an append-only columnar
+ * directory without a database. Each design (design string, operations
+ * models, and player) is written once to `designs.jsonl` with its station,
+ * satellite, and ISL counts. Each record appends one little-endian value
+ * to every column file (`design.u4`, `seed.i4`, `initialCash.f8`,
+ * `finalCash.f8`, `totalCost.f8`, `totalValue.f8`). Records are buffered
+ * and appended in batches. Readers use the shortest column, so a
+ * partially written batch is ignored (see `fsspp.load_store`).
+ * @module resultStore
+ */
+define('resultStore', function(require) {
+    var _ = require("underscore");
+    var fs = require("fs");
+    var path = require("path");
+    var logger = require("logger");
+
+    // columns in record order: [name, byte size, buffer write method]
+    var COLUMNS = [
+        ['design', 4, 'writeUInt32LE'],
+        ['seed', 4, 'writeInt32LE'],
+        ['initialCash', 8, 'writeDoubleLE'],
+        ['finalCash', 8, 'writeDoubleLE'],
+        ['totalCost', 8, 'writeDoubleLE'],
+        ['totalValue', 8, 'writeDoubleLE']
+    ];
+
+    // column buffer read methods by write method
+    var READERS = {
+        writeUInt32LE: 'readUInt32LE',
+        writeInt32LE: 'readInt32LE',
+        writeDoubleLE: 'readDoubleLE'
+    };
+
+    /**
+     * @constructor
+     * @alias module:resultStore
+     */
+    function ResultStore() {
+        this.directory = 'results';
+        this.batchSize = 1000; // records buffered before appending
+
+        // override default attributes or methods
+        for(var n in arguments[0]) {
+            this[n] = arguments[0][n];
+        }
+        this.designs = []; // designs[id]: design attributes
+        this.designIds = {}; // designIds[key]: id
+        this.pending = []; // buffered records
+    };
+
+    /**
+     * Gets the file name of a column.
+     * @param {array} column - The column definition.
+     * @returns {String} The file name.
+     */
+    ResultStore.prototype.getColumnFile = function(column) {
+        var type = (column[2]==='writeDoubleLE'?'f':(column[2]==='writeUInt32LE'?'u':'i')) + column[1];
+        return path.join(this.directory, column[0] + '.' + type);
+    }
+
+    /**
+     * Gets the key of the design of a record.
+     * @param {object} record - The record (see `Runner.getRecords`).
+     * @returns {String} The key.
+     */
+    ResultStore.prototype.getDesignKey = function(record) {
+        return [record.run, record.ops, record.fops, record.player].join('|');
+    }
+
+    /**
+     * Opens the store: creates the directory if needed, reads the design
+     * dictionary, and truncates the column files to the number of complete
+     * records.
+     */
+    ResultStore.prototype.open = function() {
+        if(!fs.existsSync(this.directory)) {
+            fs.mkdirSync(this.directory);
+        }
+        var designFile = path.join(this.directory, 'designs.jsonl');
+        if(fs.existsSync(designFile)) {
+            _.each(fs.readFileSync(designFile, 'utf8').split('\n'), function(line) {
+                if(line.length > 0) {
+                    var design = JSON.parse(line);
+                    this.designs[design.id] = design;
+                    this.designIds[this.getDesignKey(design)] = design.id;
+                }
+            }, this);
+        }
+        var numRecords = this.getNumRecords();
+        _.each(COLUMNS, function(column) {
+            var filename = this.getColumnFile(column);
+            if(fs.existsSync(filename) && fs.statSync(filename).size > numRecords*column[1]) {
+                logger.warn('Truncating partially written column ' + filename);
+                fs.truncateSync(filename, numRecords*column[1]);
+            }
+        }, this);
+    }
+
+    /**
+     * Gets the number of complete records (the length of the shortest column).
+     * @returns {Number} The number of records.
+     */
+    ResultStore.prototype.getNumRecords = function() {
+        return _.min(_.map(COLUMNS, function(column) {
+            var filename = this.getColumnFile(column);
+            return fs.existsSync(filename)?Math.floor(fs.statSync(filename).size/column[1]):0;
+        }, this));
+    }
+
+    /**
+     * Gets the id of the design of a record, adding the design to the
+     * dictionary if needed. Counts are computed from the design string as
+     * in `Runner.getRecords`.
+     * @param {object} record - The record (see `Runner.getRecords`).
+     * @returns {Number} The design id.
+     */
+    ResultStore.prototype.getDesignId = function(record) {
+        var key = this.getDesignKey(record);
+        if(!_.has(this.designIds, key)) {
+            var run = record.run;
+            var design = {
+                id: this.designs.length,
+                run: run,
+                ops: record.ops,
+                fops: record.fops,
+                player: record.player,
+                players: record.players,
+                stations: (run.match(new RegExp((record.player+1)+'\\.GroundSta', 'g')) || []).length,
+                satellites: (run.match(new RegExp((record.player+1)+'\\.(?:Small|Medium|Large)Sat', 'g')) || []).length,
+                totalStations: (run.match(/GroundSta/g) || []).length,
+                totalSatellites: (run.match(/(?:Small|Medium|Large)Sat/g) || []).length,
+                isl: ((run.match(/ISL/g) || []).length>0)
+            };
+            fs.appendFileSync(path.join(this.directory, 'designs.jsonl'), JSON.stringify(design) + '\n');
+            this.designs.push(design);
+            this.designIds[key] = design.id;
+        }
+        return this.designIds[key];
+    }
+
+    /**
+     * Adds records, appending them to the column files once `batchSize`
+     * records are buffered.
+     * @param {array} records - The records (see `Runner.getRecords`).
+     */
+    ResultStore.prototype.append = function(records) {
+        _.each(records, function(record) {
+            this.pending.push(record);
+        }, this);
+        if(this.pending.length >= this.batchSize) {
+            this.flush();
+        }
+    }
+
+    /**
+     * Appends all buffered records to the column files.
+     */
+    ResultStore.prototype.flush = function() {
+        if(this.pending.length === 0) {
+            return;
+        }
+        var designIds = _.map(this.pending, this.getDesignId, this);
+        _.each(COLUMNS, function(column) {
+            var buffer = Buffer.alloc(this.pending.length*column[1]);
+            _.each(this.pending, function(record, index) {
+                var value = column[0]==='design'?designIds[index]:record[column[0]];
+                buffer[column[2]](value, index*column[1]);
+            }, this);
+            fs.appendFileSync(this.getColumnFile(column), buffer);
+        }, this);
+        this.pending = [];
+    }
+
+    /**
+     * Appends all buffered records and releases the buffer.
+     */
+    ResultStore.prototype.close = function() {
+        this.flush();
+    }
+
+    /**
+     * Closes the store when the process exits, including on SIGINT and
+     * SIGTERM, so buffered records of an interrupted sweep are kept.
+     */
+    ResultStore.prototype.closeOnExit = function() {
+        var store = this;
+        process.on('exit', function() {
+            store.close();
+        });
+        _.each({SIGINT: 130, SIGTERM: 143}, function(code, signal) {
+            process.on(signal, function() {
+                process.exit(code);
+            });
+        });
+    }
+
+    /**
+     * Reads all stored records.
+     * @returns {array} The records with the attributes of `Runner.getRecords`.
+     */
+    ResultStore.prototype.read = function() {
+        var numRecords = this.getNumRecords();
+        var columns = _.map(COLUMNS, function(column) {
+            var filename = this.getColumnFile(column);
+            return fs.existsSync(filename)?fs.readFileSync(filename):Buffer.alloc(0);
+        }, this);
+        return _.map(_.range(numRecords), function(index) {
+            var record = {};
+            _.each(COLUMNS, function(column, c) {
+                record[column[0]] = columns[c][READERS[column[2]]](index*column[1]);
+            });
+            var design = this.designs[record.design];
+            return _.extend(_.omit(design, 'id'), _.omit(record, 'design'));
+        }, this);
+    }
+
+    return ResultStore;
+});
@@ -0,0 +1,469 @@
+/*
+ * Copyright 2015 Paul T. Grogan
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+if (typeof define !== 'function') {
+    var define = require('amdefine')(module);
+}
+
+/**
+ * A module to execute games for design strings, seeds, and operations
+ * models within a single process.
+ * @module runner
+ */
+define('runner', function(require) {
+    var _ = require("underscore");
+    var mas = require("mas");
+    var logger = require("logger");
+    var profiler = require("profiler");
+    var solutionCache = require("solutionCache");
+    var fs = require("fs");
+    var fss = require("fss-ofs");
+    var Game = require("game");
+    var snapshot = require("snapshot");
+
+    /**
+     * @constructor
+     * @alias module:runner
+     */
+    function Runner() {
+        this.numTurns = 24;
+        this.numPlayers = 1;
+        this.initialCash = 1200;
+        this.ops = 'd6';
+        this.fops = undefined;
+        this.checkIndex = false;
+
+        // override default attributes or methods
+        for(var n in arguments[0]) {
+            this[n] = arguments[0][n];
+        }
+    };
+
+    /**
+     * Gets the number of players referenced in a design string.
+     * @param {String} run - The design string, e.g. "1.SmallSat@LEO1,VIS,pSGL 1.GroundSta@SUR1,pSGL".
+     * @returns {Number} The largest player number, or `undefined` if none.
+     */
+    Runner.prototype.getNumPlayers = function(run) {
+        var players = _.map(run.match(/(?:^|\s)(\d+)\./g) || [], function(player) {
+            return parseInt(player, 10);
+        });
+        return players.length > 0 ? _.max(players) : undefined;
+    }
+
+    /**
+     * Gets the operations models the experiments (see fss-exp7.js) use for a
+     * design string: dynamic federate operations (`d6`) for one player or
+     * designs without open links, otherwise dynamic federation operations
+     * (`n` and `d6`).
+     * @param {String} run - The design string.
+     * @returns {object} The federate (`ops`) and federation (`fops`) operations models.
+     */
+    Runner.prototype.getExperimentOps = function(run) {
+        if((this.getNumPlayers(run) || 1) === 1 || !run.match(/oSGL|oISL/)) {
+            return {ops: 'd6', fops: undefined};
+        }
+        return {ops: 'n', fops: 'd6'};
+    }
+
+    /**
+     * Builds the designs for each player from design specifications.
+     * @param {object} game - The game.
+     * @param {object} context - The context.
+     * @param {array} designs - The design specifications, e.g. "1.SmallSat@LEO1,VIS,pSGL".
+     * @returns {array} The array of design sets (system and location) for each player.
+     */
+    Runner.prototype.buildDesigns = function(game, context, designs) {
+        var designSets = [];
+        _.each(context.federations[0].federates, function(federate, index) {
+            designSets[index] = [];
+        });
+
+        _.each(designs, function(design, designId) {
+            var specs = design.split(",");
+            if(specs.length > 0 && specs[0].split("@").length === 2) {
+                var systemType, def;
+                var fedInd = 0;
+                if(specs[0].split("@")[0].split(".").length === 2) {
+                    // determine player ownership
+                    fedInd = parseInt(specs[0].split("@")[0].split(".")[0],10)-1;
+                    systemType = specs[0].split("@")[0].split(".")[1];
+                } else {
+                    // default to player 1 ownership
+                    systemType = specs[0].split("@")[0];
+                }
+                var location = _.find(context.locations, {id: specs[0].split("@")[1]});
+
+                var system;
+                if(def = _.findWhere(game.stationTypes, {type: systemType})) {
+                    system = new fss.GroundStation(def);
+                } else if(def = _.findWhere(game.spacecraftTypes, {type: systemType})) {
+                    system = new fss.Spacecraft(def);
+                }
+                system.id = '(' + (designId+1) + ')' + system.type;
+
+                if(system && location) {
+                    _.each(specs, function(subsystemType, index) {
+                        if(index > 0) {
+                            var subsystem;
+                            if(def = _.findWhere(game.sglTypes, {type: subsystemType})) {
+                                subsystem = new fss.SpaceGroundLink(def);
+                            } else if(def = _.findWhere(game.islTypes, {type: subsystemType})) {
+                                subsystem = new fss.InterSatelliteLink(def);
+                            } else if(def = _.findWhere(game.sensorTypes, {type: subsystemType})) {
+                                subsystem = new fss.Sensor(def);
+                            } else if(def = _.findWhere(game.storageTypes, {type: subsystemType})) {
+                                subsystem = new fss.Storage(def);
+                            } else if(def = _.findWhere(game.defenseTypes, {type: subsystemType})) {
+                                subsystem = new fss.Defense(def);
+                            }
+                            if(subsystem) {
+                                system.subsystems.push(subsystem);
+                            }
+                        }
+                    });
+                }
+                designSets[fedInd].push({system: system, location: location});
+            }
+        });
+        return designSets;
+    }
+
+    /**
+     * Designs and commissions the systems for each player at the start of a
+     * game. Players with 0 initial cash are granted enough for their designs.
+     * @param {object} game - The game.
+     * @param {object} context - The initialized context.
+     * @param {array} designs - The design specifications, e.g. "1.SmallSat@LEO1,VIS,pSGL".
+     */
+    Runner.prototype.designSystems = function(game, context, designs) {
+        var designSets = this.buildDesigns(game, context, designs);
+        _.each(designSets, function(designSet, index) {
+            var federate = context.federations[0].federates[index];
+            if(federate.initialCash===0) {
+                // special case if 0 initial cash: grant enough for initial design
+                federate.initialCash = _.reduce(designSet, function(memo, design){
+                    return memo + design.system.getDesignCost()
+                            + design.system.getCommissionCost(design.location);
+                }, 0);
+                federate.cash = federate.initialCash;
+            }
+
+            _.each(designSet, function(design) {
+                federate.design(design.system);
+                federate.commission(design.system, design.location, context);
+            });
+        });
+    }
+
+    /**
+     * Gets the design specifications of a job.
+     * @param {object} job - The job (see `execute`).
+     * @returns {array} The design specifications.
+     */
+    Runner.prototype.getDesigns = function(job) {
+        return job.designs || _.filter(job.run.split(' '), function(design) {
+            return design.length > 0;
+        });
+    }
+
+    /**
+     * Builds the result of a job: the job attributes with defaults.
+     * @param {object} job - The job (see `execute`).
+     * @returns {object} The result (without federate results).
+     */
+    Runner.prototype.buildResult = function(job) {
+        var run = job.run || this.getDesigns(job).join(' ');
+        return {
+            run: run,
+            seed: _.isNumber(job.seed)?job.seed:0,
+            ops: job.ops!==undefined?job.ops:this.ops,
+            fops: job.fops!==undefined?job.fops:this.fops,
+            numTurns: _.isNumber(job.numTurns)?job.numTurns:this.numTurns,
+            numPlayers: _.isNumber(job.numPlayers)?job.numPlayers:
+                    (this.getNumPlayers(run) || this.numPlayers),
+            initialCash: _.isNumber(job.initialCash)?job.initialCash:this.initialCash,
+            federates: []
+        };
+    }
+
+    /**
+     * Concludes a game:liquidates the systems and defaults the open
+     * contracts of each federate and records its results.
+     * @param {object} context - The context.
+     * @param {object} result - The result to which federate results are added.
+     */
+    Runner.prototype.conclude = function(context, result) {
+        _.each(context.federations, function(federation) {
+            _.each(federation.federates, function(federate) {
+                // record the systems remaining before liquidation
+                var systems = _.map(federate.systems, function(system) {
+                    return {
+                        id: system.id,
+                        type: system.type,
+                        location: system.location,
+                        subsystems: _.pluck(system.subsystems, 'type')
+                    };
+                });
+                federate.liquidate(context);
+                while(federate.contracts.length > 0) {
+                    federate.defaultContract(federate.contracts[0], context);
+                }
+                logger.info(federate.id + ' final cash: ' + federate.cash);
+                logger.info(federate.id + ' ROI: ' + (federate.cash/federate.initialCash));
+                result.federates.push({
+                    id: federate.id,
+                    initialCash: federate.initialCash,
+                    finalCash: federate.cash,
+                    cash: federate.cashHistory,
+                    resolved: federate.numResolved,
+                    defaulted: federate.numDefaulted,
+                    systems: systems
+                });
+            });
+        });
+    }
+
+    /**
+     * Executes one game.
+     * @param {object} job - The job: design string (`run`) or array of
+     * design specifications (`designs`), `seed`, `ops`, `fops`, and
+     * optionally `numTurns`, `numPlayers`, and `initialCash`.
+     * @param {function} callback - The callback function, called with the
+     * result: job attributes plus, for each federate, initial and final
+     * cash, cash at the end of each turn, numbers of contracts resolved and
+     * defaulted, and systems before liquidation (and the `profiler`
+     * summary if profiling is enabled).
+     */
+    Runner.prototype.execute = function(job, callback) {
+        var designs = this.getDesigns(job);
+        var result = this.buildResult(job);
+        var startTime = Date.now();
+        profiler.reset();
+        // the solution cache is shared by all games in the process
+        var cacheStats = _.clone(solutionCache.stats);
+
+        // define the game and build the context
+        var game = new Game({
+            numTurns: result.numTurns,
+            numPlayers: result.numPlayers,
+            initialCash: result.initialCash
+        });
+        var context = game.buildContext(result.seed, result.ops, result.fops);
+        context.checkDataIndex = this.checkIndex;
+
+        // define the simulator
+        var sim = new mas.sim.Simulator({
+            entities: [context],
+            initTime: 0,
+            timeStep: 1,
+            maxTime: game.numTurns
+        });
+
+        // define callback to initialize game
+        var runner = this;
+        sim.on("init", function() {
+            runner.designSystems(game, context, designs);
+        });
+
+        // define callback to conclude game
+        sim.on("complete", function() {
+            runner.conclude(context, result);
+            logger.info('Data index: ' + context.dataIndexStats.hits + ' hits, '
+                    + context.dataIndexStats.misses + ' misses');
+            var stats = context.storagePenaltyStats;
+            logger.info('Storage penalty table: ' + stats.hits + ' hits, ' + stats.misses + ' misses ('
+                    + (stats.hits+stats.misses>0?(100*stats.hits/(stats.hits+stats.misses)).toFixed(1):0) + '% hit rate)');
+            if(solutionCache.enabled) {
+                logger.info('LP solution cache: ' + (solutionCache.stats.hits - cacheStats.hits) + ' hits, '
+                        + (solutionCache.stats.misses - cacheStats.misses) + ' misses in this game, '
+                        + solutionCache.size + ' solutions cached');
+            }
+            result.elapsed = Date.now() - startTime;
+            if(profiler.enabled) {
+                result.profile = profiler.summary();
+            }
+            callback(result);
+        });
+
+        // execute the simulation
+        sim.execute();
+    }
+
+    /**
+     * Builds the simulator state passed to a context stepped without a
+     * simulator (see `advance`).
+     * @param {object} context - The context.
+     * @param {Number} time - The current time.
+     * @param {Number} maxTime - The maximum time.
+     * @returns {object} The simulator state.
+     */
+    Runner.prototype.buildSimState = function(context, time, maxTime) {
+        return {
+            time: time,
+            initTime: 0,
+            timeStep: 1,
+            maxTime: maxTime,
+            entity: function(id) {
+                return id===context.id?context:undefined;
+            }
+        };
+    }
+
+    /**
+     * Steps a context through turns as the simulator does (advance the
+     * time, then tick and tock the context).
+     * @param {object} context - The context.
+     * @param {object} sim - The simulator state (see `buildSimState`).
+     * @param {Number} time - The time at which to stop.
+     */
+    Runner.prototype.advance = function(context, sim, time) {
+        while(sim.time < time) {
+            sim.time += sim.timeStep;
+            context.tick(sim);
+            context.tock();
+        }
+    }
+
+    /**
+     * Executes one game up to a turn, then forks one continuation per
+     * branch from a snapshot of the context at that turn (see `snapshot`).
+     * Branches may replace the federate and federation operations models;
+     * all other state, including random number streams, continues from
+     * the snapshot, so results differ only by decisions after the turn.
+     * @param {object} job - The job (see `execute`).
+     * @param {Number} turn - The turn after which to fork.
+     * @param {array} branches - The branches, e.g. `[{ops: 'd6'}, {ops: 'd6', fops: 'x'}]`
+     * (`ops` and `fops` default to those of the job).
+     * @param {function} callback - The callback function, called with the
+     * result of each branch (see `execute`) plus the fork `turn`.
+     */
+    Runner.prototype.executeBranches = function(job, turn, branches, callback) {
+        var designs = this.getDesigns(job);
+        var base = this.buildResult(job);
+
+        // run the common prefix
+        var game = new Game({
+            numTurns: base.numTurns,
+            numPlayers: base.numPlayers,
+            initialCash: base.initialCash
+        });
+        var context = game.buildContext(base.seed, base.ops, base.fops);
+        context.checkDataIndex = this.checkIndex;
+        var sim = this.buildSimState(context, 0, game.numTurns);
+        context.init(sim);
+        this.designSystems(game, context, designs);
+        this.advance(context, sim, Math.min(turn, game.numTurns));
+        var state = snapshot.take(context);
+
+        _.each(branches, function(branch) {
+            var startTime = Date.now();
+            var result = _.extend({}, base, {
+                ops: _.has(branch, 'ops')?branch.ops:base.ops,
+                fops: _.has(branch, 'fops')?branch.fops:base.fops,
+                turn: sim.time,
+                federates: []
+            });
+            var fork = snapshot.fork(state);
+            if(result.ops!==base.ops || result.fops!==base.fops) {
+                // take the operations models of a context built for the branch
+                var models = game.buildContext(base.seed, result.ops, result.fops);
+                _.each(fork.federations, function(federation, i) {
+                    federation.operations = models.federations[i].operations;
+                    _.each(federation.federates, function(federate, j) {
+                        federate.operations = models.federations[i].federates[j].operations;
+                    });
+                });
+            }
+            this.advance(fork, this.buildSimState(fork, sim.time, game.numTurns), game.numTurns);
+            this.conclude(fork, result);
+            result.elapsed = Date.now() - startTime;
+            callback(result);
+        }, this);
+    }
+
+    /**
+     * Converts a result into one record per player with the attributes
+     * stored by fss-exp7.js (see fss-aggregate.py).
+     * @param {object} result - The result from `execute`.
+     * @returns {array} The array of records.
+     */
+    Runner.prototype.getRecords = function(result) {
+        var run = result.run;
+        var totalCost = _.reduce(result.federates, function(memo, federate) {
+            return memo + federate.initialCash;
+        }, 0);
+        var totalValue = _.reduce(result.federates, function(memo, federate) {
+            return memo + federate.finalCash;
+        }, 0);
+        return _.map(result.federates, function(federate, player) {
+            return {
+                run: run,
+                seed: result.seed,
+                ops: result.ops,
+                fops: result.fops,
+                player: player,
+                players: result.numPlayers,
+                initialCash: federate.initialCash,
+                finalCash: federate.finalCash,
+                stations: (run.match(new RegExp((player+1)+'\\.GroundSta', 'g')) || []).length,
+                satellites: (run.match(new RegExp((player+1)+'\\.(?:Small|Medium|Large)Sat', 'g')) || []).length,
+                totalStations: (run.match(/GroundSta/g) || []).length,
+                totalSatellites: (run.match(/(?:Small|Medium|Large)Sat/g) || []).length,
+                isl: ((run.match(/ISL/g) || []).length>0),
+                totalCost: totalCost,
+                totalValue: totalValue
+            };
+        });
+    }
+
+    /**
+     * Appends the profile of a result as one JSON line to a file (see
+     * fss-profile.py).
+     * @param {String} filename - The file name.
+     * @param {object} result - The result from `execute` with profiling enabled.
+     */
+    Runner.prototype.writeProfile = function(filename, result) {
+        fs.appendFileSync(filename, JSON.stringify(_.extend(_.pick(result, 
+                'run', 'seed', 'ops', 'fops', 'numTurns', 'elapsed'), 
+                result.profile)) + '\n');
+    }
+
+    /**
+     * Executes a list of games in sequence.
+     * @param {array} jobs - The jobs (see `execute`).
+     * @param {function} resultCallback - The callback function for each result.
+     * @param {function} completeCallback - The callback function after all jobs.
+     */
+    Runner.prototype.executeAll = function(jobs, resultCallback, completeCallback) {
+        var runner = this;
+        var counter = 0;
+        function next() {
+            if(counter < jobs.length) {
+                runner.execute(jobs[counter++], function(result) {
+                    resultCallback(result);
+                    // yield to the event loop so long job lists do not grow the stack
+                    setImmediate(next);
+                });
+            } else if(completeCallback) {
+                completeCallback();
+            }
+        }
+        next();
+    }
+
+    return Runner;
+});
@@ -86,6 +86,7 @@ define('sensor', function(require) {
                 && this.canTransferIn(data)) {
             this.contents.push(data);
             this.sensed += data.size;
+            context.indexData(data, system);
             return true;
         }
         return false;
@@ -0,0 +1,149 @@
+/*
+ * Copyright 2015 Paul T. Grogan
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+if (typeof define !== 'function') {
+    var define = require('amdefine')(module);
+}
+
+/**
+ * A module to snapshot the state of a running context and fork any number
+ * of independent continuations from it. A snapshot is a copy of the
+ * object graph reachable from the context (federations, federates,
+ * operations models, systems, subsystem contents, contracts, and events)
+ * with shared references and prototypes preserved. Tables that never
+ * change during a game (locations, propagation, demand values, event
+ * tapes, and event types) are shared by reference rather than copied.
+ * Random number streams are stored as their seed and use count and
+ * re-created by discarding the same number of draws.
+ * @module snapshot
+ */
+define('snapshot', function(require) {
+    var _ = require("underscore");
+    var Random = require("random-js");
+
+    var snapshot = {};
+
+    /**
+     * Copies an object graph. Objects in `shared`, functions, and typed
+     * arrays are not copied.
+     * @param {object} root - The root object.
+     * @param {array} shared - The objects to share.
+     * @returns {object} The copy.
+     */
+    snapshot.copy = function(root, shared) {
+        // copies are recorded on the originals (non-enumerable) while copying
+        var visited = [];
+        function mark(object, copy) {
+            Object.defineProperty(object, '__copy', {value: copy, configurable: true});
+            visited.push(object);
+        }
+        function copy(value) {
+            if(value === null || typeof value !== 'object' || value.buffer instanceof ArrayBuffer) {
+                return value;
+            }
+            if(Object.prototype.hasOwnProperty.call(value, '__copy')) {
+                return value.__copy;
+            }
+            var result = _.isArray(value)?[]:Object.create(Object.getPrototypeOf(value));
+            mark(value, result);
+            for(var n in value) {
+                if(Object.prototype.hasOwnProperty.call(value, n)) {
+                    result[n] = copy(value[n]);
+                }
+            }
+            return result;
+        }
+        try {
+            _.each(shared, function(object) {
+                if(object !== null && typeof object === 'object') {
+                    mark(object, object);
+                }
+            });
+            return copy(root);
+        } finally {
+            _.each(visited, function(object) {
+                delete object.__copy;
+            });
+        }
+    }
+
+    /**
+     * Gets the objects of a context shared between snapshots and forks.
+     * @param {object} context - The context.
+     * @returns {array} The shared objects.
+     */
+    snapshot.getShared = function(context) {
+        return _.union([context.locations, context.locationIndex, context.propagationTable,
+                context.sectors, context.eventTypes, context.demandValues,
+                context.demandClasses, context.eventTape], context.locations);
+    }
+
+    /**
+     * Takes a snapshot of a context (after `init`).
+     * @param {object} context - The context.
+     * @returns {object} The snapshot: an inactive copy of the context with
+     * stream states instead of streams.
+     */
+    snapshot.take = function(context) {
+        var state = snapshot.copy(context, snapshot.getShared(context));
+        state.streamStates = {
+            shuffle: [context.streamSeeds.shuffle, context.shuffleStream.getUseCount()],
+            order: [context.streamSeeds.order, context.orderStream.getUseCount()],
+            roll: {}
+        };
+        _.each(_.keys(context.streamSeeds.roll), function(id) {
+            state.streamStates.roll[id] = [context.streamSeeds.roll[id],
+                    context.rollStreams[id].getUseCount()];
+        });
+        state.masterStream = undefined;
+        state.shuffleStream = undefined;
+        state.orderStream = undefined;
+        state.rollStreams = [];
+        return state;
+    }
+
+    /**
+     * Creates a random number stream in a stored state.
+     * @param {array} state - The seed and use count.
+     * @returns {object} The stream.
+     */
+    snapshot.restoreStream = function(state) {
+        var stream = new Random.engines.mt19937();
+        stream.seed(state[0]);
+        stream.discard(state[1]);
+        return stream;
+    }
+
+    /**
+     * Forks a context from a snapshot. The snapshot is not modified, so it
+     * can be forked again.
+     * @param {object} state - The snapshot (see `take`).
+     * @returns {object} The context.
+     */
+    snapshot.fork = function(state) {
+        var context = snapshot.copy(state, snapshot.getShared(state));
+        context.shuffleStream = snapshot.restoreStream(state.streamStates.shuffle);
+        context.orderStream = snapshot.restoreStream(state.streamStates.order);
+        context.rollStreams = [];
+        _.each(_.keys(state.streamStates.roll), function(id) {
+            context.rollStreams[id] = snapshot.restoreStream(state.streamStates.roll[id]);
+        });
+        delete context.streamStates;
+        return context;
+    }
+
+    return snapshot;
+});
@@ -0,0 +1,172 @@
+/*
+ * Copyright 2015 Paul T. Grogan
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+if (typeof define !== 'function') {
+    var define = require('amdefine')(module);
+}
+
+/**
+ * A module to cache linear program solutions of operations models keyed by
+ * a canonical planning state (see `Operations.getStateKey`). Solutions are
+ * stored as sparse vectors of column values in creation order so they can
+ * be reused by games with different system and demand identifiers. The
+ * cache is shared by all games in a process, holds at most `capacity`
+ * solutions (least recently used are evicted first), and is off until
+ * `enable` is called.
+ * @module solutionCache
+ */
+define('solutionCache', function(require) {
+    var _ = require("underscore");
+    var crypto = require("crypto");
+    var fs = require("fs");
+    var logger = require("logger");
+
+    var solutionCache = {
+        enabled: false,
+        capacity: 0, // maximum number of solutions
+        entries: {}, // entries[key]: {numColumns, values, used}
+        size: 0,
+        counter: 0, // access counter for least recently used eviction
+        stats: {hits: 0, misses: 0, evictions: 0}
+    };
+
+    /**
+     * Enables the cache.
+     * @param {Number} capacity - The maximum number of solutions (0 to disable).
+     */
+    solutionCache.enable = function(capacity) {
+        this.capacity = capacity;
+        this.enabled = (capacity > 0);
+        this.evict();
+    }
+
+    /**
+     * Removes all solutions and resets the statistics.
+     */
+    solutionCache.clear = function() {
+        this.entries = {};
+        this.size = 0;
+        this.stats = {hits: 0, misses: 0, evictions: 0};
+    }
+
+    /**
+     * Hashes a canonical planning state to a cache key.
+     * @param {object} state - The canonical state (any JSON value).
+     * @returns {String} The key.
+     */
+    solutionCache.hash = function(state) {
+        return crypto.createHash('md5').update(JSON.stringify(state)).digest('hex');
+    }
+
+    /**
+     * Gets a cached solution.
+     * @param {String} key - The key.
+     * @param {Number} numColumns - The number of columns of the linear program.
+     * @returns {array} The [column index, value] pairs of non-zero columns,
+     * or `undefined` if not cached.
+     */
+    solutionCache.get = function(key, numColumns) {
+        var entry = this.entries[key];
+        if(entry && entry.numColumns === numColumns) {
+            entry.used = this.counter++;
+            this.stats.hits++;
+            return entry.values;
+        }
+        this.stats.misses++;
+        return undefined;
+    }
+
+    /**
+     * Adds a solution to the cache.
+     * @param {String} key - The key.
+     * @param {Number} numColumns - The number of columns of the linear program.
+     * @param {array} values - The [column index, value] pairs of non-zero columns.
+     */
+    solutionCache.put = function(key, numColumns, values) {
+        if(!_.has(this.entries, key)) {
+            this.size++;
+        }
+        this.entries[key] = {numColumns: numColumns, values: values, used: this.counter++};
+        if(this.size > this.capacity) {
+            this.evict();
+        }
+    }
+
+    /**
+     * Evicts the least recently used solutions down to three quarters of
+     * the capacity so eviction runs once per many insertions.
+     */
+    solutionCache.evict = function() {
+        if(this.size > this.capacity) {
+            var keys = _.sortBy(_.keys(this.entries), function(key) {
+                return this.entries[key].used;
+            }, this);
+            _.each(keys.slice(0, this.size - Math.floor(0.75*this.capacity)), function(key) {
+                delete this.entries[key];
+                this.size--;
+                this.stats.evictions++;
+            }, this);
+        }
+    }
+
+    /**
+     * Loads solutions from a file written by `save` (if it exists).
+     * @param {String} filename - The file name.
+     */
+    solutionCache.load = function(filename) {
+        if(fs.existsSync(filename)) {
+            _.each(fs.readFileSync(filename, 'utf8').split('\n'), function(line) {
+                if(line.length > 0) {
+                    var entry = JSON.parse(line);
+                    this.put(entry.key, entry.numColumns, entry.values);
+                }
+            }, this);
+            logger.info('Loaded ' + this.size + ' LP solutions from ' + filename);
+        }
+    }
+
+    /**
+     * Saves all solutions to a file with one JSON object per line, least
+     * recently used first.
+     * @param {String} filename - The file name.
+     */
+    solutionCache.save = function(filename) {
+        var keys = _.sortBy(_.keys(this.entries), function(key) {
+            return this.entries[key].used;
+        }, this);
+        fs.writeFileSync(filename, _.map(keys, function(key) {
+            return JSON.stringify({
+                key: key,
+                numColumns: this.entries[key].numColumns,
+                values: this.entries[key].values
+            }) + '\n';
+        }, this).join(''));
+        logger.info('Saved ' + keys.length + ' LP solutions to ' + filename);
+    }
+
+    /**
+     * Saves all solutions to a file once when the process exits (see `save`).
+     * @param {String} filename - The file name.
+     */
+    solutionCache.saveOnExit = function(filename) {
+        var cache = this;
+        process.on('exit', function() {
+            cache.save(filename);
+        });
+    }
+
+    return solutionCache;
+});
@@ -492,6 +492,7 @@ define('system', function(require) {
             }, this)) {
                 logger.verbose(this.getTag() + " received data from " 
                         + origin.getTag() + " via " + protocol);
+                context.indexData(data, this);
                 return true;
             }
         }